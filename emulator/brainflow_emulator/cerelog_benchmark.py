@@ -0,0 +1,87 @@
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import time
+
+from brainflow.board_shim import BoardShim, BrainFlowInputParams, BoardIds
+
+# End to end ingestion through a pty at increasing rates. Emulator runs in its own process, so cpu time
+# of this process is spent in BrainFlow read thread. Parser only numbers (latency, resync cost) come from
+# CerelogParserBenchmark in brainflow_tests.
+
+
+def wait_for_backlog(board, sampling_rate, max_wait=30.0):
+    """Skip frames which piled up in the pty while session was prepared, returns stats after that"""
+    interval = 0.5
+    prev = json.loads(board.config_board('get_stats'))
+    deadline = time.perf_counter() + max_wait
+    while time.perf_counter() < deadline:
+        time.sleep(interval)
+        cur = json.loads(board.config_board('get_stats'))
+        if cur['packets_received'] - prev['packets_received'] < 1.1 * sampling_rate * interval:
+            return cur
+        prev = cur
+    return prev
+
+
+def run_rate(sampling_rate, duration, checksum_error_rate):
+    cmd = [sys.executable, '-m', 'brainflow_emulator.cerelog_linux', '--sampling-rate', str(sampling_rate),
+           '--checksum-error-rate', str(checksum_error_rate)]
+    emulator = subprocess.Popen(cmd, stdout=subprocess.PIPE, universal_newlines=True)
+    try:
+        params = BrainFlowInputParams()
+        params.serial_port = emulator.stdout.readline().strip()
+        board = BoardShim(BoardIds.CERELOG_X8_BOARD, params)
+        board.prepare_session()
+        try:
+            board.start_stream(450000)
+            first = wait_for_backlog(board, sampling_rate)
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+            time.sleep(duration)
+            last = json.loads(board.config_board('get_stats'))
+            cpu = time.process_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+            board.stop_stream()
+        finally:
+            board.release_session()
+    finally:
+        emulator.kill()
+        emulator.wait()
+
+    packets = last['packets_received'] - first['packets_received']
+    return {
+        'sampling_rate': sampling_rate,
+        'packets_per_second': packets / wall,
+        'cpu_us_per_packet': 1e6 * cpu / max(packets, 1),
+        'checksum_errors': last['checksum_errors'] - first['checksum_errors'],
+        'bytes_skipped': last['bytes_skipped'] - first['bytes_skipped']
+    }
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Cerelog X8 pty ingestion benchmark')
+    parser.add_argument('--rates', type=int, nargs='+', default=[500, 2000, 8000, 32000, 128000])
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per rate')
+    parser.add_argument('--checksum-error-rate', type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    BoardShim.disable_board_logger()
+    print('%10s %14s %14s %10s %10s' % ('rate', 'packets/s', 'cpu us/packet', 'checksum', 'skipped'))
+    for rate in args.rates:
+        result = run_rate(rate, args.duration, args.checksum_error_rate)
+        print('%10d %14.1f %14.2f %10d %10d' % (
+            result['sampling_rate'], result['packets_per_second'], result['cpu_us_per_packet'],
+            result['checksum_errors'], result['bytes_skipped']))
+        sys.stdout.flush()
+        # emulator or pty can not keep up anymore, higher rates would measure the same limit
+        if result['packets_per_second'] < 0.9 * rate:
+            logging.info('stopping at %d Hz, received %.1f packets/s' % (rate, result['packets_per_second']))
+            break
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main(sys.argv[1:])
@@ -0,0 +1,168 @@
+import logging
+import math
+import random
+import struct
+import threading
+import time
+
+START_MARKER = b'\xab\xcd'
+END_MARKER = b'\xdc\xba'
+HANDSHAKE_START = b'\xaa\xbb'
+HANDSHAKE_END = b'\xcc\xdd'
+HANDSHAKE_SIZE = 12
+MSG_LENGTH = 31  # 4 bytes of timestamp and 27 bytes of ADS1299 data
+PACKET_SIZE = 37
+NUM_CHANNELS = 8
+MAX_FRAMES_PER_WRITE = 256
+# firmware uses it if there is no handshake after reset
+FALLBACK_TIMESTAMP = 1500000000
+# the only handshake register firmware applies, pty has no baud rate so it is just logged
+REG_BAUD_RATE = 0x01
+
+
+def build_frame(board_timestamp, channel_values, corrupt_checksum=False):
+    """Build 37 bytes frame: start marker, length, timestamp, ADS1299 status and data, checksum, end marker"""
+    body = bytearray()
+    body.append(MSG_LENGTH)
+    body += struct.pack('>I', board_timestamp & 0xFFFFFFFF)
+    body += b'\xc0\x00\x00'  # ADS1299 status bytes
+    for value in channel_values:
+        body += struct.pack('>i', value)[1:]  # 24 bit two's complement
+    checksum = sum(body[0:]) & 0xFF
+    if corrupt_checksum:
+        checksum ^= 0xFF
+    return START_MARKER + bytes(body) + bytes([checksum]) + END_MARKER
+
+
+def parse_handshake(data):
+    """Return (unix_timestamp, reg_addr, reg_val) or None if handshake packet is invalid"""
+    if len(data) != HANDSHAKE_SIZE or data[0:2] != HANDSHAKE_START or data[10:12] != HANDSHAKE_END:
+        return None
+    if (sum(data[2:9]) & 0xFF) != data[9]:
+        return None
+    timestamp = struct.unpack('>I', bytes(data[3:7]))[0]
+    return timestamp, data[7], data[8]
+
+
+class Listener(threading.Thread):
+
+    def __init__(self, port, write, read, sampling_rate=500, checksum_error_rate=0.0, partial_frame_rate=0.0,
+                 noise_rate=0.0, drift_ppm=0.0, stream_on_start=False):
+        # for windows write and read are methods from Serial object, for linux - os.read/write it doesnt work otherwise
+        threading.Thread.__init__(self)
+        self.port = port
+        self.write = write
+        self.read = read
+        self.writer_process = None
+        self.writer_options = {
+            'sampling_rate': sampling_rate,
+            'checksum_error_rate': checksum_error_rate,
+            'partial_frame_rate': partial_frame_rate,
+            'noise_rate': noise_rate,
+            'drift_ppm': drift_ppm
+        }
+        self.registers = dict()
+        # like firmware after reset without handshake: stream with fallback timestamp right away
+        if stream_on_start:
+            self.start_writer(FALLBACK_TIMESTAMP)
+
+    def start_writer(self, timestamp):
+        self.writer_process = CerelogWriter(self.port, self.write, timestamp, **self.writer_options)
+        self.writer_process.daemon = True
+        self.writer_process.start()
+
+    def run(self):
+        received = bytearray()
+        while True:
+            res = self.read(self.port, 64)
+            if len(res) < 1:
+                time.sleep(0.01)
+                continue
+            received += res
+            while len(received) >= HANDSHAKE_SIZE:
+                idx = received.find(HANDSHAKE_START)
+                if idx < 0:
+                    del received[0:len(received) - 1]
+                    break
+                del received[0:idx]
+                if len(received) < HANDSHAKE_SIZE:
+                    break
+                handshake = parse_handshake(received[0:HANDSHAKE_SIZE])
+                if handshake is None:
+                    logging.warning('invalid handshake packet %s' % received[0:HANDSHAKE_SIZE].hex())
+                    del received[0:2]
+                    continue
+                del received[0:HANDSHAKE_SIZE]
+                self.on_handshake(*handshake)
+
+    def on_handshake(self, timestamp, reg_addr, reg_val):
+        logging.info('handshake: timestamp %d, register 0x%02X value 0x%02X' % (timestamp, reg_addr, reg_val))
+        self.registers[reg_addr] = reg_val
+        # firmware starts streaming right after the first handshake
+        if self.writer_process is None:
+            self.start_writer(timestamp)
+            return
+        # each handshake sets board clock
+        self.writer_process.set_timestamp(timestamp)
+        # like firmware 1.0: other registers are only reported, gain and data rate stay the same
+        if reg_addr != REG_BAUD_RATE and reg_addr != 0x00:
+            logging.info('user parameter received: register 0x%02X' % reg_addr)
+
+
+class CerelogWriter(threading.Thread):
+
+    def __init__(self, port, write, start_timestamp, sampling_rate=500, checksum_error_rate=0.0,
+                 partial_frame_rate=0.0, noise_rate=0.0, drift_ppm=0.0):
+        threading.Thread.__init__(self)
+        self.port = port
+        self.write = write
+        self.start_timestamp = start_timestamp
+        self.sampling_rate = sampling_rate
+        self.checksum_error_rate = checksum_error_rate
+        self.partial_frame_rate = partial_frame_rate
+        self.noise_rate = noise_rate
+        # positive drift means that board clock is slower than host clock
+        self.period = (1.0 + drift_ppm * 1e-6) / sampling_rate
+        self.package_num = 0
+        self.board_seconds = 0
+        self.frames_in_second = 0
+        self.need_data = True
+
+    def set_timestamp(self, timestamp):
+        # single assignment, writer thread sees either old or new reference
+        self.start_timestamp = timestamp - self.board_seconds
+
+    def next_frame(self):
+        board_time = self.board_seconds + self.frames_in_second / self.sampling_rate
+        values = list()
+        for ch in range(NUM_CHANNELS):
+            phase = 2.0 * math.pi * (ch + 1) * board_time
+            values.append(int(1000 * (ch + 1) * math.sin(phase)))
+        corrupt = random.random() < self.checksum_error_rate
+        frame = build_frame(self.start_timestamp + self.board_seconds, values, corrupt)
+        self.frames_in_second += 1
+        if self.frames_in_second >= self.sampling_rate:
+            self.board_seconds += 1
+            self.frames_in_second = 0
+        if random.random() < self.partial_frame_rate:
+            frame = frame[0:random.randint(1, PACKET_SIZE - 1)]
+        if random.random() < self.noise_rate:
+            frame = bytes(random.randint(0, 255) for _ in range(random.randint(1, PACKET_SIZE))) + frame
+        self.package_num = self.package_num + 1
+        return frame
+
+    def run(self):
+        start_time = time.perf_counter()
+        while self.need_data:
+            # write all frames which are due in one call, so high rates are not limited by sleep accuracy
+            due = int((time.perf_counter() - start_time) / self.period) + 1
+            # limit chunk size, otherwise after a stall we would build frames for seconds without writing
+            due = min(due, self.package_num + MAX_FRAMES_PER_WRITE)
+            chunk = bytearray()
+            while self.package_num < due:
+                chunk += self.next_frame()
+            if chunk:
+                self.write(self.port, bytes(chunk))
+            sleep_time = start_time + self.package_num * self.period - time.perf_counter()
+            if sleep_time > 0:
+                time.sleep(sleep_time)
@@ -0,0 +1,83 @@
+import argparse
+import logging
+import os
+import pty
+import subprocess
+import sys
+import time
+
+from brainflow_emulator.emulate_common import TestFailureError, log_multilines
+from brainflow_emulator.cerelog_emulator import Listener
+
+
+def write(port, data):
+    return os.write(port, data)
+
+
+def read(port, num_bytes):
+    return os.read(port, num_bytes)
+
+
+def get_ports_pty():
+    master, slave = pty.openpty()
+    s_name = os.ttyname(slave)
+    return master, slave, s_name
+
+
+def start_listener(master, args):
+    listen_thread = Listener(master, write, read, sampling_rate=args.sampling_rate,
+                             checksum_error_rate=args.checksum_error_rate,
+                             partial_frame_rate=args.partial_frame_rate, noise_rate=args.noise_rate,
+                             drift_ppm=args.drift_ppm, stream_on_start=args.stream_on_start)
+    listen_thread.daemon = True
+    listen_thread.start()
+    return listen_thread
+
+
+def test_serial(cmd_list, master, slave, s_name, args):
+    start_listener(master, args)
+
+    cmd_to_run = cmd_list + [s_name]
+    logging.info('Running %s' % ' '.join([str(x) for x in cmd_to_run]))
+    process = subprocess.Popen(cmd_to_run, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout, stderr = process.communicate()
+
+    log_multilines(logging.info, stdout)
+    log_multilines(logging.info, stderr)
+
+    if process.returncode != 0:
+        raise TestFailureError('Test failed with exit code %s' % str(process.returncode), process.returncode)
+
+    return stdout, stderr
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Cerelog X8 emulator, port name is appended to the command')
+    parser.add_argument('--sampling-rate', type=int, default=500, help='frames per second')
+    parser.add_argument('--checksum-error-rate', type=float, default=0.0, help='share of frames with bad checksum')
+    parser.add_argument('--partial-frame-rate', type=float, default=0.0, help='share of truncated frames')
+    parser.add_argument('--noise-rate', type=float, default=0.0, help='share of frames preceded by random bytes')
+    parser.add_argument('--drift-ppm', type=float, default=0.0, help='board clock drift in ppm')
+    parser.add_argument('--stream-on-start', action='store_true',
+                        help='stream with fallback timestamp before handshake like firmware after reset')
+    parser.add_argument('cmd', nargs=argparse.REMAINDER,
+                        help='command to run, if not set emulator prints port name and runs until interrupted')
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_args(argv)
+    master, slave, s_name = get_ports_pty()
+    if args.cmd:
+        test_serial(args.cmd, master, slave, s_name, args)
+    else:
+        start_listener(master, args)
+        print(s_name)
+        sys.stdout.flush()
+        while True:
+            time.sleep(1)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main(sys.argv[1:])
@@ -101,6 +101,20 @@ class BrainFlowPresets(enum.IntEnum):
     ANCILLARY_PRESET = 2  #:
 
 
+class BufferLayouts(enum.IntEnum):
+    """Enum to store ring buffer layouts"""
+
+    ROW_MAJOR = 0  #:
+    COLUMNAR = 1  #:
+
+
+class BufferPolicies(enum.IntEnum):
+    """Enum to store policies for full ring buffer"""
+
+    OVERWRITE = 0  #:
+    BLOCK = 1  #:
+
+
 class BrainFlowInputParams(object):
     """ inputs parameters for prepare_session method
 
@@ -157,6 +171,9 @@ class BrainFlowInputParams(object):
                           sort_keys=True, indent=4)
 
 
+DATA_CALLBACK = ctypes.CFUNCTYPE(None, ctypes.POINTER(ctypes.c_double), ctypes.c_int, ctypes.c_int, ctypes.c_void_p)
+
+
 class BoardControllerDLL(object):
     __instance = None
 
@@ -266,6 +283,93 @@ class BoardControllerDLL(object):
             ctypes.c_char_p
         ]
 
+        self.get_current_board_data_into = self.lib.get_current_board_data_into
+        self.get_current_board_data_into.restype = ctypes.c_int
+        self.get_current_board_data_into.argtypes = [
+            ctypes.c_int,
+            ctypes.c_int,
+            ndpointer(ctypes.c_double, flags='C_CONTIGUOUS'),
+            ctypes.c_int,
+            ndpointer(ctypes.c_int32),
+            ndpointer(ctypes.c_int32),
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_char_p
+        ]
+
+        self.get_board_data_into = self.lib.get_board_data_into
+        self.get_board_data_into.restype = ctypes.c_int
+        self.get_board_data_into.argtypes = [
+            ctypes.c_int,
+            ctypes.c_int,
+            ndpointer(ctypes.c_double, flags='C_CONTIGUOUS'),
+            ctypes.c_int,
+            ndpointer(ctypes.c_int32),
+            ndpointer(ctypes.c_int32),
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_char_p
+        ]
+
+        self.wait_for_samples = self.lib.wait_for_samples
+        self.wait_for_samples.restype = ctypes.c_int
+        self.wait_for_samples.argtypes = [
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ndpointer(ctypes.c_int32),
+            ctypes.c_int,
+            ctypes.c_char_p
+        ]
+
+        self.register_data_callback = self.lib.register_data_callback
+        self.register_data_callback.restype = ctypes.c_int
+        self.register_data_callback.argtypes = [
+            DATA_CALLBACK,
+            ctypes.c_void_p,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_char_p
+        ]
+
+        self.unregister_data_callback = self.lib.unregister_data_callback
+        self.unregister_data_callback.restype = ctypes.c_int
+        self.unregister_data_callback.argtypes = [
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_char_p
+        ]
+
+        self.get_buffer_stats = self.lib.get_buffer_stats
+        self.get_buffer_stats.restype = ctypes.c_int
+        self.get_buffer_stats.argtypes = [
+            ctypes.c_int,
+            ndpointer(ctypes.c_double),
+            ctypes.c_int,
+            ndpointer(ctypes.c_int32),
+            ctypes.c_int,
+            ctypes.c_char_p
+        ]
+
+        self.set_buffer_layout = self.lib.set_buffer_layout
+        self.set_buffer_layout.restype = ctypes.c_int
+        self.set_buffer_layout.argtypes = [
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_char_p
+        ]
+
+        self.set_buffer_policy = self.lib.set_buffer_policy
+        self.set_buffer_policy.restype = ctypes.c_int
+        self.set_buffer_policy.argtypes = [
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_char_p
+        ]
+
         self.release_session = self.lib.release_session
         self.release_session.restype = ctypes.c_int
         self.release_session.argtypes = [
@@ -584,6 +688,8 @@ class BoardShim(object):
                                      BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
         else:
             self._master_board_id = self.board_id
+        # native side keeps raw pointers to these ctypes callbacks
+        self._data_callbacks = dict()
 
     def __del__(self) -> None:
         if self.is_prepared():
@@ -1207,7 +1313,7 @@ class BoardShim(object):
 
         :param preset: preset
         :type preset: int
-        :param streamer_params parameter to stream data from brainflow, supported vals: "file://%file_name%:w", "file://%file_name%:a", "streaming_board://%multicast_group_ip%:%port%". Range for multicast addresses is from "224.0.0.0" to "239.255.255.255"
+        :param streamer_params parameter to stream data from brainflow, supported vals: "file://%file_name%:w", "file://%file_name%:a", "file_bin://%file_name%:w", "file_bin://%file_name%:w_float32", "shm://%name%:%size%", "streaming_board://%multicast_group_ip%:%port%". Range for multicast addresses is from "224.0.0.0" to "239.255.255.255", for shm size is number of samples kept in shared memory
         :type streamer_params: str
         """
 
@@ -1228,7 +1334,7 @@ class BoardShim(object):
 
         :param preset: preset
         :type preset: int
-        :param streamer_params parameter to stream data from brainflow, supported vals: "file://%file_name%:w", "file://%file_name%:a", "streaming_board://%multicast_group_ip%:%port%". Range for multicast addresses is from "224.0.0.0" to "239.255.255.255"
+        :param streamer_params parameter to stream data from brainflow, supported vals: "file://%file_name%:w", "file://%file_name%:a", "file_bin://%file_name%:w", "file_bin://%file_name%:w_float32", "shm://%name%:%size%", "streaming_board://%multicast_group_ip%:%port%". Range for multicast addresses is from "224.0.0.0" to "239.255.255.255", for shm size is number of samples kept in shared memory
         :type streamer_params: str
         """
 
@@ -1249,7 +1355,7 @@ class BoardShim(object):
 
         :param num_samples: size of ring buffer to keep data
         :type num_samples: int
-        :param streamer_params parameter to stream data from brainflow, supported vals: "file://%file_name%:w", "file://%file_name%:a", "streaming_board://%multicast_group_ip%:%port%". Range for multicast addresses is from "224.0.0.0" to "239.255.255.255"
+        :param streamer_params parameter to stream data from brainflow, supported vals: "file://%file_name%:w", "file://%file_name%:a", "file_bin://%file_name%:w", "file_bin://%file_name%:w_float32", "shm://%name%:%size%", "streaming_board://%multicast_group_ip%:%port%". Range for multicast addresses is from "224.0.0.0" to "239.255.255.255", for shm size is number of samples kept in shared memory
         :type streamer_params: str
         """
 
@@ -1278,18 +1384,38 @@ class BoardShim(object):
         res = BoardControllerDLL.get_instance().release_session(self.board_id, self.input_json)
         if res != BrainFlowExitCodes.STATUS_OK.value:
             raise BrainFlowError('unable to release streaming session', res)
+        self._data_callbacks.clear()
 
-    def get_current_board_data(self, num_samples: int, preset: int = BrainFlowPresets.DEFAULT_PRESET):
+    def get_current_board_data(self, num_samples: int, preset: int = BrainFlowPresets.DEFAULT_PRESET, out=None,
+                               channels: List[int] = None):
         """Get specified amount of data or less if there is not enough data, doesnt remove data from ringbuffer
 
         :param num_samples: max number of samples
         :type num_samples: int
         :param preset: preset
         :type preset: int
-        :return: latest data from a board
+        :param out: preallocated C contiguous float64 array with shape (num_rows, N) to write data to, N should be >= num_samples
+        :type out: NDArray[Shape["*, *"], Float64]
+        :param channels: rows to return, all rows if None
+        :type channels: List[int]
+        :return: latest data from a board, view of out if it is provided
         :rtype: NDArray[Shape["*, *"], Float64]
         """
 
+        if out is not None or channels is not None:
+            channels_arr, num_rows = self._prepare_channels(channels, preset)
+            if out is None:
+                out = numpy.zeros((num_rows, num_samples)).astype(numpy.float64)
+            self._check_out_array(out, num_samples, num_rows)
+            current_size = numpy.zeros(1).astype(numpy.int32)
+            res = BoardControllerDLL.get_instance().get_current_board_data_into(num_samples, preset, out, out.shape[1],
+                                                                                current_size, channels_arr,
+                                                                                len(channels_arr), self.board_id,
+                                                                                self.input_json)
+            if res != BrainFlowExitCodes.STATUS_OK.value:
+                raise BrainFlowError('unable to get current data', res)
+            return out[:, 0:current_size[0]]
+
         package_length = BoardShim.get_num_rows(self._master_board_id, preset)
         data_arr = numpy.zeros(int(num_samples * package_length)).astype(numpy.float64)
         current_size = numpy.zeros(1).astype(numpy.int32)
@@ -1321,6 +1447,28 @@ class BoardShim(object):
             raise BrainFlowError('unable to obtain buffer size', res)
         return data_size[0]
 
+    def wait_for_samples(self, num_samples: int, timeout: float,
+                         preset: int = BrainFlowPresets.DEFAULT_PRESET) -> int:
+        """Block until ringbuffer has at least num_samples or timeout expires, GIL is released while waiting
+
+        :param num_samples: number of samples to wait for
+        :type num_samples: int
+        :param timeout: timeout in seconds
+        :type timeout: float
+        :param preset: preset
+        :type preset: int
+        :return: number of elements in ring buffer, less than num_samples if timeout expired
+        :rtype: int
+        """
+
+        data_size = numpy.zeros(1).astype(numpy.int32)
+
+        res = BoardControllerDLL.get_instance().wait_for_samples(num_samples, int(timeout * 1000), preset, data_size,
+                                                                 self.board_id, self.input_json)
+        if res != BrainFlowExitCodes.STATUS_OK.value:
+            raise BrainFlowError('unable to wait for samples', res)
+        return data_size[0]
+
     def get_board_id(self) -> int:
         """Get's the actual board id, can be different than provided
 
@@ -1358,23 +1506,48 @@ class BoardShim(object):
             raise BrainFlowError('unable to check session status', res)
         return bool(prepared[0])
 
-    def get_board_data(self, num_samples=None, preset: int = BrainFlowPresets.DEFAULT_PRESET):
+    def get_board_data(self, num_samples=None, preset: int = BrainFlowPresets.DEFAULT_PRESET, out=None,
+                       channels: List[int] = None):
         """Get board data and remove data from ringbuffer
 
         :param num_samples: number of packages to get
         :type num_samples: int
         :param preset: preset
         :type preset: int
-        :return: all data from a board if num_samples is None, num_samples packages or less if not None
+        :param out: preallocated C contiguous float64 array with shape (num_rows, N) to write data to, at most N packages are read
+        :type out: NDArray[Shape["*, *"], Float64]
+        :param channels: rows to return, all rows if None, packages are removed from ringbuffer anyway
+        :type channels: List[int]
+        :return: all data from a board if num_samples is None, num_samples packages or less if not None, view of out if it is provided
         :rtype: NDArray[Shape["*, *"], Float64]
         """
 
+        if num_samples is not None and num_samples < 1:
+            raise BrainFlowError('invalid num_samples', BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
+
+        if out is not None or channels is not None:
+            channels_arr, num_rows = self._prepare_channels(channels, preset)
+            if out is None:
+                data_size = self.get_board_data_count(preset)
+                if num_samples is not None:
+                    data_size = min(data_size, num_samples)
+                out = numpy.zeros((num_rows, data_size)).astype(numpy.float64)
+            self._check_out_array(out, None, num_rows)
+            data_size = out.shape[1]
+            if num_samples is not None:
+                data_size = min(data_size, num_samples)
+            returned_size = numpy.zeros(1).astype(numpy.int32)
+            res = BoardControllerDLL.get_instance().get_board_data_into(data_size, preset, out, out.shape[1],
+                                                                        returned_size, channels_arr,
+                                                                        len(channels_arr), self.board_id,
+                                                                        self.input_json)
+            if res != BrainFlowExitCodes.STATUS_OK.value:
+                raise BrainFlowError('unable to get board data', res)
+            return out[:, 0:returned_size[0]]
+
         data_size = self.get_board_data_count(preset)
         if num_samples is not None:
-            if num_samples < 1:
-                raise BrainFlowError('invalid num_samples', BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
-            else:
-                data_size = min(data_size, num_samples)
+            data_size = min(data_size, num_samples)
         package_length = BoardShim.get_num_rows(self._master_board_id, preset)
         data_arr = numpy.zeros(data_size * package_length).astype(numpy.float64)
 
@@ -1384,6 +1557,112 @@ class BoardShim(object):
 
         return data_arr.reshape(package_length, data_size)
 
+    def get_buffer_stats(self, preset: int = BrainFlowPresets.DEFAULT_PRESET) -> dict:
+        """Get counters of ringbuffer for preset, they are reset on each start_stream
+
+        :param preset: preset
+        :type preset: int
+        :return: dict with int counters samples_pushed, samples_overwritten, current_fill, peak_fill, capacity, streamer_drops and float blocked_time_ms
+        :rtype: dict
+        """
+
+        names = ['samples_pushed', 'samples_overwritten', 'current_fill', 'peak_fill', 'capacity', 'streamer_drops',
+                 'blocked_time_ms']
+        stats = numpy.zeros(32).astype(numpy.float64)
+        num_stats = numpy.zeros(1).astype(numpy.int32)
+
+        res = BoardControllerDLL.get_instance().get_buffer_stats(preset, stats, stats.size, num_stats, self.board_id,
+                                                                 self.input_json)
+        if res != BrainFlowExitCodes.STATUS_OK.value:
+            raise BrainFlowError('unable to get buffer stats', res)
+        return {name: float(stats[i]) if name == 'blocked_time_ms' else int(stats[i])
+                for i, name in enumerate(names[0:num_stats[0]])}
+
+    def register_data_callback(self, callback, batch_size: int,
+                               preset: int = BrainFlowPresets.DEFAULT_PRESET) -> None:
+        """Call function with batches of data from BrainFlow thread, replaces previously registered callback for this preset.
+        Callback receives 2d numpy array with shape (num_rows, batch_size), it should not call methods of this BoardShim.
+        Samples left when callback is unregistered or session is released come in the last, shorter batch
+
+        :param callback: function which accepts numpy array
+        :param batch_size: number of samples in each batch
+        :type batch_size: int
+        :param preset: preset
+        :type preset: int
+        """
+
+        def _on_data(data_ptr, rows, num_samples, user_data):
+            data = numpy.ctypeslib.as_array(data_ptr, shape=(rows * num_samples,))
+            callback(data.reshape(rows, num_samples).copy())
+
+        c_callback = DATA_CALLBACK(_on_data)
+        res = BoardControllerDLL.get_instance().register_data_callback(c_callback, None, batch_size, preset,
+                                                                       self.board_id, self.input_json)
+        if res != BrainFlowExitCodes.STATUS_OK.value:
+            raise BrainFlowError('unable to register data callback', res)
+        self._data_callbacks[preset] = c_callback
+
+    def unregister_data_callback(self, preset: int = BrainFlowPresets.DEFAULT_PRESET) -> None:
+        """Remove data callback for preset
+
+        :param preset: preset
+        :type preset: int
+        """
+
+        res = BoardControllerDLL.get_instance().unregister_data_callback(preset, self.board_id, self.input_json)
+        if res != BrainFlowExitCodes.STATUS_OK.value:
+            raise BrainFlowError('unable to unregister data callback', res)
+        self._data_callbacks.pop(preset, None)
+
+    def set_buffer_layout(self, layout: int, preset: int = BrainFlowPresets.DEFAULT_PRESET) -> None:
+        """Set layout of ring buffer for preset, columnar layout makes reads of a few channels cheaper, takes effect on the next start_stream
+
+        :param layout: layout from BufferLayouts enum
+        :type layout: int
+        :param preset: preset
+        :type preset: int
+        """
+
+        res = BoardControllerDLL.get_instance().set_buffer_layout(layout, preset, self.board_id, self.input_json)
+        if res != BrainFlowExitCodes.STATUS_OK.value:
+            raise BrainFlowError('unable to set buffer layout', res)
+
+    def set_buffer_policy(self, policy: int, preset: int = BrainFlowPresets.DEFAULT_PRESET) -> None:
+        """Set what happens when ring buffer for preset is full, with BLOCK policy acquisition waits until get_board_data frees space instead of overwriting the oldest samples, use it for playback and offline processing. Takes effect on the next start_stream
+
+        :param policy: policy from BufferPolicies enum
+        :type policy: int
+        :param preset: preset
+        :type preset: int
+        """
+
+        res = BoardControllerDLL.get_instance().set_buffer_policy(policy, preset, self.board_id, self.input_json)
+        if res != BrainFlowExitCodes.STATUS_OK.value:
+            raise BrainFlowError('unable to set buffer policy', res)
+
+    def _prepare_channels(self, channels, preset):
+        if channels is None:
+            return numpy.zeros(0).astype(numpy.int32), BoardShim.get_num_rows(self._master_board_id, preset)
+        channels_arr = numpy.array(channels).astype(numpy.int32)
+        if channels_arr.ndim != 1 or len(channels_arr) == 0:
+            raise BrainFlowError('channels should be non empty list of ints',
+                                 BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
+        return channels_arr, len(channels_arr)
+
+    def _check_out_array(self, out, num_samples, num_rows) -> None:
+        if not isinstance(out, numpy.ndarray) or out.dtype != numpy.float64 or out.ndim != 2:
+            raise BrainFlowError('out should be 2d float64 numpy array',
+                                 BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
+        if not out.flags['C_CONTIGUOUS'] or not out.flags['WRITEABLE']:
+            raise BrainFlowError('out should be writeable and C contiguous',
+                                 BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
+        if out.shape[0] != num_rows:
+            raise BrainFlowError('out should have %d rows' % num_rows,
+                                 BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
+        if num_samples is not None and out.shape[1] < num_samples:
+            raise BrainFlowError('out should have at least %d columns' % num_samples,
+                                 BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
+
     def config_board(self, config) -> str:
         """Use this method carefully and only if you understand what you are doing, do NOT use it to start or stop streaming
 
@@ -1414,3 +1693,101 @@ class BoardShim(object):
         res = BoardControllerDLL.get_instance().config_board_with_bytes(bytes_to_send, len(bytes_to_send), self.board_id, self.input_json)
         if res != BrainFlowExitCodes.STATUS_OK.value:
             raise BrainFlowError('unable to config board', res)
+
+
+class SharedMemoryReader(object):
+    """Read data published by streamer "shm://%name%:%size%" from another process on the same host, requires Python 3.8+
+
+    :param name: name of shared memory region, same as in streamer params
+    :type name: str
+    """
+
+    MAGIC = 0x424653484D524E47
+    HEADER_SIZE = 64
+
+    def __init__(self, name: str) -> None:
+        try:
+            from multiprocessing import shared_memory
+        except ImportError:
+            raise BrainFlowError('shared memory reader requires Python 3.8+',
+                                 BrainFlowExitCodes.GENERAL_ERROR.value)
+        try:
+            try:
+                self._shm = shared_memory.SharedMemory(name=name, create=False, track=False)
+            except TypeError:
+                self._shm = shared_memory.SharedMemory(name=name, create=False)
+                # before Python 3.13 tracker removes segment on exit even if it was created by BrainFlow
+                if os.name == 'posix':
+                    from multiprocessing import resource_tracker
+                    resource_tracker.unregister(self._shm._name, 'shared_memory')
+        except (FileNotFoundError, OSError) as e:
+            raise BrainFlowError('unable to open shared memory %s: %s' % (name, str(e)),
+                                 BrainFlowExitCodes.GENERAL_ERROR.value)
+        self._header = numpy.ndarray((4,), dtype=numpy.uint64, buffer=self._shm.buf)
+        if int(self._header[0]) != SharedMemoryReader.MAGIC:
+            self.close()
+            raise BrainFlowError('shared memory %s is not initialized by BrainFlow' % name,
+                                 BrainFlowExitCodes.GENERAL_ERROR.value)
+        self.num_rows = int(self._header[1])
+        self.capacity = int(self._header[2])
+        self._ring = numpy.ndarray((self.capacity, self.num_rows), dtype=numpy.float64, buffer=self._shm.buf,
+                                   offset=SharedMemoryReader.HEADER_SIZE)
+        self._next_seq = self.get_write_count()
+        self.num_dropped = 0
+
+    @property
+    def ring(self):
+        """Zero-copy view of the ring with shape (capacity, num_rows), sample n is stored in row n % capacity
+        and can be overwritten at any moment, use get_write_count to find the latest sample
+        """
+        return self._ring
+
+    def get_write_count(self) -> int:
+        """Get number of samples written by streamer so far
+
+        :return: number of written samples
+        :rtype: int
+        """
+        return int(self._header[3])
+
+    def _read(self, first, last):
+        idx = numpy.arange(first, last) % self.capacity
+        data = self._ring[idx].T.copy()
+        # writer could overwrite the oldest samples while we were copying them
+        valid_from = self.get_write_count() - self.capacity + 1
+        if valid_from > first:
+            skipped = min(valid_from - first, last - first)
+            data = data[:, skipped:]
+            first += skipped
+        return data, first
+
+    def get_new_data(self):
+        """Get samples written since the previous call, samples overwritten before reading are counted in num_dropped
+
+        :return: 2d array with shape (num_rows, num_samples)
+        :rtype: NDArray[Float64]
+        """
+        last = self.get_write_count()
+        first = max(self._next_seq, last - self.capacity)
+        data, valid_first = self._read(first, last)
+        self.num_dropped += valid_first - self._next_seq
+        self._next_seq = last
+        return data
+
+    def get_current_data(self, num_samples: int):
+        """Get latest samples, doesnt change position used by get_new_data
+
+        :param num_samples: max number of samples
+        :type num_samples: int
+        :return: 2d array with shape (num_rows, num_samples) or less if there is not enough data
+        :rtype: NDArray[Float64]
+        """
+        last = self.get_write_count()
+        first = max(0, last - min(num_samples, self.capacity))
+        return self._read(first, last)[0]
+
+    def close(self) -> None:
+        """Unmap shared memory, doesnt remove it"""
+        self._header = None
+        self._ring = None
+        self._shm.close()
@@ -1,5 +1,7 @@
+import concurrent.futures
 import ctypes
 import enum
+import json
 import os
 import platform
 import struct
@@ -317,6 +319,25 @@ class DataHandlerDLL(object):
             ndpointer(ctypes.c_int32)
         ]
 
+        self.get_num_rows_in_file = self.lib.get_num_rows_in_file
+        self.get_num_rows_in_file.restype = ctypes.c_int
+        self.get_num_rows_in_file.argtypes = [
+            ctypes.c_char_p,
+            ndpointer(ctypes.c_int32)
+        ]
+
+        self.read_file_chunk = self.lib.read_file_chunk
+        self.read_file_chunk.restype = ctypes.c_int
+        self.read_file_chunk.argtypes = [
+            ndpointer(ctypes.c_double),
+            ndpointer(ctypes.c_int32),
+            ndpointer(ctypes.c_int32),
+            ctypes.c_char_p,
+            ctypes.c_int,
+            ctypes.c_longlong,
+            ndpointer(ctypes.c_int64)
+        ]
+
         self.perform_rolling_filter = self.lib.perform_rolling_filter
         self.perform_rolling_filter.restype = ctypes.c_int
         self.perform_rolling_filter.argtypes = [
@@ -539,6 +560,10 @@ class DataHandlerDLL(object):
 class DataFilter(object):
     """DataFilter class contains methods for signal processig"""
 
+    BINARY_FILE_MAGIC = 0x5441444E49424642
+    # magic, version, header_size, board_id, preset, num_rows, data_type, sampling_rate, descr_size, reserved
+    BINARY_FILE_HEADER = struct.Struct('<QIIiiIIdII')
+
     @classmethod
     def set_log_level(cls, log_level: int) -> None:
         """set BrainFlow log level, use it only if you want to write your own messages to BrainFlow logger,
@@ -1359,6 +1384,125 @@ class DataFilter(object):
         data_arr = data_arr[0:num_rows[0] * num_cols[0]].reshape(num_rows[0], num_cols[0])
         return data_arr
 
+    @classmethod
+    def _read_file_chunk(cls, file: bytes, num_rows: int, chunk_samples: int, offset: int):
+        data_arr = numpy.zeros(num_rows * chunk_samples).astype(numpy.float64)
+        chunk_rows = numpy.zeros(1).astype(numpy.int32)
+        chunk_cols = numpy.zeros(1).astype(numpy.int32)
+        next_offset = numpy.zeros(1).astype(numpy.int64)
+        res = DataHandlerDLL.get_instance().read_file_chunk(data_arr, chunk_rows, chunk_cols, file,
+                                                            num_rows * chunk_samples, offset, next_offset)
+        if res != BrainFlowExitCodes.STATUS_OK.value:
+            raise BrainFlowError('unable to read file chunk at offset %d' % offset, res)
+        if chunk_cols[0] > 0 and chunk_rows[0] != num_rows:
+            raise BrainFlowError('chunk at offset %d has %d rows instead of %d' % (offset, chunk_rows[0], num_rows),
+                                 BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
+        return data_arr[0:num_rows * chunk_cols[0]].reshape(num_rows, chunk_cols[0]), int(next_offset[0])
+
+    @classmethod
+    def iter_file(cls, file_name: str, chunk_samples: int = 65536):
+        """read file in chunks without loading it to memory, next chunk is read in background thread while current one is processed. Supports files from write_file, "file://" and "file_bin://" streamers
+
+        :param file_name: file name to read
+        :type file_name: str
+        :param chunk_samples: number of samples in each chunk, the last chunk can be shorter
+        :type chunk_samples: int
+        :return: generator of 2d numpy arrays with the same layout as read_file, float32 for files written with "file_bin://%file_name%:w_float32"
+        :rtype: Iterator[NDArray[Shape["*, *"], Float64]]
+        """
+        if chunk_samples <= 0:
+            raise BrainFlowError('chunk_samples must be positive', BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
+        try:
+            with open(file_name, 'rb') as f:
+                magic = f.read(8)
+        except OSError as e:
+            raise BrainFlowError('unable to read file %s: %s' % (file_name, str(e)),
+                                 BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
+        if len(magic) == 8 and struct.unpack('<Q', magic)[0] == DataFilter.BINARY_FILE_MAGIC:
+            data = cls.read_binary_file(file_name)
+            for start in range(0, data.shape[1], chunk_samples):
+                yield numpy.array(data[:, start:start + chunk_samples])
+            return
+
+        try:
+            file = file_name.encode()
+        except BaseException:
+            file = file_name
+        num_rows = numpy.zeros(1).astype(numpy.int32)
+        res = DataHandlerDLL.get_instance().get_num_rows_in_file(file, num_rows)
+        if res != BrainFlowExitCodes.STATUS_OK.value:
+            raise BrainFlowError('unable to determine number of rows in file', res)
+        # ctypes releases GIL, so parsing of the next chunk overlaps with processing of the current one
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(cls._read_file_chunk, file, int(num_rows[0]), chunk_samples, 0)
+            while True:
+                chunk, offset = future.result()
+                if chunk.shape[1] == 0:
+                    return
+                future = executor.submit(cls._read_file_chunk, file, int(num_rows[0]), chunk_samples, offset)
+                yield chunk
+
+    @classmethod
+    def _read_binary_file_header(cls, file_name: str) -> dict:
+        try:
+            with open(file_name, 'rb') as f:
+                fixed = f.read(DataFilter.BINARY_FILE_HEADER.size)
+                if len(fixed) < DataFilter.BINARY_FILE_HEADER.size:
+                    raise BrainFlowError('file %s is too short for binary file header' % file_name,
+                                         BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
+                magic, version, header_size, board_id, preset, num_rows, data_type, sampling_rate, descr_size, _ = \
+                    DataFilter.BINARY_FILE_HEADER.unpack(fixed)
+                if magic != DataFilter.BINARY_FILE_MAGIC or version != 1:
+                    raise BrainFlowError('file %s is not written by binary file streamer' % file_name,
+                                         BrainFlowExitCodes.INVALID_ARGUMENTS_ERROR.value)
+                descr = f.read(descr_size)
+                file_size = os.fstat(f.fileno()).st_size
+        except OSError as e:
+            raise BrainFlowError('unable to read file %s: %s' % (file_name, str(e)),
+                                 BrainFlowExitCodes.GENERAL_ERROR.value)
+        dtype = numpy.dtype('<f8') if data_type == 0 else numpy.dtype('<f4')
+        # last sample can be incomplete if streamer is still running
+        num_samples = max(file_size - header_size, 0) // (num_rows * dtype.itemsize)
+        return {
+            'board_id': board_id,
+            'preset': preset,
+            'num_rows': num_rows,
+            'sampling_rate': sampling_rate,
+            'dtype': dtype,
+            'num_samples': num_samples,
+            'header_size': header_size,
+            'board_descr': json.loads(descr.decode('utf-8'))
+        }
+
+    @classmethod
+    def read_binary_file_info(cls, file_name: str) -> dict:
+        """read header of file written by streamer "file_bin://%file_name%:w" or "file_bin://%file_name%:w_float32"
+
+        :param file_name: file name to read
+        :type file_name: str
+        :return: dict with board_id, preset, num_rows, sampling_rate, dtype, num_samples and board_descr (description of the preset at recording time)
+        :rtype: dict
+        """
+        info = cls._read_binary_file_header(file_name)
+        del info['header_size']
+        return info
+
+    @classmethod
+    def read_binary_file(cls, file_name: str):
+        """memory map file written by streamer "file_bin://%file_name%:w" or "file_bin://%file_name%:w_float32", values are not parsed or copied
+
+        :param file_name: file name to read
+        :type file_name: str
+        :return: read only 2d array with the same layout as get_board_data, float32 for files written with w_float32
+        :rtype: NDArray[Shape["*, *"], Float64]
+        """
+        info = cls._read_binary_file_header(file_name)
+        if info['num_samples'] == 0:
+            return numpy.zeros((info['num_rows'], 0), dtype=info['dtype'])
+        data = numpy.memmap(file_name, dtype=info['dtype'], mode='r', offset=info['header_size'],
+                            shape=(info['num_samples'], info['num_rows']))
+        return data.T
+
     @classmethod
     def get_version(cls) -> str:
         """get version of brainflow libraries
@@ -0,0 +1,27 @@
+import time
+
+from brainflow.board_shim import BoardShim, BrainFlowInputParams, BoardIds
+from brainflow.data_filter import DataFilter
+
+
+def main():
+    BoardShim.enable_dev_board_logger()
+
+    params = BrainFlowInputParams()
+    board = BoardShim(BoardIds.SYNTHETIC_BOARD, params)
+    board.prepare_session()
+    board.start_stream(45000, 'file_bin://brainflow_data.bin:w')
+    time.sleep(5)
+    board.stop_stream()
+    board.release_session()
+
+    info = DataFilter.read_binary_file_info('brainflow_data.bin')
+    print(info['board_id'], info['sampling_rate'], info['num_samples'])
+    # file is mapped, not parsed, slicing reads only required pages
+    data = DataFilter.read_binary_file('brainflow_data.bin')
+    eeg_channels = info['board_descr']['eeg_channels']
+    print(data[eeg_channels, -10:])
+
+
+if __name__ == "__main__":
+    main()
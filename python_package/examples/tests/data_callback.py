@@ -0,0 +1,26 @@
+import time
+
+from brainflow.board_shim import BoardShim, BrainFlowInputParams, BoardIds
+
+
+def on_data(data):
+    # called from BrainFlow thread for each batch, data shape is (num_rows, batch_size)
+    print(data.shape)
+
+
+def main():
+    BoardShim.enable_dev_board_logger()
+
+    params = BrainFlowInputParams()
+    board = BoardShim(BoardIds.SYNTHETIC_BOARD, params)
+    board.prepare_session()
+    board.register_data_callback(on_data, batch_size=50)
+    board.start_stream()
+    time.sleep(5)
+    board.stop_stream()
+    board.unregister_data_callback()
+    board.release_session()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import os
+import threading
+import time
+
+from brainflow.board_shim import BoardShim, BrainFlowInputParams, BoardIds, BufferPolicies
+
+
+def main():
+    BoardShim.enable_dev_board_logger()
+
+    params = BrainFlowInputParams()
+    board_id = BoardIds.SYNTHETIC_BOARD.value
+    board = BoardShim(board_id, params)
+    board.prepare_session()
+    board.set_buffer_policy(BufferPolicies.BLOCK.value)
+    board.start_stream(100)
+    # nobody reads data, so acquisition thread waits for free space in the full buffer
+    time.sleep(1)
+    stats = board.get_buffer_stats()
+    print(stats)
+    if stats['blocked_time_ms'] <= 0:
+        raise ValueError('producer is not blocked')
+
+    # release_all_sessions must wake up blocked producer, otherwise it hangs in join
+    watchdog = threading.Timer(10.0, lambda: os._exit(1))
+    watchdog.start()
+    BoardShim.release_all_sessions()
+    watchdog.cancel()
+
+
+if __name__ == "__main__":
+    main()
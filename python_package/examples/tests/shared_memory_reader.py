@@ -0,0 +1,25 @@
+import time
+
+from brainflow.board_shim import BoardShim, BrainFlowInputParams, BoardIds, SharedMemoryReader
+
+
+def main():
+    BoardShim.enable_dev_board_logger()
+
+    params = BrainFlowInputParams()
+    board = BoardShim(BoardIds.SYNTHETIC_BOARD, params)
+    board.prepare_session()
+    # usually reader runs in another process on the same host
+    board.start_stream(45000, 'shm://brainflow_synthetic:10000')
+    reader = SharedMemoryReader('brainflow_synthetic')
+    for _ in range(5):
+        time.sleep(1)
+        data = reader.get_new_data()
+        print(data.shape)
+    reader.close()
+    board.stop_stream()
+    board.release_session()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+from brainflow.board_shim import BoardShim, BrainFlowInputParams, BoardIds
+
+
+def main():
+    BoardShim.enable_dev_board_logger()
+
+    params = BrainFlowInputParams()
+    board_id = BoardIds.SYNTHETIC_BOARD.value
+    window_size = BoardShim.get_sampling_rate(board_id)  # one second of data
+    board = BoardShim(board_id, params)
+    board.prepare_session()
+    board.start_stream()
+    for _ in range(5):
+        # sleeps until the window is full instead of polling get_board_data_count
+        count = board.wait_for_samples(window_size, timeout=5.0)
+        data = board.get_board_data(count)
+        print(data.shape)
+    board.stop_stream()
+    board.release_session()
+
+
+if __name__ == "__main__":
+    main()
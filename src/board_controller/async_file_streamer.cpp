@@ -0,0 +1,232 @@
+#include <algorithm>
+#include <chrono>
+
+#ifdef _WIN32
+#include <io.h>
+#else
+#include <unistd.h>
+#endif
+
+#include "async_file_streamer.h"
+#include "board.h"
+#include "brainflow_constants.h"
+#include "brainflow_env_vars.h"
+
+#define ASYNC_FILE_STREAMER_BATCH_SIZE 1024
+#define ASYNC_FILE_STREAMER_FILE_BUFFER_SIZE 65536
+
+
+AsyncFileStreamer::AsyncFileStreamer (
+    int data_len, std::string type, std::string dest, std::string mods)
+    : Streamer (data_len, type, dest, mods)
+{
+    fp = NULL;
+    db = NULL;
+    is_streaming = false;
+    wake_threshold = 1;
+    flush_interval_ms = get_brainflow_file_flush_interval_ms ();
+    sync = get_brainflow_file_sync ();
+    write_failed = false;
+    unflushed_samples = 0;
+    num_write_drops = 0;
+}
+
+AsyncFileStreamer::~AsyncFileStreamer ()
+{
+    stop_writer ();
+}
+
+int AsyncFileStreamer::start_writer (const char *file, const char *mode)
+{
+    if ((is_streaming) || (fp != NULL) || (db != NULL))
+    {
+        Board::board_logger->error ("file streamer is running");
+        return (int)BrainFlowExitCodes::GENERAL_ERROR;
+    }
+    fp = fopen (file, mode);
+    if (fp == NULL)
+    {
+        Board::board_logger->error ("failed to open file {}", file);
+        return (int)BrainFlowExitCodes::GENERAL_ERROR;
+    }
+    file_buffer.resize (ASYNC_FILE_STREAMER_FILE_BUFFER_SIZE);
+    setvbuf (fp, file_buffer.data (), _IOFBF, file_buffer.size ());
+    int res = write_header ();
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        fclose (fp);
+        fp = NULL;
+        return res;
+    }
+
+    db = new DataBuffer (len, (size_t)get_brainflow_file_queue_size ());
+    if (!db->is_ready ())
+    {
+        Board::board_logger->error ("unable to prepare buffer for file streamer");
+        delete db;
+        db = NULL;
+        fclose (fp);
+        fp = NULL;
+        return (int)BrainFlowExitCodes::INVALID_BUFFER_SIZE_ERROR;
+    }
+    batch.resize ((size_t)ASYNC_FILE_STREAMER_BATCH_SIZE * len);
+    // zero interval means flush after each sample, otherwise wake up for full batches, queue must
+    // not fill up before that
+    wake_threshold = 1;
+    if (flush_interval_ms > 0)
+    {
+        wake_threshold = std::min ((size_t)ASYNC_FILE_STREAMER_BATCH_SIZE,
+            std::max ((size_t)1, db->get_buffer_size () / 2));
+    }
+    write_failed = false;
+    unflushed_samples = 0;
+    num_write_drops = 0;
+
+    is_streaming = true;
+    writer_thread = std::thread ([this] { this->thread_worker (); });
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+void AsyncFileStreamer::stop_writer ()
+{
+    if (is_streaming)
+    {
+        {
+            std::lock_guard<std::mutex> lk (m);
+            is_streaming = false;
+        }
+        cv.notify_one ();
+        writer_thread.join ();
+    }
+    if (fp != NULL)
+    {
+        // samples added after writer thread exited
+        while ((db != NULL) && (write_batch () > 0))
+        {
+        }
+        flush ();
+        fclose (fp);
+        fp = NULL;
+    }
+    if (db != NULL)
+    {
+        delete db;
+        db = NULL;
+    }
+}
+
+void AsyncFileStreamer::stream_data (double *data)
+{
+    db->add_data (data);
+    // writer sleeps only while count is below threshold and only this thread increments it
+    if (db->get_data_count () == wake_threshold)
+    {
+        // writer checks the count under this mutex, so notification can not be lost
+        {
+            std::lock_guard<std::mutex> lk (m);
+        }
+        cv.notify_one ();
+    }
+}
+
+uint64_t AsyncFileStreamer::get_num_dropped ()
+{
+    return (db == NULL) ? 0 : db->get_num_overwritten () + num_write_drops;
+}
+
+void AsyncFileStreamer::thread_worker ()
+{
+    auto last_flush = std::chrono::steady_clock::now ();
+    auto predicate = [this]
+    { return (!is_streaming) || (db->get_data_count () >= wake_threshold); };
+    while (true)
+    {
+        {
+            std::unique_lock<std::mutex> lk (m);
+            if (flush_interval_ms > 0)
+            {
+                // samples of slow boards are written when flush is due
+                cv.wait_until (
+                    lk, last_flush + std::chrono::milliseconds (flush_interval_ms), predicate);
+            }
+            else
+            {
+                cv.wait (lk, predicate);
+            }
+            if (!is_streaming)
+            {
+                break;
+            }
+        }
+        // full batch means that writer is behind
+        while (write_batch () == ASYNC_FILE_STREAMER_BATCH_SIZE)
+        {
+        }
+        auto now = std::chrono::steady_clock::now ();
+        if (std::chrono::duration_cast<std::chrono::milliseconds> (now - last_flush).count () >=
+            flush_interval_ms)
+        {
+            flush ();
+            last_flush = now;
+        }
+    }
+}
+
+int AsyncFileStreamer::write_batch ()
+{
+    int num_samples = (int)db->get_data (ASYNC_FILE_STREAMER_BATCH_SIZE, batch.data ());
+    if (num_samples <= 0)
+    {
+        return num_samples;
+    }
+    if (write_failed)
+    {
+        num_write_drops += (uint64_t)num_samples;
+    }
+    else if (write_samples (batch.data (), num_samples))
+    {
+        unflushed_samples += (uint64_t)num_samples;
+    }
+    else
+    {
+        on_write_error ((uint64_t)num_samples);
+    }
+    return num_samples;
+}
+
+// samples in stdio buffer are lost as well, they are counted together with the failed batch
+void AsyncFileStreamer::on_write_error (uint64_t num_lost)
+{
+    Board::board_logger->error (
+        "failed to write to {}, samples are dropped until streamer is removed",
+        streamer_dest.c_str ());
+    write_failed = true;
+    num_write_drops += unflushed_samples + num_lost;
+    unflushed_samples = 0;
+}
+
+void AsyncFileStreamer::flush ()
+{
+    if (write_failed)
+    {
+        return;
+    }
+    // with full buffering most write errors show up only here
+    int res = fflush (fp);
+    if ((res == 0) && (sync))
+    {
+#if defined(_WIN32)
+        res = _commit (_fileno (fp));
+#elif defined(__APPLE__)
+        res = fsync (fileno (fp));
+#else
+        res = fdatasync (fileno (fp));
+#endif
+    }
+    if (res != 0)
+    {
+        on_write_error (0);
+        return;
+    }
+    unflushed_samples = 0;
+}
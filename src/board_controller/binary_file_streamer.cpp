@@ -0,0 +1,88 @@
+#include <string.h>
+
+#include "binary_file_streamer.h"
+#include "board.h"
+#include "brainflow_constants.h"
+
+static_assert (sizeof (BinaryFileHeader) == 48, "header layout is a part of file format");
+
+
+BinaryFileStreamer::BinaryFileStreamer (
+    const char *file, const char *file_mode, int board_id, int preset, json preset_descr)
+    : AsyncFileStreamer ((int)preset_descr["num_rows"], "file_bin", file, file_mode)
+{
+    this->file = file;
+    this->file_mode = file_mode;
+    this->board_id = board_id;
+    this->preset = preset;
+    this->preset_descr = preset_descr;
+    data_type = BinaryFileDataTypes::FLOAT64;
+}
+
+BinaryFileStreamer::~BinaryFileStreamer ()
+{
+    stop_writer ();
+}
+
+int BinaryFileStreamer::init_streamer ()
+{
+    // header describes whole file, so appending to existing file is not supported
+    if (file_mode == "w")
+    {
+        data_type = BinaryFileDataTypes::FLOAT64;
+    }
+    else if (file_mode == "w_float32")
+    {
+        data_type = BinaryFileDataTypes::FLOAT32;
+    }
+    else
+    {
+        Board::board_logger->error (
+            "invalid mode {}, format is file_bin://file_name:w or file_bin://file_name:w_float32",
+            file_mode.c_str ());
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    return start_writer (file.c_str (), "wb");
+}
+
+int BinaryFileStreamer::write_header ()
+{
+    std::string descr = preset_descr.dump ();
+    size_t header_size = sizeof (BinaryFileHeader) + descr.size ();
+    header_size = (header_size + 7) / 8 * 8;
+    BinaryFileHeader header;
+    memset (&header, 0, sizeof (header));
+    header.magic = BRAINFLOW_BIN_FILE_MAGIC;
+    header.version = BRAINFLOW_BIN_FILE_VERSION;
+    header.header_size = (uint32_t)header_size;
+    header.board_id = board_id;
+    header.preset = preset;
+    header.num_rows = (uint32_t)len;
+    header.data_type = (uint32_t)data_type;
+    header.sampling_rate = preset_descr.value ("sampling_rate", 0.0);
+    header.descr_size = (uint32_t)descr.size ();
+    std::vector<char> padding (header_size - sizeof (header) - descr.size (), 0);
+    if ((fwrite (&header, sizeof (header), 1, fp) != 1) ||
+        (fwrite (descr.c_str (), 1, descr.size (), fp) != descr.size ()) ||
+        (fwrite (padding.data (), 1, padding.size (), fp) != padding.size ()))
+    {
+        Board::board_logger->error ("failed to write header to {}", file.c_str ());
+        return (int)BrainFlowExitCodes::GENERAL_ERROR;
+    }
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+bool BinaryFileStreamer::write_samples (const double *samples, int num_samples)
+{
+    size_t num_values = (size_t)num_samples * len;
+    if (data_type == BinaryFileDataTypes::FLOAT32)
+    {
+        float_samples.resize (num_values);
+        for (size_t i = 0; i < num_values; i++)
+        {
+            float_samples[i] = (float)samples[i];
+        }
+        return fwrite (float_samples.data (), sizeof (float), num_values, fp) == num_values;
+    }
+    return fwrite (samples, sizeof (double), num_values, fp) == num_values;
+}
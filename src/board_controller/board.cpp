@@ -1,13 +1,17 @@
 #include <algorithm>
+#include <chrono>
 #include <string>
 #include <vector>
 
+#include "binary_file_streamer.h"
 #include "board.h"
 #include "board_controller.h"
+#include "callback_streamer.h"
 #include "custom_cast.h"
 #include "file_streamer.h"
 #include "multicast_streamer.h"
 #include "plotjuggler_udp_streamer.h"
+#include "shared_memory_streamer.h"
 
 #include "spdlog/sinks/null_sink.h"
 
@@ -79,6 +83,7 @@ int Board::prepare_for_acquisition (int buffer_size, const char *streamer_params
         return (int)BrainFlowExitCodes::INVALID_BUFFER_SIZE_ERROR;
     }
 
+    reset_preset_descrs ();
     for (auto it = dbs.begin (), next_it = it; it != dbs.end (); it = next_it)
     {
         ++next_it;
@@ -91,6 +96,11 @@ int Board::prepare_for_acquisition (int buffer_size, const char *streamer_params
         it->second.clear ();
         marker_queues.erase (it);
     }
+    for (int i = 0; i < MAX_PRESETS; i++)
+    {
+        blocked_time_us[i] = 0;
+    }
+    producers_unblocked = false;
     int res = (int)BrainFlowExitCodes::STATUS_OK;
 
     std::vector<std::string> required_fields {
@@ -128,7 +138,12 @@ int Board::prepare_for_acquisition (int buffer_size, const char *streamer_params
         for (auto &el : board_descr.items ())
         {
             json board_preset = el.value ();
-            DataBuffer *db = new DataBuffer ((int)board_preset["num_rows"], buffer_size);
+            int preset_int = preset_to_int (el.key ());
+            bool columnar = (buffer_layouts.find (preset_int) != buffer_layouts.end ()) &&
+                (buffer_layouts[preset_int] == (int)BufferLayouts::COLUMNAR);
+            bool block_when_full = (buffer_policies.find (preset_int) != buffer_policies.end ()) &&
+                (buffer_policies[preset_int] == (int)BufferPolicies::BLOCK);
+            DataBuffer *db = new DataBuffer ((int)board_preset["num_rows"], buffer_size, columnar);
             if (!db->is_ready ())
             {
                 safe_logger (
@@ -139,9 +154,17 @@ int Board::prepare_for_acquisition (int buffer_size, const char *streamer_params
             }
             else
             {
-                int preset_int = preset_to_int (el.key ());
                 dbs[preset_int] = db;
                 marker_queues[preset_int] = std::deque<double> ();
+                // map nodes are never moved, pointers stay valid until free_packages
+                std::lock_guard<std::mutex> wait_lock (wait_mutex);
+                PresetDescr &descr = preset_descrs[preset_int];
+                descr.num_rows = (int)board_preset["num_rows"];
+                descr.marker_channel = (int)board_preset["marker_channel"];
+                descr.block_when_full = block_when_full;
+                descr.marker_queue = &marker_queues[preset_int];
+                descr.streamers = &streamers[preset_int];
+                descr.db = db;
             }
         }
     }
@@ -156,46 +179,188 @@ int Board::prepare_for_acquisition (int buffer_size, const char *streamer_params
 
 void Board::push_package (double *package, int preset)
 {
-    std::string preset_str = preset_to_string (preset);
-    if ((board_descr.find (preset_str) == board_descr.end ()) || (dbs.find (preset) == dbs.end ()))
+    push_packages (package, 1, preset);
+}
+
+void Board::push_packages (double *packages, int num_packages, int preset)
+{
+    if ((preset < 0) || (preset >= MAX_PRESETS) || (preset_descrs[preset].db == NULL))
     {
         safe_logger (spdlog::level::err, "invalid json or push_package args, no such key");
         return;
     }
+    if (num_packages <= 0)
+    {
+        return;
+    }
+    PresetDescr &descr = preset_descrs[preset];
+    if (descr.block_when_full)
+    {
+        // dont hold board lock while waiting, consumers and config methods may need it
+        wait_for_free_space (preset, (size_t)num_packages);
+    }
 
     lock.lock ();
-    json board_preset = board_descr[preset_str];
-    try
+    for (int i = 0; i < num_packages; i++)
     {
-        int marker_channel = board_preset["marker_channel"];
-        if (marker_queues[preset].empty ())
+        double *package = packages + (size_t)i * descr.num_rows;
+        if (descr.marker_queue->empty ())
         {
-            package[marker_channel] = 0.0;
+            package[descr.marker_channel] = 0.0;
         }
         else
         {
-            double marker = marker_queues[preset].at (0);
-            package[marker_channel] = marker;
-            marker_queues[preset].pop_front ();
+            package[descr.marker_channel] = descr.marker_queue->front ();
+            descr.marker_queue->pop_front ();
         }
     }
-    catch (...)
+    descr.db->add_data (packages, (size_t)num_packages);
+    for (Streamer *streamer : *descr.streamers)
     {
-        safe_logger (spdlog::level::err, "Failed to get marker channel/value");
+        for (int i = 0; i < num_packages; i++)
+        {
+            streamer->stream_data (packages + (size_t)i * descr.num_rows);
+        }
+    }
+    lock.unlock ();
+
+    // pairs with the fence in wait_for_samples: either waiter sees new sample or we see threshold
+    std::atomic_thread_fence (std::memory_order_seq_cst);
+    size_t threshold = wait_thresholds[preset].load (std::memory_order_relaxed);
+    if ((threshold != 0) && (descr.db->get_data_count () >= threshold))
+    {
+        // waiter checks condition under wait_mutex, so notification can not be lost
+        {
+            std::lock_guard<std::mutex> wait_lock (wait_mutex);
+        }
+        wait_cv.notify_all ();
     }
+}
 
-    if (dbs[preset] != NULL)
+void Board::wait_for_free_space (int preset, size_t count)
+{
+    DataBuffer *db = preset_descrs[preset].db;
+    if (db == NULL)
     {
-        dbs[preset]->add_data (package);
+        return;
     }
-    if (streamers.find (preset) != streamers.end ())
+    // bigger batch can not fit anyway, wait until buffer is empty
+    size_t required = std::min (count, db->get_buffer_size ());
+    if (db->get_buffer_size () - db->get_data_count () >= required)
     {
-        for (auto &streamer : streamers[preset])
+        return;
+    }
+
+    std::unique_lock<std::mutex> space_lock (space_mutex);
+    num_blocked_producers[preset]++;
+    // pairs with the fence in get_board_data: either we see freed space or consumer sees counter
+    std::atomic_thread_fence (std::memory_order_seq_cst);
+    auto pred = [this, db, required] () {
+        return (producers_unblocked) ||
+            (db->get_buffer_size () - db->get_data_count () >= required);
+    };
+    // wait in slices to keep blocked time in buffer stats up to date while producer is waiting
+    bool done = false;
+    while (!done)
+    {
+        auto start = std::chrono::steady_clock::now ();
+        done = space_cv.wait_for (space_lock, std::chrono::milliseconds (100), pred);
+        auto stop = std::chrono::steady_clock::now ();
+        blocked_time_us[preset] +=
+            (uint64_t)std::chrono::duration_cast<std::chrono::microseconds> (stop - start).count ();
+    }
+    num_blocked_producers[preset]--;
+}
+
+void Board::unblock_producers ()
+{
+    {
+        std::lock_guard<std::mutex> space_lock (space_mutex);
+        producers_unblocked = true;
+    }
+    space_cv.notify_all ();
+}
+
+int Board::wait_for_samples (int num_samples, int timeout_ms, int preset, int *result)
+{
+    if ((num_samples <= 0) || (timeout_ms < 0) || (result == NULL))
+    {
+        safe_logger (spdlog::level::err, "invalid arguments for wait_for_samples");
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    if ((preset < 0) || (preset >= MAX_PRESETS))
+    {
+        safe_logger (spdlog::level::err, "invalid preset");
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+
+    std::unique_lock<std::mutex> wait_lock (wait_mutex);
+    if (preset_descrs[preset].db == NULL)
+    {
+        safe_logger (spdlog::level::err, "stream is not started or no preset: {}", preset);
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    size_t threshold = wait_thresholds[preset].load (std::memory_order_relaxed);
+    if ((threshold == 0) || (threshold > (size_t)num_samples))
+    {
+        wait_thresholds[preset].store ((size_t)num_samples, std::memory_order_relaxed);
+    }
+    num_waiters[preset]++;
+    std::atomic_thread_fence (std::memory_order_seq_cst);
+
+    // db is reset in free_packages under wait_mutex and waiters are woken up
+    wait_cv.wait_for (wait_lock, std::chrono::milliseconds (timeout_ms),
+        [this, preset, num_samples] ()
         {
-            streamer->stream_data (package);
-        }
+            DataBuffer *db = preset_descrs[preset].db;
+            return (db == NULL) || (db->get_data_count () >= (size_t)num_samples);
+        });
+
+    num_waiters[preset]--;
+    if (num_waiters[preset] == 0)
+    {
+        wait_thresholds[preset].store (0, std::memory_order_relaxed);
+    }
+    if (preset_descrs[preset].db == NULL)
+    {
+        safe_logger (spdlog::level::err, "buffers were released while waiting for samples");
+        return (int)BrainFlowExitCodes::STREAM_THREAD_IS_NOT_RUNNING;
+    }
+    *result = (int)preset_descrs[preset].db->get_data_count ();
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+int Board::get_buffer_stats (int preset, double *stats, int max_stats, int *num_stats)
+{
+    if ((stats == NULL) || (num_stats == NULL) || (max_stats < (int)BufferStats::NUM_STATS))
+    {
+        safe_logger (spdlog::level::err, "output array for buffer stats is too small");
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    if ((preset < 0) || (preset >= MAX_PRESETS) || (preset_descrs[preset].db == NULL))
+    {
+        safe_logger (spdlog::level::err, "stream is not started or no preset: {}", preset);
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+
+    DataBuffer *db = preset_descrs[preset].db;
+    uint64_t streamer_drops = 0;
+    lock.lock ();
+    for (Streamer *streamer : *preset_descrs[preset].streamers)
+    {
+        streamer_drops += streamer->get_num_dropped ();
     }
     lock.unlock ();
+
+    stats[(int)BufferStats::SAMPLES_PUSHED] = (double)db->get_num_pushed ();
+    stats[(int)BufferStats::SAMPLES_OVERWRITTEN] = (double)db->get_num_overwritten ();
+    stats[(int)BufferStats::CURRENT_FILL] = (double)db->get_data_count ();
+    stats[(int)BufferStats::PEAK_FILL] = (double)db->get_peak_fill ();
+    stats[(int)BufferStats::CAPACITY] = (double)db->get_buffer_size ();
+    stats[(int)BufferStats::STREAMER_DROPS] = (double)streamer_drops;
+    stats[(int)BufferStats::BLOCKED_TIME_MS] = (double)blocked_time_us[preset] / 1000.0;
+    *num_stats = (int)BufferStats::NUM_STATS;
+    return (int)BrainFlowExitCodes::STATUS_OK;
 }
 
 int Board::insert_marker (double value, int preset)
@@ -218,8 +383,24 @@ int Board::insert_marker (double value, int preset)
     return (int)BrainFlowExitCodes::STATUS_OK;
 }
 
+void Board::reset_preset_descrs ()
+{
+    std::lock_guard<std::mutex> wait_lock (wait_mutex);
+    for (int i = 0; i < MAX_PRESETS; i++)
+    {
+        preset_descrs[i].num_rows = 0;
+        preset_descrs[i].marker_channel = 0;
+        preset_descrs[i].block_when_full = false;
+        preset_descrs[i].db = NULL;
+        preset_descrs[i].streamers = NULL;
+        preset_descrs[i].marker_queue = NULL;
+    }
+    wait_cv.notify_all ();
+}
+
 void Board::free_packages ()
 {
+    reset_preset_descrs ();
     for (auto it = dbs.begin (), next_it = it; it != dbs.end (); it = next_it)
     {
         ++next_it;
@@ -270,6 +451,13 @@ int Board::add_streamer (const char *streamer_params, int preset)
             streamer_dest.c_str (), streamer_mods.c_str ());
         streamer = new FileStreamer (streamer_dest.c_str (), streamer_mods.c_str (), num_rows);
     }
+    if (streamer_type == "file_bin")
+    {
+        safe_logger (spdlog::level::trace, "Binary File Streamer, file: {}, mods: {}",
+            streamer_dest.c_str (), streamer_mods.c_str ());
+        streamer = new BinaryFileStreamer (streamer_dest.c_str (), streamer_mods.c_str (), board_id,
+            preset, board_descr[preset_str]);
+    }
     if (streamer_type == "streaming_board")
     {
         int port = 0;
@@ -303,6 +491,27 @@ int Board::add_streamer (const char *streamer_params, int preset)
         streamer =
             new PlotJugglerUDPStreamer (streamer_dest.c_str (), port, board_descr[preset_str]);
     }
+    if (streamer_type == "shm")
+    {
+        int capacity = 0;
+        try
+        {
+            capacity = std::stoi (streamer_mods);
+        }
+        catch (const std::exception &e)
+        {
+            safe_logger (spdlog::level::err, e.what ());
+            return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+        }
+        if ((capacity <= 0) || (capacity > MAX_CAPTURE_SAMPLES))
+        {
+            safe_logger (spdlog::level::err, "invalid shared memory size {}", capacity);
+            return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+        }
+        safe_logger (spdlog::level::trace, "Shared Memory Streamer, name: {}, size: {}",
+            streamer_dest.c_str (), streamer_mods.c_str ());
+        streamer = new SharedMemoryStreamer (streamer_dest.c_str (), capacity, num_rows);
+    }
 
     if (streamer == NULL)
     {
@@ -370,6 +579,68 @@ int Board::delete_streamer (const char *streamer_params, int preset)
     return res;
 }
 
+int Board::register_data_callback (
+    brainflow_data_callback callback, void *user_data, int batch_size, int preset)
+{
+    std::string preset_str = preset_to_string (preset);
+    if (board_descr.find (preset_str) == board_descr.end ())
+    {
+        safe_logger (spdlog::level::err, "invalid preset");
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    if ((callback == NULL) || (batch_size <= 0) || (batch_size > MAX_CAPTURE_SAMPLES))
+    {
+        safe_logger (spdlog::level::err, "invalid callback or batch size {}", batch_size);
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    int num_rows = (int)board_descr[preset_str]["num_rows"];
+    Streamer *streamer = new CallbackStreamer (callback, user_data, batch_size, num_rows);
+    int res = streamer->init_streamer ();
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        safe_logger (spdlog::level::err, "failed to init callback streamer");
+        delete streamer;
+        return res;
+    }
+    unregister_data_callback (preset);
+    lock.lock ();
+    streamers[preset].push_back (streamer);
+    lock.unlock ();
+    safe_logger (spdlog::level::info, "data callback registered for preset {}, batch size {}",
+        preset_str.c_str (), batch_size);
+    return res;
+}
+
+int Board::unregister_data_callback (int preset)
+{
+    if (streamers.find (preset) == streamers.end ())
+    {
+        return (int)BrainFlowExitCodes::STATUS_OK;
+    }
+    std::vector<Streamer *> callback_streamers;
+    lock.lock ();
+    std::vector<Streamer *>::iterator it = streamers[preset].begin ();
+    while (it != streamers[preset].end ())
+    {
+        if (dynamic_cast<CallbackStreamer *> (*it) != NULL)
+        {
+            callback_streamers.push_back (*it);
+            it = streamers[preset].erase (it);
+        }
+        else
+        {
+            it++;
+        }
+    }
+    lock.unlock ();
+    // dispatcher thread is joined outside of the lock to not stall acquisition thread
+    for (Streamer *streamer : callback_streamers)
+    {
+        delete streamer;
+    }
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
 int Board::parse_streamer_params (const char *streamer_params, std::string &streamer_type,
     std::string &streamer_dest, std::string &streamer_mods)
 {
@@ -403,6 +674,12 @@ int Board::parse_streamer_params (const char *streamer_params, std::string &stre
 
 int Board::get_current_board_data (
     int num_samples, int preset, double *data_buf, int *returned_samples)
+{
+    return get_current_board_data (num_samples, preset, data_buf, 0, returned_samples);
+}
+
+int Board::get_current_board_data (int num_samples, int preset, double *data_buf, int row_stride,
+    int *returned_samples, const int *channels, int num_channels)
 {
     std::string preset_str = preset_to_string (preset);
     if (board_descr.find (preset_str) == board_descr.end ())
@@ -420,18 +697,20 @@ int Board::get_current_board_data (
     {
         return (int)BrainFlowExitCodes::EMPTY_BUFFER_ERROR;
     }
-    if ((!data_buf) || (!returned_samples))
+    if ((!data_buf) || (!returned_samples) || (num_samples < 0) || (row_stride < 0) ||
+        ((row_stride > 0) && (row_stride < num_samples)))
     {
         return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
     }
 
-    int num_rows = (int)board_descr[preset_str]["num_rows"];
+    int res = check_channels (preset, channels, num_channels);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return res;
+    }
 
-    double *buf = new double[num_samples * num_rows];
-    int num_data_points = (int)dbs[preset]->get_current_data (num_samples, buf);
-    reshape_data (num_data_points, preset, buf, data_buf);
-    delete[] buf;
-    *returned_samples = num_data_points;
+    *returned_samples = (int)dbs[preset]->get_current_data_transposed (
+        num_samples, data_buf, row_stride, (num_channels > 0) ? channels : NULL, num_channels);
     return (int)BrainFlowExitCodes::STATUS_OK;
 }
 
@@ -457,6 +736,13 @@ int Board::get_board_data_count (int preset, int *result)
 }
 
 int Board::get_board_data (int data_count, int preset, double *data_buf)
+{
+    int returned_samples = 0;
+    return get_board_data (data_count, preset, data_buf, 0, &returned_samples);
+}
+
+int Board::get_board_data (int data_count, int preset, double *data_buf, int row_stride,
+    int *returned_samples, const int *channels, int num_channels)
 {
     std::string preset_str = preset_to_string (preset);
     if (board_descr.find (preset_str) == board_descr.end ())
@@ -474,30 +760,93 @@ int Board::get_board_data (int data_count, int preset, double *data_buf)
     {
         return (int)BrainFlowExitCodes::EMPTY_BUFFER_ERROR;
     }
-    if (!data_buf)
+    if ((!data_buf) || (!returned_samples) || (data_count < 0) || (row_stride < 0) ||
+        ((row_stride > 0) && (row_stride < data_count)))
     {
         return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
     }
-    int num_rows = (int)board_descr[preset_str]["num_rows"];
-    double *buf = new double[data_count * num_rows];
-    int num_data_points = (int)dbs[preset]->get_data (data_count, buf);
-    reshape_data (num_data_points, preset, buf, data_buf);
-    delete[] buf;
+    int res = check_channels (preset, channels, num_channels);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return res;
+    }
+    // data goes from ring buffer to output in channel major order without intermediate buffers
+    *returned_samples = (int)dbs[preset]->get_data_transposed (
+        data_count, data_buf, row_stride, (num_channels > 0) ? channels : NULL, num_channels);
+
+    std::atomic_thread_fence (std::memory_order_seq_cst);
+    if ((*returned_samples > 0) && (num_blocked_producers[preset] > 0))
+    {
+        // producer checks free space under space_mutex, so notification can not be lost
+        {
+            std::lock_guard<std::mutex> space_lock (space_mutex);
+        }
+        space_cv.notify_all ();
+    }
     return (int)BrainFlowExitCodes::STATUS_OK;
 }
 
-void Board::reshape_data (int data_count, int preset, const double *buf, double *output_buf)
+int Board::check_channels (int preset, const int *channels, int num_channels)
 {
-    std::string preset_str = preset_to_string (preset);
-    int num_rows = (int)board_descr[preset_str]["num_rows"];
-
-    for (int i = 0; i < data_count; i++)
+    if (num_channels == 0)
+    {
+        return (int)BrainFlowExitCodes::STATUS_OK;
+    }
+    if ((num_channels < 0) || (channels == NULL))
+    {
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    int num_rows = (int)board_descr[preset_to_string (preset)]["num_rows"];
+    for (int i = 0; i < num_channels; i++)
     {
-        for (int j = 0; j < num_rows; j++)
+        if ((channels[i] < 0) || (channels[i] >= num_rows))
         {
-            output_buf[j * data_count + i] = buf[i * num_rows + j];
+            safe_logger (
+                spdlog::level::err, "invalid channel {}, num rows is {}", channels[i], num_rows);
+            return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
         }
     }
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+int Board::set_buffer_layout (int layout, int preset)
+{
+    std::string preset_str = preset_to_string (preset);
+    if (board_descr.find (preset_str) == board_descr.end ())
+    {
+        safe_logger (spdlog::level::err, "invalid preset");
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    if ((layout != (int)BufferLayouts::ROW_MAJOR) && (layout != (int)BufferLayouts::COLUMNAR))
+    {
+        safe_logger (spdlog::level::err, "invalid buffer layout {}", layout);
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    buffer_layouts[preset] = layout;
+    safe_logger (spdlog::level::info,
+        "buffer layout for preset {} is set to {}, it will be used after next start_stream call",
+        preset_str, layout);
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+int Board::set_buffer_policy (int policy, int preset)
+{
+    std::string preset_str = preset_to_string (preset);
+    if (board_descr.find (preset_str) == board_descr.end ())
+    {
+        safe_logger (spdlog::level::err, "invalid preset");
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    if ((policy != (int)BufferPolicies::OVERWRITE) && (policy != (int)BufferPolicies::BLOCK))
+    {
+        safe_logger (spdlog::level::err, "invalid buffer policy {}", policy);
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    buffer_policies[preset] = policy;
+    safe_logger (spdlog::level::info,
+        "buffer policy for preset {} is set to {}, it will be used after next start_stream call",
+        preset_str, policy);
+    return (int)BrainFlowExitCodes::STATUS_OK;
 }
 
 std::string Board::preset_to_string (int preset)
@@ -373,6 +373,8 @@ int stop_stream (int board_id, const char *json_brainflow_input_params)
         return res;
     }
     auto board_it = boards.find (key);
+    // acquisition thread may wait for free space in buffer, it must not block join
+    board_it->second->unblock_producers ();
     return board_it->second->stop_stream ();
 }
 
@@ -401,6 +403,7 @@ int release_session (int board_id, const char *json_brainflow_input_params)
         return res;
     }
     auto board_it = boards.find (key);
+    board_it->second->unblock_producers ();
     res = board_it->second->release_session ();
     boards.erase (board_it);
     return res;
@@ -452,6 +455,105 @@ int get_board_data (int data_count, int preset, double *data_buf, int board_id,
     return board_it->second->get_board_data (data_count, preset, data_buf);
 }
 
+int get_current_board_data_into (int num_samples, int preset, double *data_buf, int row_stride,
+    int *returned_samples, const int *channels, int num_channels, int board_id,
+    const char *json_brainflow_input_params)
+{
+    std::lock_guard<std::mutex> lock (mutex);
+
+    std::pair<int, struct BrainFlowInputParams> key;
+    int res = check_board_session (board_id, json_brainflow_input_params, key, false);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return res;
+    }
+    auto board_it = boards.find (key);
+    return board_it->second->get_current_board_data (
+        num_samples, preset, data_buf, row_stride, returned_samples, channels, num_channels);
+}
+
+int get_board_data_into (int data_count, int preset, double *data_buf, int row_stride,
+    int *returned_samples, const int *channels, int num_channels, int board_id,
+    const char *json_brainflow_input_params)
+{
+    std::lock_guard<std::mutex> lock (mutex);
+
+    std::pair<int, struct BrainFlowInputParams> key;
+    int res = check_board_session (board_id, json_brainflow_input_params, key, false);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return res;
+    }
+    auto board_it = boards.find (key);
+    return board_it->second->get_board_data (
+        data_count, preset, data_buf, row_stride, returned_samples, channels, num_channels);
+}
+
+int wait_for_samples (int num_samples, int timeout_ms, int preset, int *result, int board_id,
+    const char *json_brainflow_input_params)
+{
+    std::shared_ptr<Board> board = NULL;
+    {
+        std::lock_guard<std::mutex> lock (mutex);
+
+        std::pair<int, struct BrainFlowInputParams> key;
+        int res = check_board_session (board_id, json_brainflow_input_params, key, false);
+        if (res != (int)BrainFlowExitCodes::STATUS_OK)
+        {
+            return res;
+        }
+        board = boards.find (key)->second;
+    }
+    // dont hold global mutex while waiting, shared_ptr keeps board alive even if session is
+    // released from another thread
+    return board->wait_for_samples (num_samples, timeout_ms, preset, result);
+}
+
+int get_buffer_stats (int preset, double *stats, int max_stats, int *num_stats, int board_id,
+    const char *json_brainflow_input_params)
+{
+    std::lock_guard<std::mutex> lock (mutex);
+
+    std::pair<int, struct BrainFlowInputParams> key;
+    int res = check_board_session (board_id, json_brainflow_input_params, key, false);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return res;
+    }
+    auto board_it = boards.find (key);
+    return board_it->second->get_buffer_stats (preset, stats, max_stats, num_stats);
+}
+
+int set_buffer_layout (
+    int layout, int preset, int board_id, const char *json_brainflow_input_params)
+{
+    std::lock_guard<std::mutex> lock (mutex);
+
+    std::pair<int, struct BrainFlowInputParams> key;
+    int res = check_board_session (board_id, json_brainflow_input_params, key, false);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return res;
+    }
+    auto board_it = boards.find (key);
+    return board_it->second->set_buffer_layout (layout, preset);
+}
+
+int set_buffer_policy (
+    int policy, int preset, int board_id, const char *json_brainflow_input_params)
+{
+    std::lock_guard<std::mutex> lock (mutex);
+
+    std::pair<int, struct BrainFlowInputParams> key;
+    int res = check_board_session (board_id, json_brainflow_input_params, key, false);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return res;
+    }
+    auto board_it = boards.find (key);
+    return board_it->second->set_buffer_policy (policy, preset);
+}
+
 int set_log_level_board_controller (int log_level)
 {
     std::lock_guard<std::mutex> lock (mutex);
@@ -575,6 +677,35 @@ int delete_streamer (
     return board_it->second->delete_streamer (streamer, preset);
 }
 
+int register_data_callback (brainflow_data_callback callback, void *user_data, int batch_size,
+    int preset, int board_id, const char *json_brainflow_input_params)
+{
+    std::lock_guard<std::mutex> lock (mutex);
+
+    std::pair<int, struct BrainFlowInputParams> key;
+    int res = check_board_session (board_id, json_brainflow_input_params, key, false);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return res;
+    }
+    auto board_it = boards.find (key);
+    return board_it->second->register_data_callback (callback, user_data, batch_size, preset);
+}
+
+int unregister_data_callback (int preset, int board_id, const char *json_brainflow_input_params)
+{
+    std::lock_guard<std::mutex> lock (mutex);
+
+    std::pair<int, struct BrainFlowInputParams> key;
+    int res = check_board_session (board_id, json_brainflow_input_params, key, false);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return res;
+    }
+    auto board_it = boards.find (key);
+    return board_it->second->unregister_data_callback (preset);
+}
+
 int release_all_sessions ()
 {
     std::lock_guard<std::mutex> lock (mutex);
@@ -582,6 +713,7 @@ int release_all_sessions ()
     for (auto it = boards.begin (), next_it = it; it != boards.end (); it = next_it)
     {
         ++next_it;
+        it->second->unblock_producers ();
         it->second->release_session ();
         boards.erase (it);
     }
@@ -1222,6 +1222,7 @@ BrainFlowBoards::BrainFlowBoards()
     brainflow_boards_json["boards"]["65"]["default"] = {
         {"name", "Cerelog_X8_BOARD"},
         {"sampling_rate", 500},
+        {"package_num_channel", 0},
         {"timestamp_channel", 10},
         {"marker_channel", 9},
         {"num_rows", 11},
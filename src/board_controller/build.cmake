@@ -59,9 +59,14 @@ SET (BOARD_CONTROLLER_SRC
     ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/dyn_lib_board.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/bt_lib_board.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/playback_file_board.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/playback_file_reader.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/async_file_streamer.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/file_streamer.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/binary_file_streamer.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/multicast_streamer.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/plotjuggler_udp_streamer.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/callback_streamer.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/shared_memory_streamer.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/gtec/unicorn_board.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/neuromd/neuromd_board.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/neuromd/brainbit.cpp
@@ -90,6 +95,9 @@ SET (BOARD_CONTROLLER_SRC
     ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/biolistener/biolistener.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/biolistener/biolistener.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/cerelog/cerelog.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/cerelog/ads1299_decoder.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/cerelog/cerelog_parser.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/cerelog/cerelog_clock_sync.cpp
 )
 
 include (${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/ant_neuro/build.cmake)
@@ -255,6 +263,10 @@ endif (ANDROID)
 
 if (UNIX AND NOT ANDROID)
     target_link_libraries (${BOARD_CONTROLLER_NAME} PRIVATE pthread dl)
+    if (NOT APPLE)
+        # shm_open for old glibc versions
+        target_link_libraries (${BOARD_CONTROLLER_NAME} PRIVATE rt)
+    endif (NOT APPLE)
 endif (UNIX AND NOT ANDROID)
 if (ANDROID)
     find_library (log-lib log)
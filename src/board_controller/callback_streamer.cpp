@@ -0,0 +1,119 @@
+#include <string>
+
+#include "board.h"
+#include "brainflow_constants.h"
+#include "callback_streamer.h"
+
+
+CallbackStreamer::CallbackStreamer (
+    brainflow_data_callback callback, void *user_data, int batch_size, int data_len)
+    : Streamer (data_len, "callback", "", std::to_string (batch_size))
+{
+    this->callback = callback;
+    this->user_data = user_data;
+    this->batch_size = (size_t)batch_size;
+    is_streaming = false;
+    db = NULL;
+}
+
+CallbackStreamer::~CallbackStreamer ()
+{
+    if ((streaming_thread.joinable ()) && (is_streaming))
+    {
+        {
+            std::lock_guard<std::mutex> lk (m);
+            is_streaming = false;
+        }
+        cv.notify_one ();
+        streaming_thread.join ();
+    }
+    if (db != NULL)
+    {
+        delete db;
+        db = NULL;
+    }
+}
+
+int CallbackStreamer::init_streamer ()
+{
+    if ((is_streaming) || (db != NULL))
+    {
+        Board::board_logger->error ("callback streamer is running");
+        return (int)BrainFlowExitCodes::GENERAL_ERROR;
+    }
+    if ((callback == NULL) || (batch_size == 0))
+    {
+        Board::board_logger->error ("invalid callback or batch size");
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+
+    // keep several batches to survive short stalls in user callback
+    size_t buffer_size = batch_size * 16;
+    if (buffer_size < 1000)
+    {
+        buffer_size = 1000;
+    }
+    db = new DataBuffer (len, buffer_size);
+    if (!db->is_ready ())
+    {
+        Board::board_logger->error ("unable to prepare buffer for callback streamer");
+        delete db;
+        db = NULL;
+        return (int)BrainFlowExitCodes::INVALID_BUFFER_SIZE_ERROR;
+    }
+
+    is_streaming = true;
+    streaming_thread = std::thread ([this] { this->thread_worker (); });
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+void CallbackStreamer::stream_data (double *data)
+{
+    db->add_data (data);
+    // dispatcher sleeps only while count is below batch_size and only this thread increments it,
+    // so it is enough to wake it up when count reaches batch_size
+    if (db->get_data_count () == batch_size)
+    {
+        // dispatcher checks the count under this mutex, so notification can not be lost
+        {
+            std::lock_guard<std::mutex> lk (m);
+        }
+        cv.notify_one ();
+    }
+}
+
+uint64_t CallbackStreamer::get_num_dropped ()
+{
+    return (db == NULL) ? 0 : db->get_num_overwritten ();
+}
+
+void CallbackStreamer::thread_worker ()
+{
+    double *batch = new double[batch_size * len];
+    while (true)
+    {
+        {
+            std::unique_lock<std::mutex> lk (m);
+            cv.wait (
+                lk, [this] { return (!is_streaming) || (db->get_data_count () >= batch_size); });
+            if (!is_streaming)
+            {
+                break;
+            }
+        }
+        // channel major batch, value of channel j for sample i is batch[j * batch_size + i]
+        size_t count = db->get_data_transposed (batch_size, batch);
+        if (count == batch_size)
+        {
+            callback (batch, len, (int)batch_size, user_data);
+        }
+    }
+    // streamer is removed from board before it is destroyed, so nothing is added anymore. Tail of
+    // the session goes to callback as a shorter batch instead of being lost
+    size_t count = 0;
+    while ((count = db->get_data_transposed (batch_size, batch)) > 0)
+    {
+        callback (batch, len, (int)count, user_data);
+    }
+    delete[] batch;
+}
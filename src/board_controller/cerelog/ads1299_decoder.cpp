@@ -0,0 +1,52 @@
+#include "ads1299_decoder.h"
+
+ADS1299Decoder::ADS1299Decoder ()
+{
+    num_rows = ADS1299_NUM_CHANNELS;
+    for (int ch = 0; ch < ADS1299_NUM_CHANNELS; ch++)
+    {
+        scales[ch] = get_scale (4.5, 24);
+        channel_rows[ch] = ch;
+    }
+}
+
+double ADS1299Decoder::get_scale (double vref, int gain)
+{
+    return 2.0 * vref / (double)gain / (double)(1 << 24);
+}
+
+void ADS1299Decoder::set_scale (int channel, double scale)
+{
+    if ((channel >= 0) && (channel < ADS1299_NUM_CHANNELS))
+    {
+        scales[channel] = scale;
+    }
+}
+
+void ADS1299Decoder::set_layout (const int *rows, int num_rows)
+{
+    for (int ch = 0; ch < ADS1299_NUM_CHANNELS; ch++)
+    {
+        channel_rows[ch] = rows[ch];
+    }
+    this->num_rows = num_rows;
+}
+
+void ADS1299Decoder::decode (
+    const unsigned char *const *frames, int num_frames, double *packages) const
+{
+    for (int i = 0; i < num_frames; i++)
+    {
+        const unsigned char *samples = frames[i] + ADS1299_STATUS_BYTES;
+        double *package = packages + (long)i * num_rows;
+        // fixed trip count, compiler unrolls it, sign is extended by arithmetic shift
+        for (int ch = 0; ch < ADS1299_NUM_CHANNELS; ch++)
+        {
+            const unsigned char *raw = samples + ch * ADS1299_BYTES_PER_CHANNEL;
+            int32_t value = (int32_t)(((uint32_t)raw[0] << 24) | ((uint32_t)raw[1] << 16) |
+                                ((uint32_t)raw[2] << 8)) >>
+                8;
+            package[channel_rows[ch]] = (double)value * scales[ch];
+        }
+    }
+}
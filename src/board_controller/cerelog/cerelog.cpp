@@ -4,15 +4,29 @@ Authors: 1. Suraj Kumar (surajratnam99@gmail.com)
 ***********************/
 
 #include "cerelog.h"
+#include "ads1299_decoder.h"
+#include "cerelog_clock_sync.h"
 #include "os_serial.h" // replaced FTDI
 #include "serial.h"    // OSSerial needs Serial class to compile properly
+#include "timestamp.h"
 #include <ctime>
 #include <stdint.h>
 
+#include <algorithm>
+#include <fstream>
+#include <set>
+
 #ifndef _WIN32
+#include <dirent.h>
 #include <errno.h>
+#include <limits.h>
+#include <stdlib.h>
 #endif
 
+std::map<std::string, std::string> Cerelog_X8::cached_ports;
+std::set<std::string> Cerelog_X8::claimed_ports;
+std::mutex Cerelog_X8::cached_ports_mutex;
+
 // serial port & baud rate conditionals
 struct PortInfo
 {
@@ -29,7 +43,7 @@ PortInfo get_port_info ()
     info.os = "Windows";
     info.baudrate = 921600;
 #elif defined(__APPLE__)
-    info.os = "Darwin";   // MacOS
+    info.os = "Darwin"; // MacOS
     info.baudrate = 230400;
 #elif defined(__linux__)
     info.os = "Linux";
@@ -41,8 +55,6 @@ PortInfo get_port_info ()
     return info;
 }
 
-constexpr int LOG_FREQUENCY = 1000; // Log every 1000 samples
-
 /* Constructor */
 Cerelog_X8::Cerelog_X8 (int board_id, struct BrainFlowInputParams params) : Board (board_id, params)
 {
@@ -50,12 +62,9 @@ Cerelog_X8::Cerelog_X8 (int board_id, struct BrainFlowInputParams params) : Boar
     is_streaming = false;
     keep_alive = false;
     initialized = false;
-    sync_established = false;
-    first_packet_counter = 0;
-    first_packet_timestamp = 0.0;
-    last_sync_counter = 0;
-    last_sync_timestamp = 0.0;
     state = (int)BrainFlowExitCodes::SYNC_TIMEOUT_ERROR;
+    config_version = 0;
+    reset_stats ();
 
     // TODO can this section be deleted?
     /* Set sampling_rate from params
@@ -74,100 +83,225 @@ Cerelog_X8::Cerelog_X8 (int board_id, struct BrainFlowInputParams params) : Boar
 /* Configures serial port and baud rate that Cerelog X8 will use */
 int Cerelog_X8::prepare_session ()
 {
-    // PORT SCANNING: Automatically detect available serial ports for the device
-    std::string port_path;
-    auto info = get_port_info ();
-    if (params.serial_port.empty ())
+    // upper bound for each wait below, board answers much faster if it is connected
+    if (params.timeout <= 0)
+    {
+        params.timeout = 5;
+    }
+
+    std::string port_path = params.serial_port;
+    int res = (int)BrainFlowExitCodes::STATUS_OK;
+    if (port_path.empty ())
     {
-        port_path = scan_for_device_port (); // Use port scanning instead of default
-        safe_logger (spdlog::level::info, "Using scanned port for {} OS: {}", info.os, port_path);
+        res = scan_for_device_port (&serial, port_path);
+        if (res != (int)BrainFlowExitCodes::STATUS_OK)
+        {
+            return res;
+        }
+        safe_logger (spdlog::level::info, "Found Cerelog X8 on port: {}", port_path);
     }
     else
     {
-        port_path = params.serial_port;
         safe_logger (spdlog::level::info, "Using user-specified port: {}", port_path);
+        if (!claim_port (port_path))
+        {
+            safe_logger (spdlog::level::err, "Port {} is used by another session", port_path);
+            return (int)BrainFlowExitCodes::PORT_ALREADY_OPEN_ERROR;
+        }
+        res = connect_port (port_path, &serial);
+        if (res == (int)BrainFlowExitCodes::SYNC_TIMEOUT_ERROR)
+        {
+            // port is open, board may start streaming later and start_stream reports it if not
+            safe_logger (
+                spdlog::level::warn, "No valid frames in {} sec after handshake", params.timeout);
+        }
+        else if (res != (int)BrainFlowExitCodes::STATUS_OK)
+        {
+            unclaim_port (port_path);
+            return res;
+        }
+        else
+        {
+            cache_port (port_path);
+        }
     }
 
+    // port stays claimed until release_session
+    session_port = port_path;
+
+    // Successfully prepared session
+    initialized = true;
+    safe_logger (
+        spdlog::level::info, "prepare_session() completed successfully, returning STATUS_OK");
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+/* Opens the port, sends handshake and switches to target baud rate. Port is returned for STATUS_OK
+ * and SYNC_TIMEOUT_ERROR (opened but no valid frames), STATUS_OK means that port is confirmed.
+ * With require_frames nothing is written unless the port already streams Cerelog frames */
+int Cerelog_X8::connect_port (const std::string &port_path, Serial **result,
+    const std::atomic<bool> *cancelled, bool require_frames)
+{
+    *result = NULL;
+    auto info = get_port_info ();
+
     // Open serial port - create OSSerial directly
-    serial = new OSSerial (port_path.c_str ());
-    // Old code with FTDI: serial = Serial::create(port_path.c_str(), this);
-    int response = serial->open_serial_port ();
+    Serial *port = new OSSerial (port_path.c_str ());
+    int response = port->open_serial_port ();
     if (response < 0)
     {
-        safe_logger (spdlog::level::err, "Failed to open serial port: {}", port_path);
+        safe_logger (spdlog::level::debug, "Failed to open serial port: {}", port_path);
+        delete port;
         return (int)BrainFlowExitCodes::UNABLE_TO_OPEN_PORT_ERROR;
     }
 
-    // Set default baud rate for handshake
-    response = serial->set_custom_baudrate (info.default_baudrate);
+    // Set other serial settings, they reset baud rate so custom baud rate is set after them
+    response = port->set_serial_port_settings (
+        params.timeout * 3000, false); // timeout (params.timeout times 3 seconds)
     if (response < 0)
     {
-        safe_logger (
-            spdlog::level::err, "Failed to set default baudrate: {}", info.default_baudrate);
+        safe_logger (spdlog::level::err, "Failed to set serial port settings for {}", port_path);
+        delete port;
         return (int)BrainFlowExitCodes::BOARD_WRITE_ERROR;
     }
 
-    // Set other serial settings
-    response = serial->set_serial_port_settings (
-        params.timeout * 3000, false); // timeout (params.timeout times 3 seconds)
+    int handshake_baudrate = info.default_baudrate;
+    if (require_frames)
+    {
+        // firmware streams without handshake: at target baud rate if previous session configured
+        // it, at default baud rate after reset. Other devices never see a single byte from us
+        if ((port->set_custom_baudrate (info.baudrate) >= 0) &&
+            (wait_for_first_frame (port, CERELOG_PROBE_TIMEOUT_MS, cancelled) ==
+                (int)BrainFlowExitCodes::STATUS_OK))
+        {
+            handshake_baudrate = info.baudrate;
+        }
+        else if ((port->set_custom_baudrate (info.default_baudrate) < 0) ||
+            (wait_for_first_frame (port, params.timeout * 1000, cancelled) !=
+                (int)BrainFlowExitCodes::STATUS_OK))
+        {
+            safe_logger (spdlog::level::debug, "No Cerelog frames on {}, skipping", port_path);
+            delete port;
+            return (int)BrainFlowExitCodes::SYNC_TIMEOUT_ERROR;
+        }
+        safe_logger (
+            spdlog::level::debug, "Cerelog frames on {} at {} baud", port_path, handshake_baudrate);
+        // handshake response must not be satisfied by frames received before it
+        port->flush_buffer ();
+    }
+
+    // Set baud rate for handshake
+    response = port->set_custom_baudrate (handshake_baudrate);
     if (response < 0)
     {
-        safe_logger (spdlog::level::err, "Timed out - failed to set serial port settings");
+        safe_logger (
+            spdlog::level::err, "Failed to set baudrate {} for {}", handshake_baudrate, port_path);
+        delete port;
         return (int)BrainFlowExitCodes::BOARD_WRITE_ERROR;
     }
 
     // Send timestamp handshake to board with baud rate configuration
-    // reg_addr = 0x01 for baud rate configuration, reg_val = baud rate index
+    // reg_val = baud rate index
     uint8_t baud_config = 0x04; // 115200
-    if (info.baudrate == 230400) baud_config = 0x05;      // 230400
-    else if (info.baudrate == 460800) baud_config = 0x06; // 460800
-    else if (info.baudrate == 921600) baud_config = 0x07; // 921600
-    
-    response = send_timestamp_handshake (0x01, baud_config);
+    if (info.baudrate == 230400)
+    {
+        baud_config = 0x05;
+    }
+    else if (info.baudrate == 460800)
+    {
+        baud_config = 0x06;
+    }
+    else if (info.baudrate == 921600)
+    {
+        baud_config = 0x07;
+    }
+
+    response = send_timestamp_handshake (port, CERELOG_REG_BAUD_RATE, baud_config, cancelled);
     if (response != (int)BrainFlowExitCodes::STATUS_OK)
     {
-        safe_logger (
-            spdlog::level::warn, "Timestamp handshake failed, continuing with fallback time");
+        safe_logger (spdlog::level::warn,
+            "Timestamp handshake failed on {}, continuing with fallback time", port_path);
     }
 
     // Switch to target baud rate for data streaming
     safe_logger (spdlog::level::info, "Switching to target baud rate: {}", info.baudrate);
-    response = serial->set_custom_baudrate (info.baudrate);
+    response = port->set_custom_baudrate (info.baudrate);
     if (response < 0)
     {
-        safe_logger (
-            spdlog::level::warn, "Failed to switch to target baudrate: {}, continuing with default: {}", info.baudrate, info.default_baudrate);
-    } else {
-        safe_logger (spdlog::level::info, "Successfully switched to target baud rate: {} on OS: {}", info.baudrate, info.os);
-        
-        // Flush serial buffer to clear partial packets after baud rate switch
-        std::this_thread::sleep_for (std::chrono::milliseconds (300)); // 0.3 seconds
-        unsigned char flush_buffer[1000];
-        int flush_result = serial->read_from_serial_port (flush_buffer, sizeof(flush_buffer));
-        if (flush_result > 0) {
-            safe_logger (spdlog::level::debug, "Flushed {} bytes from serial buffer after baud rate switch", flush_result);
-        }
+        safe_logger (spdlog::level::warn,
+            "Failed to switch to target baudrate: {}, continuing with default: {}", info.baudrate,
+            info.default_baudrate);
+    }
+    else
+    {
+        safe_logger (spdlog::level::info, "Successfully switched to target baud rate: {} on OS: {}",
+            info.baudrate, info.os);
     }
 
-    // Give Arduino time to reset after serial connection
-    std::this_thread::sleep_for (std::chrono::milliseconds (300)); // 0.3 seconds
-    
-    // Additional delay after handshake to ensure ESP32 is ready
-    std::this_thread::sleep_for (std::chrono::milliseconds (500)); // 0.5 seconds after handshake
-
-    // Successfully prepared session
-    initialized = true;
-    safe_logger (spdlog::level::info, "prepare_session() completed successfully, returning STATUS_OK");
-    return (int)BrainFlowExitCodes::STATUS_OK;
+    // board is ready as soon as it streams valid frames at the new baud rate, bytes received
+    // before that (partial packets after baud rate switch) are dropped here
+    *result = port;
+    return wait_for_first_frame (port, params.timeout * 1000, cancelled);
 }
 
 
-/* This sends config bytes to the message server on Cerelog X8 and it then packages and executes
- * them */
+/* Gain and sample rate commands are validated, but firmware 1.0 applies only the baud rate register
+ * from handshake packets and ignores other registers. Until firmware acknowledges them, commands
+ * are rejected so scales and timestamps never diverge from what the chip really does */
 int Cerelog_X8::config_board (std::string config, std::string &response)
 {
-    // Simple baud rateconfiguration
-    response = "Configuration not supported in current implementation. Using automatic baud rate switching.";
+    if (config == "get_stats")
+    {
+        response = get_stats ();
+        return (int)BrainFlowExitCodes::STATUS_OK;
+    }
+    if (serial == NULL)
+    {
+        return (int)BrainFlowExitCodes::BOARD_NOT_CREATED_ERROR;
+    }
+
+    std::lock_guard<std::mutex> lk (config_mutex);
+    int res = gain_tracker.apply_config (config);
+    if (res == (int)CerelogCommandTypes::INVALID_COMMAND)
+    {
+        safe_logger (spdlog::level::warn,
+            "invalid command: {}, gain must be one of 1, 2, 4, 6, 8, 12, 24", config);
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    if (res == (int)CerelogCommandTypes::VALID_COMMAND)
+    {
+        gain_tracker.revert_config ();
+        safe_logger (
+            spdlog::level::err, "{} is not supported, firmware ignores gain registers", config);
+        return (int)BrainFlowExitCodes::UNSUPPORTED_BOARD_ERROR;
+    }
+
+    const std::string rate_prefix = "sampling_rate=";
+    if (config.compare (0, rate_prefix.size (), rate_prefix) == 0)
+    {
+        int rate = atoi (config.c_str () + rate_prefix.size ());
+        if (get_sample_rate_code (rate) < 0)
+        {
+            safe_logger (spdlog::level::warn,
+                "invalid command: {}, sampling rate must be one of 250, 500, 1000, 2000, 4000, "
+                "8000, 16000",
+                config);
+            return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+        }
+        // uart with 8N1 framing moves baudrate / 10 bytes per second
+        int baudrate = get_port_info ().baudrate;
+        if (rate * CERELOG_PACKET_TOTAL_SIZE > baudrate / 10)
+        {
+            safe_logger (
+                spdlog::level::warn, "sampling rate {} needs more than {} baud", rate, baudrate);
+            return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+        }
+        safe_logger (spdlog::level::err,
+            "{} is not supported, firmware ignores sample rate register", config);
+        return (int)BrainFlowExitCodes::UNSUPPORTED_BOARD_ERROR;
+    }
+
+    response = "Supported commands: get_stats";
     return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
 }
 
@@ -192,24 +326,27 @@ int Cerelog_X8::start_stream (int buffer_size, const char *streamer_params)
     int res = prepare_for_acquisition (buffer_size, streamer_params); // this is BrainFlow command
     if (res != (int)BrainFlowExitCodes::STATUS_OK)
     {
-        safe_logger(spdlog::level::debug, "Stuck at prepare_for_acquisition()");
+        safe_logger (spdlog::level::debug, "Stuck at prepare_for_acquisition()");
         return res;
     }
-    // Give Arduino time to reset after serial connection
-    std::this_thread::sleep_for (std::chrono::milliseconds (300)); // 0.3 seconds
-    
+    // frames which piled up since prepare_session are stale, read thread starts with live data
+    serial->flush_buffer ();
+
     // Streaming begins now - firmware already started streaming after handshake
-    safe_logger (spdlog::level::debug, "Starting streaming - (firmware automatically started streaming after handshake)");
+    safe_logger (spdlog::level::debug,
+        "Starting streaming - (firmware automatically started streaming after handshake)");
     // No need to send "b\n" command - firmware starts streaming immediately after handshake
+    reset_stats ();
     keep_alive = true;
     streaming_thread = std::thread ([this] { this->read_thread (); });
 
     // Check for incoming data, set timeout
     safe_logger (spdlog::level::debug, "Checking for incoming data using mutex");
     std::unique_lock<std::mutex> lk (this->m); // TODO What is mutex?
-    auto sec = std::chrono::milliseconds (10000); // 10 seconds
+    auto sec = std::chrono::seconds (params.timeout);
     bool state_changed = cv.wait_for (lk, sec,
-        [this] () {
+        [this] ()
+        {
             if (this->state == (int)BrainFlowExitCodes::SYNC_TIMEOUT_ERROR)
             {
                 safe_logger (spdlog::level::warn, "SYNC_TIMEOUT_ERROR detected in wait_for lambda");
@@ -217,7 +354,9 @@ int Cerelog_X8::start_stream (int buffer_size, const char *streamer_params)
             return (this->state != (int)BrainFlowExitCodes::SYNC_TIMEOUT_ERROR);
         });
 
-    if (state_changed) { // how is state_changed being calculated?
+    // how is state_changed being calculated?
+    if (state_changed)
+    {
         this->is_streaming = true;
         safe_logger (spdlog::level::debug,
             "The state of the board has changed from TIMEOUT ERROR to " +
@@ -228,6 +367,8 @@ int Cerelog_X8::start_stream (int buffer_size, const char *streamer_params)
     {
         // Timeout occurred - clean up and return error
         safe_logger (spdlog::level::warn, "Board timed out - stopping thread and cleaning up");
+        // read thread takes this mutex to report its state, dont hold it while joining
+        lk.unlock ();
         this->keep_alive = false; // Stop the read thread
         if (streaming_thread.joinable ())
         {
@@ -239,8 +380,9 @@ int Cerelog_X8::start_stream (int buffer_size, const char *streamer_params)
 }
 
 
-/* Function sends the current system time through a handshake with optional configuration */
-int Cerelog_X8::send_timestamp_handshake (uint8_t reg_addr, uint8_t reg_val)
+/* Sends 0xAABB packet with current system time and one configuration register, doesnt wait for
+ * response so it can be used while read thread owns the port */
+int Cerelog_X8::send_register_packet (Serial *port, uint8_t reg_addr, uint8_t reg_val)
 {
     // Get system time or set fallback
     std::time_t current_time = std::time (nullptr);
@@ -264,66 +406,129 @@ int Cerelog_X8::send_timestamp_handshake (uint8_t reg_addr, uint8_t reg_val)
     packet[6] = unix_timestamp & 0xFF;       // timestamp LSB
     packet[7] = reg_addr;                    // configuration register address
     packet[8] = reg_val;                     // configuration register value
-    packet[9] = packet[2] + packet[3] + packet[4] + packet[5] + packet[6] + packet[7] + packet[8]; // checksum
-    packet[10] = 0xCC;                       // end marker byte 1
-    packet[11] = 0xDD;                       // end marker byte 2
+    // checksum
+    packet[9] = packet[2] + packet[3] + packet[4] + packet[5] + packet[6] + packet[7] + packet[8];
+    packet[10] = 0xCC; // end marker byte 1
+    packet[11] = 0xDD; // end marker byte 2
 
     // DEBUG: print handshake packet bytes
     std::string packet_hex;
-    for (int i = 0; i < 12; ++i) {
+    for (int i = 0; i < 12; ++i)
+    {
         char buf[6];
-        snprintf(buf, sizeof(buf), "%02X ", packet[i]);
+        snprintf (buf, sizeof (buf), "%02X ", packet[i]);
         packet_hex += buf;
     }
-    safe_logger(spdlog::level::info, "Sending handshake packet: {}", packet_hex);
+    safe_logger (spdlog::level::info, "Sending register packet: {}", packet_hex);
 
-    // Send packet and wait for "OK" response
-    int result = serial->send_to_serial_port (reinterpret_cast<const char *> (packet), 12);
+    int result = port->send_to_serial_port (reinterpret_cast<const char *> (packet), 12);
     if (result < 0)
     {
-        safe_logger (spdlog::level::err, "Failed to send timestamp packet");
+        safe_logger (spdlog::level::err, "Failed to send register packet");
         return (int)BrainFlowExitCodes::BOARD_WRITE_ERROR;
     }
-    std::this_thread::sleep_for (std::chrono::milliseconds (5000)); // wait 5 seconds for handshake
-    
-    // Wait for OK response or any valid data packet
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+/* Function sends the current system time through a handshake with optional configuration */
+int Cerelog_X8::send_timestamp_handshake (
+    Serial *port, uint8_t reg_addr, uint8_t reg_val, const std::atomic<bool> *cancelled)
+{
+    int result = send_register_packet (port, reg_addr, reg_val);
+    if (result != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return result;
+    }
+    // Wait for OK response or any valid data packet, return as soon as something arrives
     safe_logger (spdlog::level::debug, "Waiting for handshake response...");
     unsigned char response[50]; // Read more bytes to catch full data packets
-    int bytes_read = serial->read_from_serial_port (response, 50); // Read up to 50 bytes
-    
-    if (bytes_read > 0) {
-        safe_logger (spdlog::level::info, "Received handshake response ({} bytes): {:02X} {:02X} {:02X} {:02X} {:02X} {:02X} {:02X} {:02X} {:02X} {:02X}", 
-            bytes_read, response[0], response[1], response[2], response[3], response[4], 
+    int bytes_read = 0;
+    auto deadline = std::chrono::steady_clock::now () + std::chrono::seconds (params.timeout);
+    while ((bytes_read <= 0) && (std::chrono::steady_clock::now () < deadline) &&
+        ((cancelled == NULL) || (!cancelled->load ())))
+    {
+        bytes_read = port->read_available (response, 50, CERELOG_POLL_INTERVAL_MS);
+    }
+
+    if (bytes_read > 0)
+    {
+        safe_logger (spdlog::level::info,
+            "Received handshake response ({} bytes): {:02X} {:02X} {:02X} {:02X} {:02X} {:02X} "
+            "{:02X} {:02X} {:02X} {:02X}",
+            bytes_read, response[0], response[1], response[2], response[3], response[4],
             response[5], response[6], response[7], response[8], response[9]);
-        
+
         // Check if it's a valid data packet (starts with 0xAB 0xCD) anywhere in the response
-        for (int i = 0; i < bytes_read - 1; i++) {
-            if (response[i] == 0xAB && response[i+1] == 0xCD) {
-                safe_logger (spdlog::level::info, "Found valid data packet pattern at position {} - handshake successful!", i);
+        for (int i = 0; i < bytes_read - 1; i++)
+        {
+            if (response[i] == 0xAB && response[i + 1] == 0xCD)
+            {
+                safe_logger (spdlog::level::info,
+                    "Found valid data packet pattern at position {} - handshake successful!", i);
                 return (int)BrainFlowExitCodes::STATUS_OK;
             }
         }
-        
+
         // Check if it's zeros (device not ready yet)
         bool all_zeros = true;
-        for (int i = 0; i < bytes_read; i++) {
-            if (response[i] != 0x00) {
+        for (int i = 0; i < bytes_read; i++)
+        {
+            if (response[i] != 0x00)
+            {
                 all_zeros = false;
                 break;
             }
         }
-        
-        if (all_zeros) {
+
+        if (all_zeros)
+        {
             safe_logger (spdlog::level::warn, "Received all zeros - device may not be ready yet");
-        } else {
+        }
+        else
+        {
             // Accept any non-zero response as handshake success (device is sending data)
-            safe_logger (spdlog::level::info, "Received non-zero response from ESP32 - handshake successful!");
+            safe_logger (spdlog::level::info,
+                "Received non-zero response from ESP32 - handshake successful!");
+            return (int)BrainFlowExitCodes::STATUS_OK;
+        }
+    }
+    else
+    {
+        safe_logger (
+            spdlog::level::warn, "No response received from ESP32 on {}", port->get_port_name ());
+    }
+
+    return (int)BrainFlowExitCodes::SYNC_TIMEOUT_ERROR;
+}
+
+
+/* Polls the port until the first valid frame arrives, everything received before it is dropped */
+int Cerelog_X8::wait_for_first_frame (
+    Serial *port, int timeout_ms, const std::atomic<bool> *cancelled)
+{
+    CerelogStats scan_stats;
+    scan_stats.reset ();
+    CerelogParser parser (&scan_stats);
+    const unsigned char *frame = NULL;
+    auto deadline = std::chrono::steady_clock::now () + std::chrono::milliseconds (timeout_ms);
+    while ((std::chrono::steady_clock::now () < deadline) &&
+        ((cancelled == NULL) || (!cancelled->load ())))
+    {
+        int free_space = 0;
+        unsigned char *read_ptr = parser.get_free_space (&free_space);
+        int res = port->read_available (read_ptr, free_space, CERELOG_POLL_INTERVAL_MS);
+        if (res <= 0)
+        {
+            continue;
+        }
+        parser.commit (res);
+        if (parser.parse (&frame, 1) > 0)
+        {
+            safe_logger (spdlog::level::debug, "First valid frame after {} skipped bytes",
+                scan_stats.bytes_skipped.load ());
             return (int)BrainFlowExitCodes::STATUS_OK;
         }
-    } else {
-        safe_logger (spdlog::level::err, "No response received from ESP32");
     }
-    
     return (int)BrainFlowExitCodes::SYNC_TIMEOUT_ERROR;
 }
 
@@ -331,20 +536,6 @@ int Cerelog_X8::send_timestamp_handshake (uint8_t reg_addr, uint8_t reg_val)
 /* Function reads the serial data thread */
 void Cerelog_X8::read_thread ()
 {
-    // Constants for packet structure
-    constexpr int START_MARKER = 0xABCD;
-    constexpr int END_MARKER = 0xDCBA;
-    constexpr int PACKET_IDX_START_MARKER = 0;
-    constexpr int PACKET_IDX_LENGTH = 2;
-    constexpr int PACKET_IDX_TIMESTAMP = 3;
-    constexpr int PACKET_IDX_ADS1299_DATA = 7;
-    constexpr int ADS1299_TOTAL_DATA_BYTES = 27;
-    constexpr int PACKET_IDX_CHECKSUM = PACKET_IDX_ADS1299_DATA + ADS1299_TOTAL_DATA_BYTES;
-    constexpr int PACKET_IDX_END_MARKER = PACKET_IDX_CHECKSUM + 1;
-    constexpr int PACKET_MSG_LENGTH = 4 + ADS1299_TOTAL_DATA_BYTES; // timestamp + data
-    constexpr int PACKET_TOTAL_SIZE =
-        2 + 1 + PACKET_MSG_LENGTH + 1 + 2; // start + len + msg + checksum + end
-
     // Null/validity checks for serial
     if (serial == nullptr)
     {
@@ -354,7 +545,7 @@ void Cerelog_X8::read_thread ()
             std::lock_guard<std::mutex> lk (this->m);
             this->state = (int)BrainFlowExitCodes::BOARD_NOT_READY_ERROR;
         }
-        this->cv.notify_one();
+        this->cv.notify_one ();
         return;
     }
 
@@ -367,7 +558,7 @@ void Cerelog_X8::read_thread ()
             std::lock_guard<std::mutex> lk (this->m);
             this->state = (int)BrainFlowExitCodes::BOARD_NOT_READY_ERROR;
         }
-        this->cv.notify_one();
+        this->cv.notify_one ();
         return;
     }
     const auto &default_descr = board_descr["default"];
@@ -382,7 +573,7 @@ void Cerelog_X8::read_thread ()
             std::lock_guard<std::mutex> lk (this->m);
             this->state = (int)BrainFlowExitCodes::BOARD_NOT_READY_ERROR;
         }
-        this->cv.notify_one();
+        this->cv.notify_one ();
         return;
     }
 
@@ -399,7 +590,7 @@ void Cerelog_X8::read_thread ()
             std::lock_guard<std::mutex> lk (this->m);
             this->state = (int)BrainFlowExitCodes::BOARD_NOT_READY_ERROR;
         }
-        this->cv.notify_one();
+        this->cv.notify_one ();
         return;
     }
 
@@ -416,16 +607,21 @@ void Cerelog_X8::read_thread ()
             std::lock_guard<std::mutex> lk (this->m);
             this->state = (int)BrainFlowExitCodes::BOARD_NOT_READY_ERROR;
         }
-        this->cv.notify_one();
+        this->cv.notify_one ();
         return;
     }
 
     int timestamp_channel = 0;
     int marker_channel = 0;
+    int package_num_channel = -1; // optional
     try
     {
         timestamp_channel = default_descr["timestamp_channel"];
         marker_channel = default_descr["marker_channel"];
+        if (default_descr.find ("package_num_channel") != default_descr.end ())
+        {
+            package_num_channel = default_descr["package_num_channel"];
+        }
     }
     catch (...)
     {
@@ -436,21 +632,21 @@ void Cerelog_X8::read_thread ()
             std::lock_guard<std::mutex> lk (this->m);
             this->state = (int)BrainFlowExitCodes::BOARD_NOT_READY_ERROR;
         }
-        this->cv.notify_one();
+        this->cv.notify_one ();
         return;
     }
 
     // Validate channel indices
     if (timestamp_channel < 0 || timestamp_channel >= num_rows || marker_channel < 0 ||
-        marker_channel >= num_rows)
+        marker_channel >= num_rows || package_num_channel >= num_rows)
     {
-        safe_logger (spdlog::level::err, "Invalid timestamp or marker channel index");
+        safe_logger (spdlog::level::err, "Invalid timestamp, marker or package num channel index");
         // Notify condition variable to prevent deadlock
         {
             std::lock_guard<std::mutex> lk (this->m);
             this->state = (int)BrainFlowExitCodes::BOARD_NOT_READY_ERROR;
         }
-        this->cv.notify_one();
+        this->cv.notify_one ();
         return;
     }
     // If we don't have enough EEG channels of data coming in
@@ -463,7 +659,7 @@ void Cerelog_X8::read_thread ()
             std::lock_guard<std::mutex> lk (this->m);
             this->state = (int)BrainFlowExitCodes::BOARD_NOT_READY_ERROR;
         }
-        this->cv.notify_one();
+        this->cv.notify_one ();
         return;
     }
 
@@ -477,317 +673,131 @@ void Cerelog_X8::read_thread ()
                 std::lock_guard<std::mutex> lk (this->m);
                 this->state = (int)BrainFlowExitCodes::BOARD_NOT_READY_ERROR;
             }
-            this->cv.notify_one();
+            this->cv.notify_one ();
             return;
         }
     }
 
-    // Use RAII for packet buffer and package buffer
-    std::vector<unsigned char> packet (PACKET_TOTAL_SIZE, 0);
-    std::vector<double> package (num_rows, 0.0);
-
-    // New implementation: read 37*2 bytes at a time, search for start marker, sync timestamp,
-    // parse, push
-    constexpr int READ_CHUNK_SIZE = PACKET_TOTAL_SIZE * 2; // 37*2 = 74 bytes
-    std::vector<unsigned char> read_buffer (READ_CHUNK_SIZE, 0);
-    int buffer_pos = 0;
-    int buffer_len = 0;
+    // each wakeup drains everything the UART has, validated frames of one wakeup are decoded and
+    // pushed together
+    constexpr int READ_TIMEOUT_MS = 100;
+    CerelogParser parser (&stats);
+    std::vector<const unsigned char *> frames (parser.get_max_frames ());
+    std::vector<double> packages ((size_t)frames.size () * num_rows, 0.0);
+    ADS1299Decoder decoder;
+    decoder.set_layout (eeg_channels.data (), num_rows);
+    int applied_config_version = -1;
+    // board sends only seconds, host timestamps and sample numbers are estimated from arrival times
+    std::vector<uint32_t> board_seconds (frames.size ());
+    std::vector<double> sample_nums (frames.size ());
+    std::vector<double> timestamps (frames.size ());
+    int applied_sampling_rate = 0;
+    {
+        std::lock_guard<std::mutex> lk (config_mutex);
+        applied_sampling_rate = sampling_rate;
+    }
+    CerelogClockSync clock_sync ((double)applied_sampling_rate);
 
-    // Counter for logging every 1000 samples
-    // TODO still needed?
-    size_t sample_counter = 0;
-    
     // Add timeout counter to prevent infinite waiting
     int consecutive_read_failures = 0;
-    const int MAX_CONSECUTIVE_FAILURES = 1000; // 1 second at 1ms intervals
+    const int MAX_CONSECUTIVE_FAILURES = 1000 / READ_TIMEOUT_MS; // 1 second without data
 
     while (keep_alive)
     {
-        // Shift any leftover bytes to the start of the buffer
-        if (buffer_pos < buffer_len)
+        if (config_version != applied_config_version)
         {
-            int leftover = buffer_len - buffer_pos;
-            if (leftover > 0 && leftover <= READ_CHUNK_SIZE)
+            std::lock_guard<std::mutex> lk (config_mutex);
+            applied_config_version = config_version;
+            for (int ch = 0; ch < ADS1299_NUM_CHANNELS; ch++)
             {
-                std::memmove (read_buffer.data (), read_buffer.data () + buffer_pos, leftover);
-                buffer_len = leftover;
+                decoder.set_scale (ch,
+                    ADS1299Decoder::get_scale (
+                        CERELOG_VREF, gain_tracker.get_gain_for_channel (ch)));
             }
-            else
+            if (sampling_rate != applied_sampling_rate)
             {
-                buffer_len = 0;
+                applied_sampling_rate = sampling_rate;
+                clock_sync.reset ((double)sampling_rate);
             }
         }
-        else
-        {
-            buffer_len = 0;
-        }
-        buffer_pos = 0;
-
-        // Read more bytes to fill the buffer
-        int to_read = READ_CHUNK_SIZE - buffer_len;
-        if (to_read <= 0 || (buffer_len < 0) || (buffer_len > READ_CHUNK_SIZE))
-        {
-            safe_logger (spdlog::level::err, "Buffer length invalid: {}", buffer_len);
-            std::this_thread::sleep_for (std::chrono::milliseconds (1));
-            consecutive_read_failures++;
-            continue;
-        }
 
-        // TODO Conditionals for serial library, baud rate, sample frequency, etc.?
-        int res = serial->read_from_serial_port (read_buffer.data () + buffer_len, to_read);
+        int free_space = 0;
+        unsigned char *read_ptr = parser.get_free_space (&free_space);
+        // blocks until data arrives, no sleeps and no partial reads of already received bytes
+        int res = serial->read_available (read_ptr, free_space, READ_TIMEOUT_MS);
+        double arrival_time = get_timestamp ();
         if (res > 0)
         {
-            buffer_len += res;
+            parser.commit (res);
+            add_relaxed (stats.bytes_received, (uint64_t)res);
             consecutive_read_failures = 0; // Reset failure counter on successful read
-            if (buffer_len > READ_CHUNK_SIZE)
-            {
-                safe_logger (spdlog::level::err, "Buffer overflow detected in read_thread");
-                buffer_len = READ_CHUNK_SIZE;
-            }
         }
         else
         {
-            safe_logger (spdlog::level::debug, "Failed to read from serial port");
-            std::this_thread::sleep_for (std::chrono::milliseconds (1));
+            add_relaxed (stats.read_timeouts);
             consecutive_read_failures++;
-            
+
             // If we've had too many consecutive failures, notify the condition variable
             if (consecutive_read_failures >= MAX_CONSECUTIVE_FAILURES)
             {
-                safe_logger (spdlog::level::warn, "Too many consecutive read failures, notifying timeout");
+                safe_logger (
+                    spdlog::level::warn, "Too many consecutive read failures, notifying timeout");
                 {
                     std::lock_guard<std::mutex> lk (this->m);
                     this->state = (int)BrainFlowExitCodes::SYNC_TIMEOUT_ERROR;
                 }
-                this->cv.notify_one();
+                this->cv.notify_one ();
                 return;
             }
             continue;
         }
 
-        // Scan for start marker in the buffer
-        while (buffer_pos + PACKET_TOTAL_SIZE <= buffer_len)
+        int num_frames = parser.parse (frames.data (), (int)frames.size ());
+        if (num_frames == 0)
         {
-            // Check for start marker (big endian)
-            if (read_buffer[buffer_pos] == ((START_MARKER >> 8) & 0xFF) &&
-                read_buffer[buffer_pos + 1] == (START_MARKER & 0xFF))
+            continue;
+        }
+        for (int i = 0; i < num_frames; i++)
+        {
+            // Parse timestamp (4 bytes, big endian) - Unix time in seconds
+            const unsigned char *frame = frames[i];
+            board_seconds[i] = ((uint32_t)frame[CERELOG_PACKET_IDX_TIMESTAMP] << 24) |
+                ((uint32_t)frame[CERELOG_PACKET_IDX_TIMESTAMP + 1] << 16) |
+                ((uint32_t)frame[CERELOG_PACKET_IDX_TIMESTAMP + 2] << 8) |
+                (uint32_t)frame[CERELOG_PACKET_IDX_TIMESTAMP + 3];
+            frames[i] = frame + CERELOG_PACKET_IDX_ADS1299_DATA;
+        }
+        uint64_t dropped_before = clock_sync.get_num_dropped ();
+        clock_sync.process (arrival_time, board_seconds.data (), num_frames, sample_nums.data (),
+            timestamps.data ());
+        add_relaxed (stats.dropped_packets, clock_sync.get_num_dropped () - dropped_before);
+        for (int i = 0; i < num_frames; i++)
+        {
+            double *package = packages.data () + (size_t)i * num_rows;
+            package[timestamp_channel] = timestamps[i];
+            if (package_num_channel >= 0)
             {
-                if (sample_counter % LOG_FREQUENCY == 0)
-                {
-                    safe_logger (spdlog::level::debug,
-                        "Found potential start marker at position {}", buffer_pos);
-                }
-
-                // Check checksum
-                uint8_t checksum = 0;
-                for (int i = PACKET_IDX_LENGTH; i < PACKET_IDX_CHECKSUM; i++)
-                {
-                    checksum += read_buffer[buffer_pos + i];
-                }
-                if (read_buffer[buffer_pos + PACKET_IDX_CHECKSUM] != checksum)
-                {
-                    safe_logger (spdlog::level::warn, "Checksum mismatch in buffer scan");
-                    buffer_pos += 1;
-                    continue;
-                }
-
-                // Potential packet found, check end marker
-                int end_idx = buffer_pos + PACKET_IDX_END_MARKER;
-                if (end_idx + 1 >= buffer_len)
-                {
-                    break; // Not enough data for full packet, break to read more
-                }
-                if (read_buffer[end_idx] != ((END_MARKER >> 8) & 0xFF) ||
-                    read_buffer[end_idx + 1] != (END_MARKER & 0xFF))
-                {
-                    if (sample_counter % LOG_FREQUENCY == 0)
-                    {
-                        safe_logger (spdlog::level::warn, "End marker mismatch in buffer scan");
-                    }
-                    buffer_pos += 1;
-                    continue;
-                }
-
-                // Copy packet to local buffer for parsing
-                std::memcpy (packet.data (), read_buffer.data () + buffer_pos, PACKET_TOTAL_SIZE);
-
-                // Parse timestamp (4 bytes, big endian) - now contains Unix timestamp
-                if (PACKET_IDX_TIMESTAMP + 3 >= (int)packet.size ())
-                {
-                    safe_logger (spdlog::level::err, "Packet too short for timestamp");
-                    buffer_pos += 1;
-                    continue;
-                }
-                uint32_t board_timestamp = 0;
-                board_timestamp |= (uint32_t)packet[PACKET_IDX_TIMESTAMP] << 24;
-                board_timestamp |= (uint32_t)packet[PACKET_IDX_TIMESTAMP + 1] << 16;
-                board_timestamp |= (uint32_t)packet[PACKET_IDX_TIMESTAMP + 2] << 8;
-                board_timestamp |= (uint32_t)packet[PACKET_IDX_TIMESTAMP + 3];
-
-                // Use board timestamp directly (now a Unix timestamp)
-                double synced_timestamp = (double)board_timestamp;
-
-                // Log timestamp info for debugging - fixed-point formatting
-                static int timestamp_debug_count = 0;
-                if (timestamp_debug_count < 5)
-                { // first few packets only
-                    double system_time = time (nullptr);
-                    safe_logger (spdlog::level::info,
-                        "Packet #{}: board_timestamp={:.0f}, system_time={:.0f}, diff={:.0f}s",
-                        timestamp_debug_count, synced_timestamp, system_time,
-                        system_time - synced_timestamp);
-                    timestamp_debug_count++;
-                }
-
-                // Parse ADS1299 data (27 bytes, 8 channels, 3 bytes per channel)
-                for (int ch = 0; ch < 8; ch++)
-                {
-                    // added "+3" to skip status bytes
-                    int idx =
-                        PACKET_IDX_ADS1299_DATA + 3 + ch * 3; // go to start point in the packet,
-                    if (idx + 2 >= (int)packet.size ())
-                    {
-                        safe_logger (spdlog::level::err,
-                            "Packet too short for ADS1299 data, channel {}", ch);
-                        continue;
-                    }
-
-                    // If data looks good
-                    int32_t value = ((int32_t)packet[idx] << 16) | ((int32_t)packet[idx + 1] << 8) |
-                        ((int32_t)packet[idx + 2]);
-
-                    //  Only log first few samples to avoid spam
-                    // TODO delete?
-                    static int debug_sample_count = 0;
-                    if (sample_counter % LOG_FREQUENCY == 0 && debug_sample_count < 5 && ch == 0)
-                    {
-                        // Only channel 0, first 5 samples
-                        safe_logger (spdlog::level::info,
-                            "Sample #{}, Ch0: raw bytes=[0x{:02X} 0x{:02X} 0x{:02X}], "
-                            "raw_value={}, after_sign_ext={}",
-                            debug_sample_count, packet[idx], packet[idx + 1], packet[idx + 2],
-                            value, value);
-                        debug_sample_count++;
-                    }
-
-                    // apply the mask and check JUST for that bit (sign extension baby)
-                    if (value & 0b00000000100000000000000000000000)
-                    {
-                        value = value | 0b11111111000000000000000000000000;
-                    }
-
-                    // More debug for the voltage conversion
-                    // TODO remove?
-                    if (sample_counter % LOG_FREQUENCY == 0 && debug_sample_count <= 5 && ch == 0)
-                    {
-                        int gain = 24;
-                        float vref = 4.5;
-                        double volts = (double)value * ((2.0f * vref / gain) / (1 << 24));
-                        safe_logger (
-                            spdlog::level::info, "Ch0: final_value={}, volts={}", value, volts);
-                    }
-
-                    // Convert to volts and store in correct channel
-                    int gain = 24;
-                    float vref = 4.5;
-                    // double volts = (double)value * (4.5 / (1 << 24));
-                    double volts = (double)value * ((2.0f * vref / gain) / (1 << 24));
-                    if (eeg_channels[ch] >= 0 && eeg_channels[ch] < num_rows)
-                    {
-                        package[eeg_channels[ch]] = volts;
-                    }
-                    else
-                    {
-                        safe_logger (spdlog::level::warn,
-                            "EEG channel index {} out of bounds for package", eeg_channels[ch]);
-                    }
-                }
-
-                // Add synced timestamp
-                if (timestamp_channel >= 0 && timestamp_channel < num_rows)
-                {
-                    package[timestamp_channel] = synced_timestamp;
-                }
-                else
-                {
-                    safe_logger (spdlog::level::warn,
-                        "Timestamp channel index {} out of bounds for package", timestamp_channel);
-                }
-
-                // Add marker (default to 0)
-                if (marker_channel >= 0 && marker_channel < num_rows)
-                {
-                    package[marker_channel] = 0.0;
-                }
-                else
-                {
-                    safe_logger (spdlog::level::warn,
-                        "Marker channel index {} out of bounds for package", marker_channel);
-                }
-
-                // Push the package to the buffer
-                if (!package.empty () && (int)package.size () == num_rows)
-                {
-                    push_package (package.data ());
-
-                    // Measure time in between packets
-                    // TODO Delete?
-                    static auto last_packet_time = std::chrono::steady_clock::now ();
-                    static int packet_count = 0;
-                    packet_count++;
-                    auto now = std::chrono::steady_clock::now ();
-                    auto time_diff = std::chrono::duration_cast<std::chrono::milliseconds> (
-                        now - last_packet_time);
-                    if (sample_counter % LOG_FREQUENCY == 0)
-                    {
-                        safe_logger (spdlog::level::info, "Packet #{}: {}ms since last packet",
-                            packet_count, time_diff.count ());
-                    }
-                    last_packet_time = now;
-                }
-                else
-                {
-                    safe_logger (spdlog::level::err, "Package size mismatch or empty package");
-                }
-
-                // Log every 500 samples: all channels and timestamp
-                sample_counter++;
-                if (sample_counter % LOG_FREQUENCY == 0)
-                {
-                    // Build a string with all channel values and timestamp
-                    std::string log_msg = "Sample #" + std::to_string (sample_counter) + " | ";
-                    for (int i = 0; i < num_rows; ++i)
-                    {
-                        log_msg += "ch" + std::to_string (i) + "=" + std::to_string (package[i]);
-                        if (i != num_rows - 1)
-                        {
-                            log_msg += ", ";
-                        }
-                    }
-                    safe_logger (spdlog::level::info, log_msg);
-                }
-
-                // Set state and notify if first package
-                if (this->state != (int)BrainFlowExitCodes::STATUS_OK)
-                {
-                    safe_logger (
-                        spdlog::level::info, "received first package streaming is started");
-                    {
-                        std::lock_guard<std::mutex> lk (this->m);
-                        this->state = (int)BrainFlowExitCodes::STATUS_OK;
-                    }
-                    this->cv.notify_one ();
-                    safe_logger (spdlog::level::info, "start streaming");
-                }
-
-                buffer_pos += PACKET_TOTAL_SIZE;
+                package[package_num_channel] = sample_nums[i];
             }
-            else
+        }
+        decoder.decode (frames.data (), num_frames, packages.data ());
+        push_packages (packages.data (), num_frames);
+        add_relaxed (stats.packets_received, (uint64_t)num_frames);
+
+        // Set state and notify if first package
+        if (this->state != (int)BrainFlowExitCodes::STATUS_OK)
+        {
+            safe_logger (spdlog::level::info,
+                "received first package streaming is started, board_timestamp={}, "
+                "system_time={}",
+                board_seconds[0], (long long)time (nullptr));
             {
-                // Not a start marker, move to next byte
-                buffer_pos += 1;
+                std::lock_guard<std::mutex> lk (this->m);
+                this->state = (int)BrainFlowExitCodes::STATUS_OK;
             }
+            this->cv.notify_one ();
         }
+
         // If keep_alive is false, break out
         if (!keep_alive)
         {
@@ -836,6 +846,7 @@ int Cerelog_X8::stop_stream ()
         {
             streaming_thread.join ();
         }
+        safe_logger (spdlog::level::info, "stream stopped, stats: {}", get_stats ());
         return (int)BrainFlowExitCodes::STATUS_OK;
     }
     else
@@ -861,24 +872,32 @@ int Cerelog_X8::release_session ()
             delete serial;
             serial = NULL;
         }
+        unclaim_port (session_port);
+        session_port.clear ();
     }
 
     return (int)BrainFlowExitCodes::STATUS_OK;
 }
 
-double Cerelog_X8::convert_counter_to_timestamp (uint64_t packet_counter)
+void Cerelog_X8::reset_stats ()
 {
-    if (!Cerelog_X8::sync_established)
-    {
-        first_packet_counter = packet_counter;
-        first_packet_timestamp = time (nullptr); // is this helper function activated
-        Cerelog_X8::sync_established = true;
-        Cerelog_X8::last_sync_counter = packet_counter;
-        Cerelog_X8::last_sync_timestamp = first_packet_timestamp;
-        return first_packet_timestamp;
-    }
+    stats.reset ();
+}
 
-    return 3;
+// formatted only on request, read thread only increments counters
+std::string Cerelog_X8::get_stats ()
+{
+    json j;
+    j["bytes_received"] = stats.bytes_received.load (std::memory_order_relaxed);
+    j["packets_received"] = stats.packets_received.load (std::memory_order_relaxed);
+    j["checksum_errors"] = stats.checksum_errors.load (std::memory_order_relaxed);
+    j["end_marker_errors"] = stats.end_marker_errors.load (std::memory_order_relaxed);
+    j["bytes_skipped"] = stats.bytes_skipped.load (std::memory_order_relaxed);
+    j["read_timeouts"] = stats.read_timeouts.load (std::memory_order_relaxed);
+    j["dropped_packets"] = stats.dropped_packets.load (std::memory_order_relaxed);
+    j["length_errors"] = stats.length_errors.load (std::memory_order_relaxed);
+    j["resyncs"] = stats.resyncs.load (std::memory_order_relaxed);
+    return j.dump ();
 }
 
 // Computes a simple checksum by summing all bytes in the buffer and returning the result as uint8_t
@@ -892,84 +911,308 @@ uint8_t Cerelog_X8::calculate_checksum (const uint8_t *data, size_t length)
     return checksum;
 }
 
-// Port scanning implementation
-std::string Cerelog_X8::scan_for_device_port ()
+/* Lists ports which may belong to the board, stable /dev/serial/by-id names go first on Linux */
+std::vector<std::string> Cerelog_X8::get_candidate_ports ()
 {
-    std::string os = get_port_info ().os;
-    std::vector<std::string> ports_to_try;
+    std::vector<std::string> ports;
+#ifdef _WIN32
+    // Try common Windows USB serial patterns (COM 1-20)
+    for (int i = 1; i <= 20; i++)
+    {
+        ports.push_back ("COM" + std::to_string (i));
+    }
+#elif defined(__APPLE__)
+    // tty.* are the same devices as cu.* but opening them waits for carrier detect
+    ports = list_ports (
+        "/dev/", {"cu.usbserial", "cu.usbmodem", "cu.SLAB_USBtoUART", "cu.wchusbserial"});
+#elif defined(__linux__)
+    std::vector<std::string> by_id = list_ports ("/dev/serial/by-id/", {""});
+    // by-id names contain usb serial number, if it is provided other devices are not touched
+    if (!params.serial_number.empty ())
+    {
+        std::vector<std::string> matched;
+        for (const auto &port : by_id)
+        {
+            if (port.find (params.serial_number) != std::string::npos)
+            {
+                matched.push_back (port);
+            }
+        }
+        if (!matched.empty ())
+        {
+            return matched;
+        }
+    }
+    // skip device nodes which are already listed by their by-id links
+    std::set<std::string> resolved;
+    for (const auto &port : by_id)
+    {
+        char real_path[PATH_MAX];
+        if (realpath (port.c_str (), real_path) != NULL)
+        {
+            resolved.insert (real_path);
+        }
+    }
+    ports = by_id;
+    for (const auto &port : list_ports ("/dev/", {"ttyUSB", "ttyACM"}))
+    {
+        if (resolved.find (port) == resolved.end ())
+        {
+            ports.push_back (port);
+        }
+    }
+#endif
+    return ports;
+}
 
-    if (os == "Windows")
+/* Probes all candidate ports concurrently, only ports which already stream Cerelog frames get
+ * handshake, first port which streams valid frames after it is kept open.
+ * Confirmed port stays claimed by this session, ports claimed by other sessions are skipped */
+int Cerelog_X8::scan_for_device_port (Serial **result, std::string &port_path)
+{
+    *result = NULL;
+    // reconnect to a known board doesnt need to touch other devices, without serial_number any
+    // cached board which is not used by other session is fine
+    std::vector<std::pair<std::string, std::string>> cached;
     {
-        // Try common Windows USB serial patterns (COM 1-20)
-        for (int i = 1; i <= 20; i++)
+        std::lock_guard<std::mutex> lk (cached_ports_mutex);
+        for (const auto &it : cached_ports)
         {
-            ports_to_try.push_back ("COM" + std::to_string (i));
+            if ((params.serial_number.empty ()) || (it.first == params.serial_number))
+            {
+                cached.push_back (it);
+            }
         }
     }
-    else if (os == "Darwin")
+    for (const auto &it : cached)
     {
-        // Try common macOS USB serial patterns
-        ports_to_try = {"/dev/cu.usbserial-110", "/dev/cu.usbserial-111", "/dev/cu.usbserial-112",
-            "/dev/cu.usbserial-10", "/dev/cu.usbserial-11", "/dev/cu.usbserial-12",
-            "/dev/cu.usbserial-210", "/dev/cu.usbserial-211", "/dev/cu.usbserial-212",
-            "/dev/tty.usbserial-110", "/dev/tty.usbserial-111", "/dev/tty.usbserial-112",
-            "/dev/tty.usbserial-210", "/dev/tty.usbserial-211", "/dev/tty.usbserial-212"};
+        // device nodes are renumbered after replug, cached port may belong to other device now
+        if ((get_usb_serial_number (it.second) != it.first) || (!claim_port (it.second)))
+        {
+            continue;
+        }
+        int res = connect_port (it.second, result);
+        if (res == (int)BrainFlowExitCodes::STATUS_OK)
+        {
+            port_path = it.second;
+            return res;
+        }
+        safe_logger (spdlog::level::info, "Cached port {} is not available, scanning", it.second);
+        delete *result;
+        *result = NULL;
+        unclaim_port (it.second);
+        std::lock_guard<std::mutex> lk (cached_ports_mutex);
+        cached_ports.erase (it.first);
+    }
+
+    std::vector<std::string> ports = get_candidate_ports ();
+    safe_logger (spdlog::level::info, "Probing {} candidate ports", ports.size ());
+    std::vector<Serial *> probes (ports.size (), NULL);
+    std::vector<int> results (ports.size (), (int)BrainFlowExitCodes::UNABLE_TO_OPEN_PORT_ERROR);
+    // not vector<bool>, threads write neighbouring elements
+    std::vector<char> claimed (ports.size (), 0);
+    std::vector<std::thread> threads;
+    std::atomic<bool> found (false);
+    for (size_t i = 0; i < ports.size (); i++)
+    {
+        threads.push_back (std::thread (
+            [this, i, &ports, &probes, &results, &claimed, &found] ()
+            {
+                if (!claim_port (ports[i]))
+                {
+                    safe_logger (
+                        spdlog::level::debug, "Skipping {}, used by another session", ports[i]);
+                    return;
+                }
+                claimed[i] = 1;
+                results[i] = connect_port (ports[i], &probes[i], &found, true);
+                if (results[i] == (int)BrainFlowExitCodes::STATUS_OK)
+                {
+                    found = true;
+                }
+            }));
     }
-    else if (os == "Linux")
+    for (auto &thread : threads)
     {
-        // Try common Linux USB serial patterns
-        ports_to_try = {"/dev/ttyUSB0", "/dev/ttyUSB1", "/dev/ttyUSB2", "/dev/ttyACM0",
-            "/dev/ttyACM1", "/dev/ttyACM2"};
+        thread.join ();
     }
 
-    // Try to open each port
-    for (const auto &port : ports_to_try)
+    for (size_t i = 0; i < ports.size (); i++)
     {
-        OSSerial test_serial (port.c_str ());
-        int result = test_serial.open_serial_port ();
-        if (result >= 0)
+        if ((*result == NULL) && (results[i] == (int)BrainFlowExitCodes::STATUS_OK))
         {
-            test_serial.close_serial_port ();
-            safe_logger (spdlog::level::info, "Found available port: {}", port);
-            return port;
+            *result = probes[i];
+            port_path = ports[i];
+            continue;
+        }
+        delete probes[i];
+        if (claimed[i])
+        {
+            unclaim_port (ports[i]);
         }
     }
+    if (*result == NULL)
+    {
+        safe_logger (spdlog::level::err, "No Cerelog X8 found, provide serial_port explicitly");
+        return (int)BrainFlowExitCodes::UNABLE_TO_OPEN_PORT_ERROR;
+    }
+    cache_port (port_path);
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+void Cerelog_X8::cache_port (const std::string &port_path)
+{
+    // serial_number from input params is usually empty, usb serial number identifies the board
+    std::string usb_serial = get_usb_serial_number (port_path);
+    if (usb_serial.empty ())
+    {
+        return;
+    }
+    std::lock_guard<std::mutex> lk (cached_ports_mutex);
+    cached_ports[usb_serial] = port_path;
+}
 
-    // If no ports found, return default
-    safe_logger (spdlog::level::warn, "No available ports found, using default");
+/* Returns false if port is already used by other session or being probed */
+bool Cerelog_X8::claim_port (const std::string &port_path)
+{
+    std::string resolved = resolve_port (port_path);
+    std::lock_guard<std::mutex> lk (cached_ports_mutex);
+    return claimed_ports.insert (resolved).second;
+}
 
-    // Return OS-specific default port as fallback
-    if (os == "Windows")
+void Cerelog_X8::unclaim_port (const std::string &port_path)
+{
+    if (port_path.empty ())
     {
-        return "COM4";
+        return;
     }
-    else if (os == "Darwin")
+    std::string resolved = resolve_port (port_path);
+    std::lock_guard<std::mutex> lk (cached_ports_mutex);
+    claimed_ports.erase (resolved);
+}
+
+/* by-id links and device nodes are the same ports, claims use the device node */
+std::string Cerelog_X8::resolve_port (const std::string &port_path)
+{
+#ifndef _WIN32
+    char real_path[PATH_MAX];
+    if (realpath (port_path.c_str (), real_path) != NULL)
     {
-        return "/dev/cu.usbserial-110";
+        return std::string (real_path);
     }
-    else if (os == "Linux")
+#endif
+    return port_path;
+}
+
+/* Serial number of usb device which owns the port from sysfs, empty if it is unknown */
+std::string Cerelog_X8::get_usb_serial_number (const std::string &port_path)
+{
+    std::string serial_number;
+#ifdef __linux__
+    std::string device = resolve_port (port_path);
+    std::string sys_path = "/sys/class/tty/" + device.substr (device.rfind ('/') + 1) + "/device";
+    char real_path[PATH_MAX];
+    if (realpath (sys_path.c_str (), real_path) == NULL)
     {
-        return "/dev/ttyUSB0";
+        return serial_number;
     }
-    else
+    // tty belongs to usb interface, serial attribute is in the parent usb device
+    std::string dir (real_path);
+    while (!dir.empty ())
+    {
+        if (std::ifstream (dir + "/idVendor").good ())
+        {
+            std::ifstream serial_file (dir + "/serial");
+            std::getline (serial_file, serial_number);
+            break;
+        }
+        dir = dir.substr (0, dir.rfind ('/'));
+    }
+#endif
+    return serial_number;
+}
+
+#ifndef _WIN32
+/* Sorted full paths of entries in dir which start with one of prefixes */
+std::vector<std::string> Cerelog_X8::list_ports (
+    const std::string &dir, const std::vector<std::string> &prefixes)
+{
+    std::vector<std::string> ports;
+    DIR *dp = opendir (dir.c_str ());
+    if (dp == NULL)
+    {
+        return ports;
+    }
+    struct dirent *entry = NULL;
+    while ((entry = readdir (dp)) != NULL)
+    {
+        std::string name (entry->d_name);
+        if ((name == ".") || (name == ".."))
+        {
+            continue;
+        }
+        for (const auto &prefix : prefixes)
+        {
+            if (name.compare (0, prefix.size (), prefix) == 0)
+            {
+                ports.push_back (dir + name);
+                break;
+            }
+        }
+    }
+    closedir (dp);
+    std::sort (ports.begin (), ports.end ());
+    return ports;
+}
+#endif
+
+/* ADS1299 CONFIG1 data rate code, -1 if rate is not supported by the chip */
+int Cerelog_X8::get_sample_rate_code (int rate)
+{
+    switch (rate)
     {
-        return "/dev/ttyUSB0"; // Generic fallback
+        case 16000:
+            return 0x00;
+        case 8000:
+            return 0x01;
+        case 4000:
+            return 0x02;
+        case 2000:
+            return 0x03;
+        case 1000:
+            return 0x04;
+        case 500:
+            return 0x05; // default
+        case 250:
+            return 0x06;
+        default:
+            return -1;
     }
 }
 
 /* Function to convert config value to baud rate */
 int Cerelog_X8::get_baud_rate_from_config (uint8_t config_val)
 {
-    switch (config_val) {
-        case 0x00: return 9600; // default
-        case 0x01: return 19200;
-        case 0x02: return 38400; 
-        case 0x03: return 57600;
-        case 0x04: return 115200; 
-        case 0x05: return 230400; // MacOS limit
-        case 0x06: return 460800;
-        case 0x07: return 921600; // Windows limit
-        default: return -1; // Invalid config
-        // TODO: add error message and Linux / fallback limits
+    // TODO: add error message and Linux / fallback limits
+    switch (config_val)
+    {
+        case 0x00:
+            return 9600; // default
+        case 0x01:
+            return 19200;
+        case 0x02:
+            return 38400;
+        case 0x03:
+            return 57600;
+        case 0x04:
+            return 115200;
+        case 0x05:
+            return 230400; // MacOS limit
+        case 0x06:
+            return 460800;
+        case 0x07:
+            return 921600; // Windows limit
+        default:
+            return -1; // Invalid config
     }
 }
@@ -0,0 +1,217 @@
+#include <stddef.h>
+
+#include "cerelog_clock_sync.h"
+
+// weight of a new point once fit is warmed up, with a read every few ms it averages ~10 seconds
+#define CLOCK_SYNC_MIN_WEIGHT 0.0005
+#define CLOCK_SYNC_MIN_POINTS 16
+// board and host clocks can disagree a bit, but a fit far from nominal rate means bursty reads
+#define CLOCK_SYNC_MAX_RATE_ERROR 0.02
+// board second boundary and sample clock are not aligned, so count per second may be off by one
+#define CLOCK_SYNC_FRAMES_TOLERANCE 1
+// bigger jumps of board clock are resets, not gaps in data
+#define CLOCK_SYNC_MAX_GAP_SECONDS 60
+// reads which came this late are stalls or backlog, they dont go to the fit
+#define CLOCK_SYNC_OUTLIER_SECONDS 0.1
+// envelope may rise by this share of elapsed time, so it follows if minimal latency grows
+#define CLOCK_SYNC_ENVELOPE_RISE 0.00001
+// one board second normally has a few hundred reads, more points mean that board counter is stuck
+#define CLOCK_SYNC_MAX_PENDING 4096
+
+
+CerelogClockSync::CerelogClockSync (double sampling_rate)
+{
+    reset (sampling_rate);
+}
+
+void CerelogClockSync::reset (double sampling_rate)
+{
+    this->sampling_rate = sampling_rate;
+    next_sample = 0;
+    num_dropped = 0;
+    started = false;
+    aligned = false;
+    last_seconds = 0;
+    frames_in_second = 0;
+    reset_fit ();
+    has_ref = false;
+    ref_x = 0.0;
+    ref_time = 0.0;
+    last_timestamp = 0.0;
+}
+
+void CerelogClockSync::reset_fit ()
+{
+    num_points = 0;
+    mean_x = 0.0;
+    mean_y = 0.0;
+    var_x = 0.0;
+    cov_xy = 0.0;
+    pending_x.clear ();
+    pending_y.clear ();
+}
+
+void CerelogClockSync::flush_pending (bool keep)
+{
+    if (keep)
+    {
+        for (size_t i = 0; i < pending_x.size (); i++)
+        {
+            update_fit (pending_x[i], pending_y[i]);
+        }
+    }
+    pending_x.clear ();
+    pending_y.clear ();
+}
+
+void CerelogClockSync::check_dropped (uint32_t board_seconds)
+{
+    if (!started)
+    {
+        started = true;
+        last_seconds = board_seconds;
+        frames_in_second = 0;
+        return;
+    }
+    if (board_seconds == last_seconds)
+    {
+        return;
+    }
+    if ((board_seconds < last_seconds) ||
+        (board_seconds - last_seconds > CLOCK_SYNC_MAX_GAP_SECONDS))
+    {
+        aligned = false;
+        flush_pending (false);
+    }
+    else if (aligned)
+    {
+        int expected = (int)(sampling_rate * (board_seconds - last_seconds) + 0.5);
+        bool lost = (frames_in_second + CLOCK_SYNC_FRAMES_TOLERANCE < expected);
+        if (lost)
+        {
+            uint64_t missing = (uint64_t)(expected - frames_in_second);
+            num_dropped += missing;
+            next_sample += missing;
+        }
+        // sample numbers after the loss were too small, these points would bend the fit
+        flush_pending (!lost);
+    }
+    else
+    {
+        aligned = true;
+    }
+    last_seconds = board_seconds;
+    frames_in_second = 0;
+}
+
+// exponentially weighted means and covariances, centered form keeps precision for long sessions
+void CerelogClockSync::update_fit (double x, double y)
+{
+    num_points++;
+    double weight = 1.0 / (double)num_points;
+    if (weight < CLOCK_SYNC_MIN_WEIGHT)
+    {
+        weight = CLOCK_SYNC_MIN_WEIGHT;
+    }
+    double dx = x - mean_x;
+    double dy = y - mean_y;
+    mean_x += weight * dx;
+    mean_y += weight * dy;
+    var_x = (1.0 - weight) * (var_x + weight * dx * dx);
+    cov_xy = (1.0 - weight) * (cov_xy + weight * dx * dy);
+}
+
+double CerelogClockSync::get_slope ()
+{
+    double nominal = 1.0 / sampling_rate;
+    if ((num_points < CLOCK_SYNC_MIN_POINTS) || (var_x <= 0.0))
+    {
+        return nominal;
+    }
+    double slope = cov_xy / var_x;
+    if (slope < nominal * (1.0 - CLOCK_SYNC_MAX_RATE_ERROR))
+    {
+        return nominal * (1.0 - CLOCK_SYNC_MAX_RATE_ERROR);
+    }
+    if (slope > nominal * (1.0 + CLOCK_SYNC_MAX_RATE_ERROR))
+    {
+        return nominal * (1.0 + CLOCK_SYNC_MAX_RATE_ERROR);
+    }
+    return slope;
+}
+
+void CerelogClockSync::update_envelope (double x, double y, double slope)
+{
+    if (!has_ref)
+    {
+        has_ref = true;
+        ref_x = x;
+        ref_time = y;
+        return;
+    }
+    double predicted = ref_time + slope * (x - ref_x);
+    double residual = y - predicted;
+    if (residual < -CLOCK_SYNC_OUTLIER_SECONDS)
+    {
+        // data came much earlier than the line allows, previous points were backlog
+        reset_fit ();
+        predicted = y;
+    }
+    else if (residual < 0.0)
+    {
+        predicted = y;
+    }
+    else
+    {
+        double max_rise = CLOCK_SYNC_ENVELOPE_RISE * (x - ref_x) / sampling_rate;
+        predicted += (residual < max_rise) ? residual : max_rise;
+    }
+    ref_x = x;
+    ref_time = predicted;
+    if (residual < CLOCK_SYNC_OUTLIER_SECONDS)
+    {
+        if (aligned)
+        {
+            // points past the cap can not be checked for loss until counter moves, drop them
+            if (pending_x.size () < CLOCK_SYNC_MAX_PENDING)
+            {
+                pending_x.push_back (x);
+                pending_y.push_back (y);
+            }
+        }
+        else
+        {
+            // nothing to check against yet
+            update_fit (x, y);
+        }
+    }
+}
+
+void CerelogClockSync::process (double arrival_time, const uint32_t *board_seconds, int num_frames,
+    double *sample_nums, double *timestamps)
+{
+    if (num_frames <= 0)
+    {
+        return;
+    }
+    for (int i = 0; i < num_frames; i++)
+    {
+        check_dropped (board_seconds[i]);
+        frames_in_second++;
+        sample_nums[i] = (double)next_sample++;
+    }
+    // last frame of the read is the one which just arrived, earlier frames waited in the buffer
+    double slope = get_slope ();
+    update_envelope (sample_nums[num_frames - 1], arrival_time, slope);
+    for (int i = 0; i < num_frames; i++)
+    {
+        double timestamp = ref_time + slope * (sample_nums[i] - ref_x);
+        // envelope may move back a bit, timestamps must never go back
+        if (timestamp <= last_timestamp)
+        {
+            timestamp = last_timestamp + 1e-6;
+        }
+        timestamps[i] = timestamp;
+        last_timestamp = timestamp;
+    }
+}
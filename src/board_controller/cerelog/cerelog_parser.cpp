@@ -0,0 +1,152 @@
+#include <string.h>
+
+#include "cerelog_parser.h"
+
+
+void CerelogStats::reset ()
+{
+    bytes_received = 0;
+    packets_received = 0;
+    checksum_errors = 0;
+    end_marker_errors = 0;
+    bytes_skipped = 0;
+    read_timeouts = 0;
+    dropped_packets = 0;
+    length_errors = 0;
+    resyncs = 0;
+}
+
+CerelogParser::CerelogParser (CerelogStats *stats, int buffer_size, int min_read_size)
+    : buffer (buffer_size, 0)
+{
+    this->stats = stats;
+    this->min_read_size = min_read_size;
+    reset ();
+}
+
+void CerelogParser::reset ()
+{
+    pos = 0;
+    len = 0;
+    synced = false;
+    sum_start = 0;
+    sum_end = 0;
+    sum = 0;
+}
+
+unsigned char *CerelogParser::get_free_space (int *size)
+{
+    int buffer_size = (int)buffer.size ();
+    if (pos == len)
+    {
+        pos = 0;
+        len = 0;
+    }
+    else if (buffer_size - len < min_read_size)
+    {
+        int leftover = len - pos;
+        memmove (buffer.data (), buffer.data () + pos, leftover);
+        pos = 0;
+        len = leftover;
+    }
+    sum_start = 0;
+    sum_end = 0;
+    *size = buffer_size - len;
+    return buffer.data () + len;
+}
+
+void CerelogParser::commit (int num_bytes)
+{
+    len += num_bytes;
+}
+
+int CerelogParser::parse (const unsigned char **frames, int max_frames)
+{
+    const unsigned char start_0 = (CERELOG_START_MARKER >> 8) & 0xFF;
+    const unsigned char start_1 = CERELOG_START_MARKER & 0xFF;
+    const unsigned char *data = buffer.data ();
+    int num_frames = 0;
+    // nothing here should log or allocate per packet
+    while ((pos < len) && (num_frames < max_frames))
+    {
+        const unsigned char *frame = data + pos;
+        if (frame[0] != start_0)
+        {
+            const void *candidate = memchr (frame, start_0, len - pos);
+            skip ((candidate == NULL) ? (len - pos) :
+                                        (int)((const unsigned char *)candidate - frame));
+            continue;
+        }
+        if (len - pos <= CERELOG_PACKET_IDX_LENGTH)
+        {
+            break;
+        }
+        if (frame[1] != start_1)
+        {
+            skip (1);
+            continue;
+        }
+        if (frame[CERELOG_PACKET_IDX_LENGTH] != CERELOG_PACKET_MSG_LENGTH)
+        {
+            add_relaxed (stats->length_errors);
+            skip (1);
+            continue;
+        }
+        if (len - pos < CERELOG_PACKET_TOTAL_SIZE)
+        {
+            break;
+        }
+        if ((frame[CERELOG_PACKET_IDX_END_MARKER] != ((CERELOG_END_MARKER >> 8) & 0xFF)) ||
+            (frame[CERELOG_PACKET_IDX_END_MARKER + 1] != (CERELOG_END_MARKER & 0xFF)))
+        {
+            add_relaxed (stats->end_marker_errors);
+            skip (1);
+            continue;
+        }
+        if (frame[CERELOG_PACKET_IDX_CHECKSUM] != checksum_at (pos))
+        {
+            add_relaxed (stats->checksum_errors);
+            skip (1);
+            continue;
+        }
+        frames[num_frames++] = frame;
+        pos += CERELOG_PACKET_TOTAL_SIZE;
+        synced = true;
+    }
+    return num_frames;
+}
+
+void CerelogParser::skip (int num_bytes)
+{
+    if (synced)
+    {
+        add_relaxed (stats->resyncs);
+        synced = false;
+    }
+    add_relaxed (stats->bytes_skipped, num_bytes);
+    pos += num_bytes;
+}
+
+uint8_t CerelogParser::checksum_at (int offset)
+{
+    const unsigned char *data = buffer.data ();
+    int start = offset + CERELOG_PACKET_IDX_LENGTH;
+    int end = offset + CERELOG_PACKET_IDX_CHECKSUM;
+    // candidates only move forward, so after a failed candidate the next window overlaps with the
+    // cached one and only bytes which entered or left the window are summed
+    if ((start < sum_start) || (start >= sum_end))
+    {
+        sum_start = start;
+        sum_end = start;
+        sum = 0;
+    }
+    for (; sum_start < start; sum_start++)
+    {
+        sum -= data[sum_start];
+    }
+    for (; sum_end < end; sum_end++)
+    {
+        sum += data[sum_end];
+    }
+    return sum;
+}
@@ -0,0 +1,33 @@
+#pragma once
+
+#include <stdint.h>
+
+#define ADS1299_NUM_CHANNELS 8
+#define ADS1299_STATUS_BYTES 3
+#define ADS1299_BYTES_PER_CHANNEL 3
+
+// Converts raw ADS1299 samples to volts. Scale table is computed once per configuration, decode
+// loop does only byte assembly, branchless sign extension and one multiply per value.
+class ADS1299Decoder
+{
+    double scales[ADS1299_NUM_CHANNELS];
+    int channel_rows[ADS1299_NUM_CHANNELS];
+    int num_rows;
+
+public:
+    ADS1299Decoder ();
+
+    // volts per LSB for given gain and reference voltage
+    static double get_scale (double vref, int gain);
+    void set_scale (int channel, double scale);
+    double get_scale (int channel)
+    {
+        return scales[channel];
+    }
+    // output package layout: value of channel ch goes to package[rows[ch]]
+    void set_layout (const int *rows, int num_rows);
+
+    // frames[i] points to the first status byte of i-th validated frame, volts for frame i are
+    // written to packages + i * num_rows, other rows of packages are not touched
+    void decode (const unsigned char *const *frames, int num_frames, double *packages) const;
+};
@@ -1,12 +1,25 @@
 #pragma once
 
+#include <atomic>
+#include <map>
+#include <mutex>
+#include <set>
+#include <string>
 #include <thread>
 #include <vector>
 
 #include "board.h"
 #include "board_controller.h"
+#include "cerelog_gain_tracker.h"
+#include "cerelog_parser.h"
 #include "serial.h"
 
+// short poll keeps connection fast, total waits are bounded by params.timeout
+#define CERELOG_POLL_INTERVAL_MS 50
+// board which was not reset keeps streaming at target baud rate, frames arrive immediately
+#define CERELOG_PROBE_TIMEOUT_MS 500
+#define CERELOG_VREF 4.5
+
 class Cerelog_X8 : public Board
 {
 private:
@@ -16,21 +29,48 @@ private:
     std::thread streaming_thread;
     Serial *serial;
     int state;
-    std::mutex m;                      // This is for thread processing later on
-    std::condition_variable cv;        // I don't really know what this is doing
-    uint64_t first_packet_counter = 0; // data storers
-    double first_packet_timestamp = 0.0;
-    uint64_t last_sync_counter = 0;
-    double last_sync_timestamp = 0.0;
-    int sync_count = 0;
-    bool sync_established = false;
+    std::mutex m;               // This is for thread processing later on
+    std::condition_variable cv; // I don't really know what this is doing
+    CerelogStats stats;
+    // gains and sampling rate are changed by config_board, read thread applies them when
+    // config_version changes
+    std::mutex config_mutex;
+    CerelogGainTracker gain_tracker;
     int sampling_rate = 500;
-    int send_timestamp_handshake (uint8_t reg_addr = 0x00, uint8_t reg_val = 0x00);
+    std::atomic<int> config_version;
+    // last confirmed port per usb serial number of the device, shared by all sessions
+    static std::map<std::string, std::string> cached_ports;
+    // resolved paths of ports opened by live sessions or being probed, they are never probed
+    // again because other session already reads from them
+    static std::set<std::string> claimed_ports;
+    // guards cached_ports and claimed_ports
+    static std::mutex cached_ports_mutex;
+    std::string session_port;
+
+    int connect_port (const std::string &port_path, Serial **result,
+        const std::atomic<bool> *cancelled = NULL, bool require_frames = false);
+    int send_timestamp_handshake (Serial *port, uint8_t reg_addr = 0x00, uint8_t reg_val = 0x00,
+        const std::atomic<bool> *cancelled = NULL);
+    int wait_for_first_frame (
+        Serial *port, int timeout_ms, const std::atomic<bool> *cancelled = NULL);
+    int send_register_packet (Serial *port, uint8_t reg_addr, uint8_t reg_val);
     int get_baud_rate_from_config (uint8_t config_val);
+    int get_sample_rate_code (int rate);
 
     void read_thread ();
-    double convert_counter_to_timestamp (uint64_t packet_counter);
-    std::string scan_for_device_port ();
+    std::vector<std::string> get_candidate_ports ();
+    int scan_for_device_port (Serial **result, std::string &port_path);
+    void cache_port (const std::string &port_path);
+    bool claim_port (const std::string &port_path);
+    void unclaim_port (const std::string &port_path);
+    std::string resolve_port (const std::string &port_path);
+    std::string get_usb_serial_number (const std::string &port_path);
+#ifndef _WIN32
+    std::vector<std::string> list_ports (
+        const std::string &dir, const std::vector<std::string> &prefixes);
+#endif
+    void reset_stats ();
+    std::string get_stats ();
 
 public:
     Cerelog_X8 (int board_id, struct BrainFlowInputParams params);
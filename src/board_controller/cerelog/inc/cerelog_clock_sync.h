@@ -0,0 +1,64 @@
+#pragma once
+
+#include <stddef.h>
+#include <stdint.h>
+#include <vector>
+
+// Estimates host time of each sample. Board sends only a seconds counter, so sample index is
+// counted on host and checked against that counter: if fewer frames than sampling_rate arrive
+// within one board second, missing frames are treated as dropped and skipped in sample index. Each
+// read gives a point (index of its last frame, host time when it returned). Slope of host time vs
+// sample index is fitted by exponentially weighted least squares over these points, offset follows
+// their lower envelope: a sample can not arrive before it was taken, so the earliest arrivals are
+// the closest to real sampling time. Output is monotonic and has sub millisecond resolution
+// regardless of one second resolution of the board clock and of read jitter.
+class CerelogClockSync
+{
+    double sampling_rate;
+    uint64_t next_sample;
+    uint64_t num_dropped;
+    // board seconds tracking
+    bool started;
+    bool aligned; // first second is partial, it is not checked for dropped frames
+    uint32_t last_seconds;
+    int frames_in_second;
+    // slope fit, x is sample index, y is host time
+    uint64_t num_points;
+    double mean_x;
+    double mean_y;
+    double var_x;
+    double cov_xy;
+    // loss is found only when a board second ends, so points are added to the fit after that
+    std::vector<double> pending_x;
+    std::vector<double> pending_y;
+    // envelope line passes through (ref_x, ref_time)
+    bool has_ref;
+    double ref_x;
+    double ref_time;
+    double last_timestamp;
+
+    void check_dropped (uint32_t board_seconds);
+    void flush_pending (bool keep);
+    void update_fit (double x, double y);
+    void reset_fit ();
+    double get_slope ();
+    void update_envelope (double x, double y, double slope);
+
+public:
+    CerelogClockSync (double sampling_rate);
+
+    void reset (double sampling_rate);
+    // arrival_time is host time when the read with these frames returned, writes sample index and
+    // host timestamp of each frame
+    void process (double arrival_time, const uint32_t *board_seconds, int num_frames,
+        double *sample_nums, double *timestamps);
+    uint64_t get_num_dropped ()
+    {
+        return num_dropped;
+    }
+    // points waiting for the end of board second, bounded even if board counter stops
+    size_t get_num_pending ()
+    {
+        return pending_x.size ();
+    }
+};
@@ -0,0 +1,171 @@
+#pragma once
+
+#include <algorithm>
+#include <functional>
+#include <stdlib.h>
+#include <string>
+#include <vector>
+
+#include "ads1299_decoder.h"
+#include "brainflow_constants.h"
+
+// register addresses of handshake packet. Firmware 1.0 applies only CERELOG_REG_BAUD_RATE, other
+// registers are reserved until firmware writes them to ADS1299
+#define CERELOG_REG_BAUD_RATE 0x01
+// value is ADS1299 CONFIG1 data rate code
+#define CERELOG_REG_SAMPLE_RATE 0x02
+// channel ch (0 based) uses CERELOG_REG_CH1_GAIN + ch, value is ADS1299 CHnSET gain code
+#define CERELOG_REG_CH1_GAIN 0x05
+
+
+enum class CerelogCommandTypes : int
+{
+    NOT_GAIN_COMMAND = 0,
+    VALID_COMMAND = 1,
+    INVALID_COMMAND = 2
+};
+
+
+class CerelogGainTracker
+{
+protected:
+    std::vector<int> current_gains;
+    std::vector<int> old_gains;
+    // index is ADS1299 CHnSET gain code
+    std::vector<int> available_gain_values;
+
+    static bool parse_int (const std::string &str, int *value)
+    {
+        if (str.empty ())
+        {
+            return false;
+        }
+        char *end = NULL;
+        long res = strtol (str.c_str (), &end, 10);
+        if ((*end != '\0') || (res < 0) || (res > 1000000))
+        {
+            return false;
+        }
+        *value = (int)res;
+        return true;
+    }
+
+public:
+    CerelogGainTracker ()
+        : current_gains (ADS1299_NUM_CHANNELS, 24), old_gains (ADS1299_NUM_CHANNELS, 24)
+    {
+        available_gain_values = std::vector<int> {1, 2, 4, 6, 8, 12, 24};
+    }
+
+    virtual ~CerelogGainTracker ()
+    {
+    }
+
+    // "gain=<value>" sets all channels, "gain<N>=<value>" sets channel N (1-8)
+    virtual int apply_config (const std::string &config)
+    {
+        if (config.compare (0, 4, "gain") != 0)
+        {
+            return (int)CerelogCommandTypes::NOT_GAIN_COMMAND;
+        }
+        size_t separator = config.find ('=');
+        if (separator == std::string::npos)
+        {
+            return (int)CerelogCommandTypes::INVALID_COMMAND;
+        }
+        int first_channel = 0;
+        int last_channel = ADS1299_NUM_CHANNELS;
+        if (separator > 4)
+        {
+            int channel = 0;
+            if ((!parse_int (config.substr (4, separator - 4), &channel)) || (channel < 1) ||
+                (channel > ADS1299_NUM_CHANNELS))
+            {
+                return (int)CerelogCommandTypes::INVALID_COMMAND;
+            }
+            first_channel = channel - 1;
+            last_channel = channel;
+        }
+        int gain = 0;
+        if ((!parse_int (config.substr (separator + 1), &gain)) ||
+            (std::find (available_gain_values.begin (), available_gain_values.end (), gain) ==
+                available_gain_values.end ()))
+        {
+            return (int)CerelogCommandTypes::INVALID_COMMAND;
+        }
+        std::copy (current_gains.begin (), current_gains.end (), old_gains.begin ());
+        std::fill (
+            current_gains.begin () + first_channel, current_gains.begin () + last_channel, gain);
+        return (int)CerelogCommandTypes::VALID_COMMAND;
+    }
+
+    virtual int get_gain_for_channel (int channel)
+    {
+        if (channel >= (int)current_gains.size ())
+        {
+            return 1; // should never happen
+        }
+        return current_gains[channel];
+    }
+
+    int get_gain_code_for_channel (int channel)
+    {
+        return get_gain_code (get_gain_for_channel (channel));
+    }
+
+    int get_gain_code (int gain)
+    {
+        return (int)std::distance (available_gain_values.begin (),
+            std::find (available_gain_values.begin (), available_gain_values.end (), gain));
+    }
+
+    // true if last applied command changed gain of this channel
+    bool is_changed (int channel)
+    {
+        return current_gains[channel] != old_gains[channel];
+    }
+
+    virtual void revert_config ()
+    {
+        std::copy (old_gains.begin (), old_gains.end (), current_gains.begin ());
+    }
+
+    virtual void revert_channel (int channel)
+    {
+        current_gains[channel] = old_gains[channel];
+    }
+
+    // sends gain codes of channels changed by the last command with write_gain (channel, code).
+    // If a write fails, channels which already got new gain are written back with old codes, so
+    // tracked gains always match the chip: a channel keeps new gain only if its rollback failed
+    int write_changed_gains (std::function<int (int, int)> write_gain)
+    {
+        for (int ch = 0; ch < (int)current_gains.size (); ch++)
+        {
+            if (!is_changed (ch))
+            {
+                continue;
+            }
+            int res = write_gain (ch, get_gain_code_for_channel (ch));
+            if (res == (int)BrainFlowExitCodes::STATUS_OK)
+            {
+                continue;
+            }
+            for (int i = ch; i < (int)current_gains.size (); i++)
+            {
+                revert_channel (i);
+            }
+            for (int prev = 0; prev < ch; prev++)
+            {
+                if ((is_changed (prev)) &&
+                    (write_gain (prev, get_gain_code (old_gains[prev])) ==
+                        (int)BrainFlowExitCodes::STATUS_OK))
+                {
+                    revert_channel (prev);
+                }
+            }
+            return res;
+        }
+        return (int)BrainFlowExitCodes::STATUS_OK;
+    }
+};
@@ -0,0 +1,79 @@
+#pragma once
+
+#include <atomic>
+#include <stdint.h>
+#include <vector>
+
+// packet layout: start marker, length, timestamp, ADS1299 status and data, checksum, end marker
+#define CERELOG_START_MARKER 0xABCD
+#define CERELOG_END_MARKER 0xDCBA
+#define CERELOG_PACKET_IDX_LENGTH 2
+#define CERELOG_PACKET_IDX_TIMESTAMP 3
+#define CERELOG_PACKET_IDX_ADS1299_DATA 7
+#define CERELOG_ADS1299_TOTAL_DATA_BYTES 27
+// value of length byte, timestamp and ADS1299 data
+#define CERELOG_PACKET_MSG_LENGTH (4 + CERELOG_ADS1299_TOTAL_DATA_BYTES)
+#define CERELOG_PACKET_IDX_CHECKSUM                                                                \
+    (CERELOG_PACKET_IDX_ADS1299_DATA + CERELOG_ADS1299_TOTAL_DATA_BYTES)
+#define CERELOG_PACKET_IDX_END_MARKER (CERELOG_PACKET_IDX_CHECKSUM + 1)
+#define CERELOG_PACKET_TOTAL_SIZE (CERELOG_PACKET_IDX_END_MARKER + 2)
+
+// read thread counters, per instance so several boards in one process dont interfere
+struct CerelogStats
+{
+    std::atomic<uint64_t> bytes_received;
+    std::atomic<uint64_t> packets_received;
+    std::atomic<uint64_t> checksum_errors;
+    std::atomic<uint64_t> end_marker_errors;
+    std::atomic<uint64_t> bytes_skipped;
+    std::atomic<uint64_t> read_timeouts;
+    std::atomic<uint64_t> dropped_packets;
+    std::atomic<uint64_t> length_errors;
+    // number of times stream lost sync after a valid frame
+    std::atomic<uint64_t> resyncs;
+
+    void reset ();
+};
+
+// counters have only one writer (read thread), so plain load and store are enough
+inline void add_relaxed (std::atomic<uint64_t> &counter, uint64_t value = 1)
+{
+    counter.store (counter.load (std::memory_order_relaxed) + value, std::memory_order_relaxed);
+}
+
+// Splits received byte stream into validated frames. It doesnt do any io, so the read thread and
+// benchmarks drive exactly the same code: get free space, copy received bytes there, commit, parse.
+// Candidates are checked from cheap to expensive: start marker (found with memchr), length byte,
+// end marker and only then checksum.
+class CerelogParser
+{
+    std::vector<unsigned char> buffer;
+    int min_read_size;
+    // bytes between pos and len are received but not parsed yet
+    int pos;
+    int len;
+    bool synced;
+    // sum of bytes in [sum_start, sum_end), reused by overlapping checksum windows
+    int sum_start;
+    int sum_end;
+    uint8_t sum;
+    CerelogStats *stats;
+
+    void skip (int num_bytes);
+    uint8_t checksum_at (int offset);
+
+public:
+    CerelogParser (CerelogStats *stats, int buffer_size = 16384, int min_read_size = 1024);
+
+    // leftover (less than one packet) is moved to the start only if there is no room for a bulk
+    // read, frames returned by previous parse call are invalid after it
+    unsigned char *get_free_space (int *size);
+    void commit (int num_bytes);
+    // stores pointers to frame starts, returns number of frames
+    int parse (const unsigned char **frames, int max_frames);
+    int get_max_frames ()
+    {
+        return (int)buffer.size () / CERELOG_PACKET_TOTAL_SIZE + 1;
+    }
+    void reset ();
+};
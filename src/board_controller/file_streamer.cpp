@@ -1,25 +1,24 @@
+#include <stdio.h>
 #include <string.h>
 #include <typeinfo>
 
 #include "brainflow_constants.h"
 #include "file_streamer.h"
 
+// enough for "%lf" of any double and separator
+#define FILE_STREAMER_MAX_VALUE_LEN 330
+
 
 FileStreamer::FileStreamer (const char *file, const char *file_mode, int data_len)
-    : Streamer (data_len, "file", file, file_mode)
+    : AsyncFileStreamer (data_len, "file", file, file_mode)
 {
     strncpy (this->file, file, BRAINFLOW_FILE_NAME_LIMIT);
     strncpy (this->file_mode, file_mode, BRAINFLOW_FILE_NAME_LIMIT);
-    fp = NULL;
 }
 
 FileStreamer::~FileStreamer ()
 {
-    if (fp != NULL)
-    {
-        fclose (fp);
-        fp = NULL;
-    }
+    stop_writer ();
 }
 
 int FileStreamer::init_streamer ()
@@ -29,19 +28,33 @@ int FileStreamer::init_streamer ()
     {
         return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
     }
-    fp = fopen (file, file_mode);
-    if (fp == NULL)
-    {
-        return (int)BrainFlowExitCodes::GENERAL_ERROR;
-    }
-    return (int)BrainFlowExitCodes::STATUS_OK;
+    return start_writer (file, file_mode);
 }
 
-void FileStreamer::stream_data (double *data)
+bool FileStreamer::write_samples (const double *samples, int num_samples)
 {
-    for (int i = 0; i < len - 1; i++)
+    // values are formatted in memory and written in large chunks
+    text.resize (65536);
+    char *out = text.data ();
+    char *end = text.data () + text.size ();
+    for (int i = 0; i < num_samples; i++)
     {
-        fprintf (fp, "%lf\t", data[i]);
+        const double *sample = samples + (size_t)i * len;
+        for (int j = 0; j < len; j++)
+        {
+            if (end - out < FILE_STREAMER_MAX_VALUE_LEN)
+            {
+                size_t size = (size_t)(out - text.data ());
+                if (fwrite (text.data (), 1, size, fp) != size)
+                {
+                    return false;
+                }
+                out = text.data ();
+            }
+            out += snprintf (
+                out, FILE_STREAMER_MAX_VALUE_LEN, (j == len - 1) ? "%lf\n" : "%lf\t", sample[j]);
+        }
     }
-    fprintf (fp, "%lf\n", data[len - 1]);
+    size_t size = (size_t)(out - text.data ());
+    return fwrite (text.data (), 1, size, fp) == size;
 }
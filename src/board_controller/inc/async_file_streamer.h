@@ -0,0 +1,67 @@
+#pragma once
+
+#include <atomic>
+#include <condition_variable>
+#include <mutex>
+#include <stdio.h>
+#include <string>
+#include <thread>
+#include <vector>
+
+#include "data_buffer.h"
+#include "streamer.h"
+
+
+// Base class for file streamers. stream_data only copies sample to a bounded queue, dedicated
+// thread writes queued samples in batches and flushes file, so slow disk doesnt block push_package.
+// If queue is full the oldest samples are dropped and reported by get_num_dropped. After the first
+// write error (full disk, I/O error) nothing is written anymore and all samples which didnt reach
+// the file are reported as dropped as well.
+class AsyncFileStreamer : public Streamer
+{
+
+public:
+    AsyncFileStreamer (int data_len, std::string type, std::string dest, std::string mods);
+    virtual ~AsyncFileStreamer ();
+
+    void stream_data (double *data);
+    uint64_t get_num_dropped ();
+
+protected:
+    FILE *fp;
+
+    // opens file, calls write_header and starts writer thread
+    int start_writer (const char *file, const char *mode);
+    // writes samples left in queue and closes file, derived classes must call it in destructor
+    // because write_samples is not available in base destructor
+    void stop_writer ();
+    virtual int write_header ()
+    {
+        return 0;
+    }
+    // called only from writer thread, samples are stored one after another, returns false if
+    // not everything was written
+    virtual bool write_samples (const double *samples, int num_samples) = 0;
+
+private:
+    DataBuffer *db;
+    std::vector<double> batch;
+    std::vector<char> file_buffer;
+    std::atomic<bool> is_streaming;
+    std::thread writer_thread;
+    // writer sleeps until wake_threshold samples are queued or flush is due
+    std::mutex m;
+    std::condition_variable cv;
+    size_t wake_threshold;
+    int flush_interval_ms;
+    bool sync;
+    // written by writer thread only
+    bool write_failed;
+    uint64_t unflushed_samples;
+    std::atomic<uint64_t> num_write_drops;
+
+    void thread_worker ();
+    int write_batch ();
+    void flush ();
+    void on_write_error (uint64_t num_lost);
+};
@@ -0,0 +1,65 @@
+#pragma once
+
+#include <stdint.h>
+#include <stdio.h>
+#include <string>
+#include <vector>
+
+#include "async_file_streamer.h"
+
+#include "json.hpp"
+
+using json = nlohmann::json;
+
+#define BRAINFLOW_BIN_FILE_MAGIC 0x5441444E49424642ULL // "BFBINDAT"
+#define BRAINFLOW_BIN_FILE_VERSION 1
+
+enum class BinaryFileDataTypes : int
+{
+    FLOAT64 = 0,
+    FLOAT32 = 1
+};
+
+// fixed part of file header, followed by preset description as json (channel map and sampling rate
+// as reported by board description) padded with zeros to header_size, after that samples are
+// stored one after another, each sample is num_rows values of data_type. All fields are little
+// endian, readers get number of samples from file size, so a file which is still written or was
+// not closed properly can be read as well
+struct BinaryFileHeader
+{
+    uint64_t magic;
+    uint32_t version;
+    uint32_t header_size; // including json, multiple of 8 so samples are aligned
+    int32_t board_id;
+    int32_t preset;
+    uint32_t num_rows;
+    uint32_t data_type; // BinaryFileDataTypes
+    double sampling_rate;
+    uint32_t descr_size; // json length without padding
+    uint32_t reserved;
+};
+
+// writes samples as raw values without text formatting
+class BinaryFileStreamer : public AsyncFileStreamer
+{
+
+public:
+    BinaryFileStreamer (
+        const char *file, const char *file_mode, int board_id, int preset, json preset_descr);
+    ~BinaryFileStreamer ();
+
+    int init_streamer ();
+
+protected:
+    int write_header ();
+    bool write_samples (const double *samples, int num_samples);
+
+private:
+    std::string file;
+    std::string file_mode;
+    int board_id;
+    int preset;
+    json preset_descr;
+    BinaryFileDataTypes data_type;
+    std::vector<float> float_samples;
+};
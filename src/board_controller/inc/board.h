@@ -1,10 +1,14 @@
 #pragma once
 
+#include <atomic>
 #include <cmath>
+#include <condition_variable>
 #include <deque>
 #include <limits>
 #include <map>
+#include <mutex>
 #include <string>
+#include <vector>
 
 #include "board_controller.h"
 #include "brainflow_boards.h"
@@ -17,6 +21,31 @@
 #include "spdlog/spdlog.h"
 
 #define MAX_CAPTURE_SAMPLES (86400 * 250) // should be enough for one day of capturing
+#define MAX_PRESETS 3
+
+// order of values returned by get_buffer_stats
+enum class BufferStats : int
+{
+    SAMPLES_PUSHED = 0,
+    SAMPLES_OVERWRITTEN = 1,
+    CURRENT_FILL = 2,
+    PEAK_FILL = 3,
+    CAPACITY = 4,
+    STREAMER_DROPS = 5,
+    BLOCKED_TIME_MS = 6,
+    NUM_STATS = 7
+};
+
+// preset description resolved in prepare_for_acquisition, push_package uses only this struct
+struct PresetDescr
+{
+    int num_rows;
+    int marker_channel;
+    bool block_when_full;
+    DataBuffer *db;
+    std::vector<Streamer *> *streamers;
+    std::deque<double> *marker_queue;
+};
 
 
 class Board
@@ -39,6 +68,15 @@ public:
         skip_logs = false;
         this->board_id = board_id;
         this->params = params;
+        reset_preset_descrs ();
+        for (int i = 0; i < MAX_PRESETS; i++)
+        {
+            wait_thresholds[i] = 0;
+            num_waiters[i] = 0;
+            num_blocked_producers[i] = 0;
+            blocked_time_us[i] = 0;
+        }
+        producers_unblocked = false;
         try
         {
             board_descr = boards_struct.brainflow_boards_json["boards"][std::to_string (board_id)];
@@ -65,9 +103,31 @@ public:
         int num_samples, int preset, double *data_buf, int *returned_samples);
     int get_board_data_count (int preset, int *result);
     int get_board_data (int data_count, int preset, double *data_buf);
+    // row_stride is a distance between channels in data_buf, 0 means packed rows, if num_channels
+    // is 0 all rows are returned, otherwise only listed channels in provided order
+    int get_current_board_data (int num_samples, int preset, double *data_buf, int row_stride,
+        int *returned_samples, const int *channels = NULL, int num_channels = 0);
+    int get_board_data (int data_count, int preset, double *data_buf, int row_stride,
+        int *returned_samples, const int *channels = NULL, int num_channels = 0);
+    // blocks until buffer has at least num_samples or timeout expires, result is a number of
+    // samples in buffer when method returns
+    int wait_for_samples (int num_samples, int timeout_ms, int preset, int *result);
+    // stats are described by BufferStats enum, they are reset on each start_stream
+    int get_buffer_stats (int preset, double *stats, int max_stats, int *num_stats);
+    // takes effect on the next start_stream
+    int set_buffer_layout (int layout, int preset);
+    // takes effect on the next start_stream, with BufferPolicies::BLOCK push_package waits until
+    // get_board_data frees space instead of overwriting the oldest samples
+    int set_buffer_policy (int policy, int preset);
+    // wakes up producers blocked by full buffers, until the next start_stream they dont wait.
+    // Must be called before stop_stream joins acquisition threads
+    void unblock_producers ();
     int insert_marker (double value, int preset);
     int add_streamer (const char *streamer_params, int preset);
     int delete_streamer (const char *streamer_params, int preset);
+    int register_data_callback (
+        brainflow_data_callback callback, void *user_data, int batch_size, int preset);
+    int unregister_data_callback (int preset);
 
     // Board::board_logger should not be called from destructors, to ensure that there are safe log
     // methods Board::board_logger still available but should be used only outside destructors
@@ -106,16 +166,39 @@ protected:
     json board_descr;
     SpinLock lock;
     std::map<int, std::deque<double>> marker_queues;
+    std::map<int, int> buffer_layouts;
+    std::map<int, int> buffer_policies;
+    PresetDescr preset_descrs[MAX_PRESETS];
 
     int prepare_for_acquisition (int buffer_size, const char *streamer_params);
     void free_packages ();
     void push_package (double *package, int preset = (int)BrainFlowPresets::DEFAULT_PRESET);
+    // packages are stored one after another, markers and streamers are handled per package but
+    // board lock is taken and ring buffer is updated only once for the whole batch
+    void push_packages (
+        double *packages, int num_packages, int preset = (int)BrainFlowPresets::DEFAULT_PRESET);
+    // waits until buffer has space for count samples or producers are unblocked
+    void wait_for_free_space (int preset, size_t count);
     std::string preset_to_string (int preset);
     int preset_to_int (std::string preset);
     int parse_streamer_params (const char *streamer_params, std::string &streamer_type,
         std::string &streamer_dest, std::string &streamer_mods);
 
 private:
-    // reshapes data from DataBuffer format where all channels are mixed to linear buffer
-    void reshape_data (int data_count, int preset, const double *buf, double *output_buf);
+    // waiters sleep on wait_cv, push_package notifies them only if buffer reached the smallest
+    // requested size, num_waiters and writes of PresetDescr::db are protected by wait_mutex
+    std::mutex wait_mutex;
+    std::condition_variable wait_cv;
+    std::atomic<size_t> wait_thresholds[MAX_PRESETS];
+    int num_waiters[MAX_PRESETS];
+    // producers blocked by full buffer sleep on space_cv, get_board_data notifies them only if
+    // num_blocked_producers is not zero
+    std::mutex space_mutex;
+    std::condition_variable space_cv;
+    std::atomic<int> num_blocked_producers[MAX_PRESETS];
+    std::atomic<uint64_t> blocked_time_us[MAX_PRESETS];
+    std::atomic<bool> producers_unblocked;
+
+    void reset_preset_descrs ();
+    int check_channels (int preset, const int *channels, int num_channels);
 };
@@ -7,6 +7,10 @@
 extern "C"
 {
 #endif
+    // value of channel j for sample i is data[j * num_samples + i], data is valid only during call
+    typedef void (*brainflow_data_callback) (
+        const double *data, int num_rows, int num_samples, void *user_data);
+
     // data acquisition methods
     SHARED_EXPORT int CALLING_CONVENTION prepare_session (
         int board_id, const char *json_brainflow_input_params);
@@ -22,6 +26,25 @@ extern "C"
         int preset, int *result, int board_id, const char *json_brainflow_input_params);
     SHARED_EXPORT int CALLING_CONVENTION get_board_data (int data_count, int preset,
         double *data_buf, int board_id, const char *json_brainflow_input_params);
+    // same as methods above but write data to caller owned buffer, value of channel j for sample i
+    // goes to data_buf[j * row_stride + i], if num_channels > 0 only listed channels are returned
+    SHARED_EXPORT int CALLING_CONVENTION get_current_board_data_into (int num_samples, int preset,
+        double *data_buf, int row_stride, int *returned_samples, const int *channels,
+        int num_channels, int board_id, const char *json_brainflow_input_params);
+    SHARED_EXPORT int CALLING_CONVENTION get_board_data_into (int data_count, int preset,
+        double *data_buf, int row_stride, int *returned_samples, const int *channels,
+        int num_channels, int board_id, const char *json_brainflow_input_params);
+    // blocks until at least num_samples are available or timeout expires, doesnt lock other calls
+    SHARED_EXPORT int CALLING_CONVENTION wait_for_samples (int num_samples, int timeout_ms,
+        int preset, int *result, int board_id, const char *json_brainflow_input_params);
+    // stats order: samples pushed, samples overwritten, current fill, peak fill, capacity, samples
+    // dropped by streamers, time in ms which producer spent waiting for free space
+    SHARED_EXPORT int CALLING_CONVENTION get_buffer_stats (int preset, double *stats, int max_stats,
+        int *num_stats, int board_id, const char *json_brainflow_input_params);
+    SHARED_EXPORT int CALLING_CONVENTION set_buffer_layout (
+        int layout, int preset, int board_id, const char *json_brainflow_input_params);
+    SHARED_EXPORT int CALLING_CONVENTION set_buffer_policy (
+        int policy, int preset, int board_id, const char *json_brainflow_input_params);
     SHARED_EXPORT int CALLING_CONVENTION config_board (const char *config, char *response,
         int *response_len, int board_id, const char *json_brainflow_input_params);
     SHARED_EXPORT int CALLING_CONVENTION config_board_with_bytes (
@@ -34,6 +57,14 @@ extern "C"
         const char *streamer, int preset, int board_id, const char *json_brainflow_input_params);
     SHARED_EXPORT int CALLING_CONVENTION delete_streamer (
         const char *streamer, int preset, int board_id, const char *json_brainflow_input_params);
+    // callback is called from dispatcher thread with batches of batch_size samples, one callback
+    // per preset, new registration replaces old one. Samples left when callback is unregistered or
+    // session is released are passed as the last batch with less than batch_size samples
+    SHARED_EXPORT int CALLING_CONVENTION register_data_callback (brainflow_data_callback callback,
+        void *user_data, int batch_size, int preset, int board_id,
+        const char *json_brainflow_input_params);
+    SHARED_EXPORT int CALLING_CONVENTION unregister_data_callback (
+        int preset, int board_id, const char *json_brainflow_input_params);
     SHARED_EXPORT int CALLING_CONVENTION release_all_sessions ();
 
     // logging methods
@@ -0,0 +1,37 @@
+#pragma once
+
+#include <condition_variable>
+#include <mutex>
+#include <thread>
+
+#include "board_controller.h"
+#include "data_buffer.h"
+#include "streamer.h"
+
+
+// collects batches of samples and passes them to user callback from dispatcher thread, so slow
+// callbacks never block acquisition thread
+class CallbackStreamer : public Streamer
+{
+
+public:
+    CallbackStreamer (
+        brainflow_data_callback callback, void *user_data, int batch_size, int data_len);
+    ~CallbackStreamer ();
+
+    int init_streamer ();
+    void stream_data (double *data);
+    uint64_t get_num_dropped ();
+
+private:
+    brainflow_data_callback callback;
+    void *user_data;
+    size_t batch_size;
+    DataBuffer *db;
+    volatile bool is_streaming;
+    std::thread streaming_thread;
+    std::mutex m;
+    std::condition_variable cv;
+
+    void thread_worker ();
+};
@@ -1,12 +1,12 @@
 #pragma once
 
-#include <stdio.h>
+#include <vector>
 
-#include "streamer.h"
+#include "async_file_streamer.h"
 
 #define BRAINFLOW_FILE_NAME_LIMIT 512
 
-class FileStreamer : public Streamer
+class FileStreamer : public AsyncFileStreamer
 {
 
 public:
@@ -14,10 +14,12 @@ public:
     ~FileStreamer ();
 
     int init_streamer ();
-    void stream_data (double *data);
+
+protected:
+    bool write_samples (const double *samples, int num_samples);
 
 private:
     char file[BRAINFLOW_FILE_NAME_LIMIT];
     char file_mode[BRAINFLOW_FILE_NAME_LIMIT];
-    FILE *fp;
+    std::vector<char> text;
 };
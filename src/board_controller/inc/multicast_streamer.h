@@ -16,6 +16,7 @@ public:
 
     int init_streamer ();
     void stream_data (double *data);
+    uint64_t get_num_dropped ();
 
 private:
     char ip[128];
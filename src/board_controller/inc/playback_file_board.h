@@ -1,5 +1,6 @@
 #pragma once
 
+#include <atomic>
 #include <condition_variable>
 #include <mutex>
 #include <thread>
@@ -7,6 +8,7 @@
 
 #include "board.h"
 #include "board_controller.h"
+#include "playback_file_reader.h"
 
 
 class PlaybackFileBoard : public Board
@@ -16,13 +18,16 @@ private:
     volatile bool keep_alive;
     volatile bool loopback;
     volatile bool use_new_timestamps;
+    // multiplier for recorded speed, 0 means as fast as possible
+    std::atomic<double> playback_speed;
     std::vector<double> pos_percentage;
+    std::vector<double> pos_timestamp;
     std::vector<std::thread> streaming_threads;
     bool initialized;
-    std::vector<std::vector<long int>> file_offsets;
+    std::vector<PlaybackFileReader *> readers; // indexed by preset
 
-    void read_thread (int preset, std::string filename);
-    int get_file_offsets (std::string filename, std::vector<long int> &offsets);
+    void read_thread (int preset);
+    int open_file (int preset, std::string filename);
 
 public:
     PlaybackFileBoard (struct BrainFlowInputParams params);
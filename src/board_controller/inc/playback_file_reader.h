@@ -0,0 +1,83 @@
+#pragma once
+
+#include <stddef.h>
+#include <stdio.h>
+#include <string>
+#include <vector>
+
+#include "mapped_file.h"
+
+
+// source of samples for playback board, each preset has its own reader used only by its thread
+class PlaybackFileReader
+{
+public:
+    virtual ~PlaybackFileReader ()
+    {
+    }
+
+    // validates file and prepares it for reading from the first sample
+    virtual int open (const std::string &file, int num_rows) = 0;
+    virtual size_t get_num_samples () = 0;
+    virtual void seek (size_t sample) = 0;
+    // returns STATUS_OK, EMPTY_BUFFER_ERROR at the end of file or other error code for invalid
+    // sample which should be skipped
+    virtual int read_sample (double *package) = 0;
+
+    // first sample with timestamp >= given one, timestamps in file must not decrease.
+    // Current position is not preserved
+    size_t find_timestamp (double timestamp, int timestamp_channel);
+
+protected:
+    virtual bool read_value (size_t sample, int row, double *value) = 0;
+};
+
+// text files written by file streamer or write_file, requires offset of each line in memory
+class TextPlaybackFileReader : public PlaybackFileReader
+{
+public:
+    TextPlaybackFileReader ();
+    ~TextPlaybackFileReader ();
+
+    int open (const std::string &file, int num_rows);
+    size_t get_num_samples ();
+    void seek (size_t sample);
+    int read_sample (double *package);
+
+protected:
+    bool read_value (size_t sample, int row, double *value);
+
+private:
+    FILE *fp;
+    int num_rows;
+    std::vector<long int> offsets;
+    std::vector<double> values;
+
+    int parse_line (const char *line, double *package);
+};
+
+// files written by binary file streamer, file is memory mapped and sample position is calculated
+// from its index, so there is no scan on startup and seek by timestamp is a binary search
+class BinaryPlaybackFileReader : public PlaybackFileReader
+{
+public:
+    BinaryPlaybackFileReader ();
+
+    int open (const std::string &file, int num_rows);
+    size_t get_num_samples ();
+    void seek (size_t sample);
+    int read_sample (double *package);
+
+    static bool is_binary_file (const std::string &file);
+
+protected:
+    bool read_value (size_t sample, int row, double *value);
+
+private:
+    MappedFile mapped_file;
+    const char *samples;
+    size_t num_samples;
+    size_t pos;
+    int num_rows;
+    bool is_float32;
+};
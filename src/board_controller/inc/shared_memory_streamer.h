@@ -0,0 +1,56 @@
+#pragma once
+
+#include <atomic>
+#include <stdint.h>
+#include <string>
+
+#ifdef _WIN32
+#include <windows.h>
+#endif
+
+#include "streamer.h"
+
+#define BRAINFLOW_SHM_MAGIC 0x424653484D524E47ULL // "BFSHMRNG"
+#define BRAINFLOW_SHM_HEADER_SIZE 64
+
+// layout of shared memory region, header is followed by capacity samples, each sample is num_rows
+// doubles, sample with sequence number n is stored in slot n % capacity
+struct SharedMemoryHeader
+{
+    uint64_t magic;
+    uint64_t num_rows;
+    uint64_t capacity;
+    std::atomic<uint64_t> write_seq; // number of samples written, updated after sample is copied
+    uint64_t writer_pid;             // lets next writer remove region left by crashed process
+};
+
+// publishes samples into shared memory ring, readers in other processes map it by name, writer
+// never waits for readers, they detect overwritten samples using write_seq
+class SharedMemoryStreamer : public Streamer
+{
+
+public:
+    SharedMemoryStreamer (const char *name, int capacity, int data_len);
+    ~SharedMemoryStreamer ();
+
+    int init_streamer ();
+    void stream_data (double *data);
+
+private:
+    std::string name;
+    size_t capacity;
+    size_t region_size;
+    SharedMemoryHeader *header;
+    double *samples;
+#ifdef _WIN32
+    HANDLE map_handle;
+#else
+    int fd;
+#endif
+
+    void free_region ();
+#if !defined(_WIN32) && !defined(__ANDROID__)
+    // true if region with this name was created by process which is not running anymore
+    bool is_stale_region ();
+#endif
+};
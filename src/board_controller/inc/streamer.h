@@ -1,5 +1,6 @@
 #pragma once
 
+#include <stdint.h>
 #include <string>
 
 class Streamer
@@ -19,6 +20,11 @@ public:
 
     virtual int init_streamer () = 0;
     virtual void stream_data (double *data) = 0;
+    // number of samples which were lost because streamer could not keep up
+    virtual uint64_t get_num_dropped ()
+    {
+        return 0;
+    }
 
     virtual bool check_equals (std::string type, std::string dest, std::string mods)
     {
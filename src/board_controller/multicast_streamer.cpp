@@ -77,6 +77,11 @@ void MultiCastStreamer::stream_data (double *data)
     db->add_data (data);
 }
 
+uint64_t MultiCastStreamer::get_num_dropped ()
+{
+    return (db == NULL) ? 0 : db->get_num_overwritten ();
+}
+
 void MultiCastStreamer::thread_worker ()
 {
     int num_packages = get_brainflow_batch_size ();
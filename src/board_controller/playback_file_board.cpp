@@ -1,6 +1,5 @@
 #include <algorithm>
 #include <chrono>
-#include <sstream>
 #include <stdio.h>
 #include <string.h>
 #include <string>
@@ -19,7 +18,9 @@
 #define NEW_TIMESTAMPS "new_timestamps"
 #define OLD_TIMESTAMPS "old_timestamps"
 #define SET_INDEX_PREFIX "set_index_percentage:"
-#define MAX_LINE_LENGTH 8192
+#define SET_TIMESTAMP_PREFIX "set_index_timestamp:"
+#define SET_SPEED_PREFIX "set_playback_speed:"
+#define MAX_SPEED "max"
 
 
 PlaybackFileBoard::PlaybackFileBoard (struct BrainFlowInputParams params)
@@ -32,8 +33,13 @@ PlaybackFileBoard::PlaybackFileBoard (struct BrainFlowInputParams params)
     loopback = false;
     initialized = false;
     use_new_timestamps = true;
+    playback_speed = 1.0;
     pos_percentage.resize (3);
     std::fill (pos_percentage.begin (), pos_percentage.end (), -1);
+    pos_timestamp.resize (3);
+    std::fill (pos_timestamp.begin (), pos_timestamp.end (), -1);
+    readers.resize (3);
+    std::fill (readers.begin (), readers.end (), (PlaybackFileReader *)NULL);
 }
 
 PlaybackFileBoard::~PlaybackFileBoard ()
@@ -74,44 +80,27 @@ int PlaybackFileBoard::prepare_session ()
         return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
     }
 
+    int res = (int)BrainFlowExitCodes::STATUS_OK;
     if (!params.file.empty ())
     {
-        std::vector<long int> offsets;
-        int res = get_file_offsets (params.file, offsets);
-        if (res != (int)BrainFlowExitCodes::STATUS_OK)
-        {
-            return res;
-        }
-        else
-        {
-            file_offsets.push_back (offsets);
-        }
+        res = open_file ((int)BrainFlowPresets::DEFAULT_PRESET, params.file);
     }
-    if (!params.file_aux.empty ())
+    if ((res == (int)BrainFlowExitCodes::STATUS_OK) && (!params.file_aux.empty ()))
     {
-        std::vector<long int> offsets;
-        int res = get_file_offsets (params.file_aux, offsets);
-        if (res != (int)BrainFlowExitCodes::STATUS_OK)
-        {
-            return res;
-        }
-        else
-        {
-            file_offsets.push_back (offsets);
-        }
+        res = open_file ((int)BrainFlowPresets::AUXILIARY_PRESET, params.file_aux);
     }
-    if (!params.file_anc.empty ())
+    if ((res == (int)BrainFlowExitCodes::STATUS_OK) && (!params.file_anc.empty ()))
     {
-        std::vector<long int> offsets;
-        int res = get_file_offsets (params.file_anc, offsets);
-        if (res != (int)BrainFlowExitCodes::STATUS_OK)
-        {
-            return res;
-        }
-        else
+        res = open_file ((int)BrainFlowPresets::ANCILLARY_PRESET, params.file_anc);
+    }
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        for (size_t i = 0; i < readers.size (); i++)
         {
-            file_offsets.push_back (offsets);
+            delete readers[i];
+            readers[i] = NULL;
         }
+        return res;
     }
 
     initialized = true;
@@ -136,18 +125,18 @@ int PlaybackFileBoard::start_stream (int buffer_size, const char *streamer_param
     keep_alive = true;
     if (!params.file.empty ())
     {
-        streaming_threads.push_back (std::thread (
-            [this] { this->read_thread ((int)BrainFlowPresets::DEFAULT_PRESET, params.file); }));
+        streaming_threads.push_back (
+            std::thread ([this] { this->read_thread ((int)BrainFlowPresets::DEFAULT_PRESET); }));
     }
     if (!params.file_aux.empty ())
     {
-        streaming_threads.push_back (std::thread ([this]
-            { this->read_thread ((int)BrainFlowPresets::AUXILIARY_PRESET, params.file_aux); }));
+        streaming_threads.push_back (
+            std::thread ([this] { this->read_thread ((int)BrainFlowPresets::AUXILIARY_PRESET); }));
     }
     if (!params.file_anc.empty ())
     {
-        streaming_threads.push_back (std::thread ([this]
-            { this->read_thread ((int)BrainFlowPresets::ANCILLARY_PRESET, params.file_anc); }));
+        streaming_threads.push_back (
+            std::thread ([this] { this->read_thread ((int)BrainFlowPresets::ANCILLARY_PRESET); }));
     }
 
     return (int)BrainFlowExitCodes::STATUS_OK;
@@ -158,6 +147,7 @@ int PlaybackFileBoard::stop_stream ()
     if (keep_alive)
     {
         keep_alive = false;
+        unblock_producers ();
         for (std::thread &streaming_thread : streaming_threads)
         {
             streaming_thread.join ();
@@ -179,26 +169,24 @@ int PlaybackFileBoard::release_session ()
         free_packages ();
         initialized = false;
     }
-    file_offsets.clear ();
+    for (size_t i = 0; i < readers.size (); i++)
+    {
+        delete readers[i];
+        readers[i] = NULL;
+    }
     return (int)BrainFlowExitCodes::STATUS_OK;
 }
 
-void PlaybackFileBoard::read_thread (int preset, std::string file)
+void PlaybackFileBoard::read_thread (int preset)
 {
     std::string preset_str = preset_to_string (preset);
-    if (board_descr.find (preset_str) == board_descr.end ())
-    {
-        safe_logger (spdlog::level::err, "no preset {} for board {}", preset, board_id);
-        return;
-    }
-
-    FILE *fp;
-    fp = fopen (file.c_str (), "rb");
-    if (fp == NULL)
+    PlaybackFileReader *reader = readers[preset];
+    if (reader == NULL)
     {
-        safe_logger (spdlog::level::err, "failed to open file in thread");
+        safe_logger (spdlog::level::err, "no file for preset {}", preset_str);
         return;
     }
+    reader->seek (0);
 
     json board_preset = board_descr[preset_str];
     int num_rows = board_preset["num_rows"];
@@ -207,7 +195,6 @@ void PlaybackFileBoard::read_thread (int preset, std::string file)
     {
         package[i] = 0.0;
     }
-    char buf[MAX_LINE_LENGTH];
     double last_timestamp = -1.0;
     bool new_timestamps = use_new_timestamps; // to prevent changing during streaming
     int timestamp_channel = board_preset["timestamp_channel"];
@@ -220,31 +207,32 @@ void PlaybackFileBoard::read_thread (int preset, std::string file)
         // prevent race condition with another config_board method call
         lock.lock ();
         double cur_index = pos_percentage[preset];
+        double cur_timestamp = pos_timestamp[preset];
+        pos_percentage[preset] = -1;
+        pos_timestamp[preset] = -1;
+        lock.unlock ();
         if ((int)cur_index >= 0)
         {
-            int new_pos = (int)(cur_index * (file_offsets[preset].size () / 100.0));
-            try
-            {
-                fseek (fp, file_offsets[preset][new_pos], SEEK_SET);
-                safe_logger (spdlog::level::trace, "set position in a file to {}", new_pos);
-            }
-            catch (...)
-            {
-                // should never happen since input is already validated
-                safe_logger (spdlog::level::warn, "invalid position in a file");
-            }
+            size_t new_pos = (size_t)(cur_index * (reader->get_num_samples () / 100.0));
+            reader->seek (new_pos);
+            safe_logger (spdlog::level::trace, "set position in a file to {}", new_pos);
             last_timestamp = -1;
-            pos_percentage[preset] = -1;
         }
-        lock.unlock ();
-        char *res = fgets (buf, sizeof (buf), fp);
-        if ((loopback) && (res == NULL))
+        if (cur_timestamp >= 0)
         {
-            fseek (fp, 0, SEEK_SET); // go to beginning'
+            size_t new_pos = reader->find_timestamp (cur_timestamp, timestamp_channel);
+            reader->seek (new_pos);
+            safe_logger (spdlog::level::trace, "set position in a file to {}", new_pos);
+            last_timestamp = -1;
+        }
+        int res = reader->read_sample (package);
+        if ((loopback) && (res == (int)BrainFlowExitCodes::EMPTY_BUFFER_ERROR))
+        {
+            reader->seek (0); // go to beginning
             last_timestamp = -1.0;
             continue;
         }
-        if ((!loopback) && (res == NULL))
+        if ((!loopback) && (res == (int)BrainFlowExitCodes::EMPTY_BUFFER_ERROR))
         {
             if (!reached_end)
             {
@@ -263,44 +251,22 @@ void PlaybackFileBoard::read_thread (int preset, std::string file)
 #endif
             continue;
         }
-        // res not NULL
-        std::string tsv_string (buf);
-        std::stringstream ss (tsv_string);
-        std::vector<std::string> splitted;
-        std::string tmp;
-        char sep = '\t';
-        if (tsv_string.find ('\t') == std::string::npos)
-        {
-            sep = ',';
-        }
-        while (std::getline (ss, tmp, sep))
-        {
-            if (tmp != "\n")
-            {
-                splitted.push_back (tmp);
-            }
-        }
-        if (splitted.size () != num_rows)
+        if (res != (int)BrainFlowExitCodes::STATUS_OK)
         {
-            safe_logger (spdlog::level::err,
-                "invalid string in file, check provided board id. String size {}, expected size {}",
-                splitted.size (), num_rows);
+            // invalid sample is logged by reader
             continue;
         }
-        for (int i = 0; i < num_rows; i++)
+        double speed = playback_speed;
+        if (speed <= 0)
         {
-            try
-            {
-                package[i] = std::stod (splitted[i]);
-            }
-            catch (...)
-            {
-                safe_logger (spdlog::level::err, "failed to parse value: {}", splitted[i].c_str ());
-            }
+            // consumers set the pace, wait for them instead of overwriting unread samples
+            wait_for_free_space (preset, 1);
+            accumulated_time_delta = 0.0;
         }
-        if (last_timestamp > 0)
+        else if (last_timestamp > 0)
         {
-            double time_wait = (package[timestamp_channel] - last_timestamp) * 1000; // in ms
+            double time_wait =
+                (package[timestamp_channel] - last_timestamp) * 1000 / speed; // in ms
             if (time_wait - accumulated_time_delta > 1)
             {
 #ifdef _WIN32
@@ -323,7 +289,6 @@ void PlaybackFileBoard::read_thread (int preset, std::string file)
         }
         push_package (package, preset);
     }
-    fclose (fp);
     delete[] package;
 }
 
@@ -370,6 +335,60 @@ int PlaybackFileBoard::config_board (std::string config, std::string &response)
             return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
         }
     }
+    else if (strncmp (config.c_str (), SET_SPEED_PREFIX, strlen (SET_SPEED_PREFIX)) == 0)
+    {
+        std::string value = config.substr (strlen (SET_SPEED_PREFIX));
+        if (value == MAX_SPEED)
+        {
+            playback_speed = 0.0;
+            return (int)BrainFlowExitCodes::STATUS_OK;
+        }
+        try
+        {
+            double new_speed = std::stod (value);
+            if (new_speed > 0)
+            {
+                playback_speed = new_speed;
+            }
+            else
+            {
+                safe_logger (
+                    spdlog::level::err, "invalid speed value, should be positive or {}", MAX_SPEED);
+                return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+            }
+        }
+        catch (const std::exception &e)
+        {
+            safe_logger (spdlog::level::err,
+                "need to write a number or {} after {}, exception is: {}", MAX_SPEED,
+                SET_SPEED_PREFIX, e.what ());
+            return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+        }
+    }
+    else if (strncmp (config.c_str (), SET_TIMESTAMP_PREFIX, strlen (SET_TIMESTAMP_PREFIX)) == 0)
+    {
+        try
+        {
+            double new_timestamp = std::stod (config.substr (strlen (SET_TIMESTAMP_PREFIX)));
+            if (new_timestamp >= 0)
+            {
+                lock.lock ();
+                std::fill (pos_timestamp.begin (), pos_timestamp.end (), new_timestamp);
+                lock.unlock ();
+            }
+            else
+            {
+                safe_logger (spdlog::level::err, "invalid timestamp value, should be positive");
+                return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+            }
+        }
+        catch (const std::exception &e)
+        {
+            safe_logger (spdlog::level::err, "need to write a number after {}, exception is: {}",
+                SET_TIMESTAMP_PREFIX, e.what ());
+            return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+        }
+    }
     else
     {
         safe_logger (spdlog::level::warn, "invalid config string {}", config);
@@ -378,36 +397,30 @@ int PlaybackFileBoard::config_board (std::string config, std::string &response)
     return (int)BrainFlowExitCodes::STATUS_OK;
 }
 
-int PlaybackFileBoard::get_file_offsets (std::string filename, std::vector<long int> &offsets)
+int PlaybackFileBoard::open_file (int preset, std::string filename)
 {
-    offsets.clear ();
-
-    FILE *fp = fopen (filename.c_str (), "rb");
-    if (fp == NULL)
+    std::string preset_str = preset_to_string (preset);
+    if (board_descr.find (preset_str) == board_descr.end ())
     {
-        safe_logger (spdlog::level::err, "failed to open file: {}", filename.c_str ());
+        safe_logger (spdlog::level::err, "no preset {} for board {}", preset_str, board_id);
         return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
     }
-
-    char buf[MAX_LINE_LENGTH];
-    long int bytes_read = 0;
-    while (true)
-    {
-        offsets.push_back (bytes_read);
-        char *res = fgets (buf, sizeof (buf), fp);
-        bytes_read += (long int)strlen (buf);
-        if (res == NULL)
-        {
-            break;
-        }
+    // binary recordings dont need a scan to find sample positions
+    PlaybackFileReader *reader = NULL;
+    if (BinaryPlaybackFileReader::is_binary_file (filename))
+    {
+        reader = new BinaryPlaybackFileReader ();
     }
-
-    fclose (fp);
-    if (offsets.size () < 2)
+    else
     {
-        safe_logger (spdlog::level::err, "empty file: {}", filename);
-        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+        reader = new TextPlaybackFileReader ();
     }
-
+    int res = reader->open (filename, (int)board_descr[preset_str]["num_rows"]);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        delete reader;
+        return res;
+    }
+    readers[preset] = reader;
     return (int)BrainFlowExitCodes::STATUS_OK;
 }
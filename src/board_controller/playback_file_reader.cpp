@@ -0,0 +1,279 @@
+#include <algorithm>
+#include <sstream>
+#include <stdint.h>
+#include <string.h>
+
+#include "binary_file_streamer.h"
+#include "board.h"
+#include "brainflow_constants.h"
+#include "playback_file_reader.h"
+
+#define MAX_LINE_LENGTH 8192
+
+
+size_t PlaybackFileReader::find_timestamp (double timestamp, int timestamp_channel)
+{
+    size_t low = 0;
+    size_t high = get_num_samples ();
+    while (low < high)
+    {
+        size_t mid = low + (high - low) / 2;
+        double value = 0.0;
+        // invalid samples are skipped during playback as well
+        if ((!read_value (mid, timestamp_channel, &value)) || (value < timestamp))
+        {
+            low = mid + 1;
+        }
+        else
+        {
+            high = mid;
+        }
+    }
+    return low;
+}
+
+///////////////////////////////////////
+/////////////// Text //////////////////
+///////////////////////////////////////
+
+TextPlaybackFileReader::TextPlaybackFileReader ()
+{
+    fp = NULL;
+    num_rows = 0;
+}
+
+TextPlaybackFileReader::~TextPlaybackFileReader ()
+{
+    if (fp != NULL)
+    {
+        fclose (fp);
+        fp = NULL;
+    }
+}
+
+int TextPlaybackFileReader::open (const std::string &file, int num_rows)
+{
+    this->num_rows = num_rows;
+    values.resize (num_rows);
+    offsets.clear ();
+    fp = fopen (file.c_str (), "rb");
+    if (fp == NULL)
+    {
+        Board::board_logger->error ("failed to open file: {}", file.c_str ());
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+
+    char buf[MAX_LINE_LENGTH];
+    long int bytes_read = 0;
+    while (true)
+    {
+        offsets.push_back (bytes_read);
+        char *res = fgets (buf, sizeof (buf), fp);
+        bytes_read += (long int)strlen (buf);
+        if (res == NULL)
+        {
+            break;
+        }
+    }
+
+    if (offsets.size () < 2)
+    {
+        Board::board_logger->error ("empty file: {}", file.c_str ());
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    seek (0);
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+size_t TextPlaybackFileReader::get_num_samples ()
+{
+    // last offset is the end of file
+    return (offsets.empty ()) ? 0 : offsets.size () - 1;
+}
+
+void TextPlaybackFileReader::seek (size_t sample)
+{
+    if (offsets.empty ())
+    {
+        return;
+    }
+    sample = std::min (sample, offsets.size () - 1);
+    fseek (fp, offsets[sample], SEEK_SET);
+}
+
+int TextPlaybackFileReader::read_sample (double *package)
+{
+    char buf[MAX_LINE_LENGTH];
+    if (fgets (buf, sizeof (buf), fp) == NULL)
+    {
+        return (int)BrainFlowExitCodes::EMPTY_BUFFER_ERROR;
+    }
+    return parse_line (buf, package);
+}
+
+bool TextPlaybackFileReader::read_value (size_t sample, int row, double *value)
+{
+    char buf[MAX_LINE_LENGTH];
+    seek (sample);
+    if ((fgets (buf, sizeof (buf), fp) == NULL) ||
+        (parse_line (buf, values.data ()) != (int)BrainFlowExitCodes::STATUS_OK))
+    {
+        return false;
+    }
+    *value = values[row];
+    return true;
+}
+
+int TextPlaybackFileReader::parse_line (const char *line, double *package)
+{
+    std::string tsv_string (line);
+    std::stringstream ss (tsv_string);
+    std::vector<std::string> splitted;
+    std::string tmp;
+    char sep = '\t';
+    if (tsv_string.find ('\t') == std::string::npos)
+    {
+        sep = ',';
+    }
+    while (std::getline (ss, tmp, sep))
+    {
+        if (tmp != "\n")
+        {
+            splitted.push_back (tmp);
+        }
+    }
+    if (splitted.size () != (size_t)num_rows)
+    {
+        Board::board_logger->error (
+            "invalid string in file, check provided board id. String size {}, expected size {}",
+            splitted.size (), num_rows);
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    for (int i = 0; i < num_rows; i++)
+    {
+        try
+        {
+            package[i] = std::stod (splitted[i]);
+        }
+        catch (...)
+        {
+            Board::board_logger->error ("failed to parse value: {}", splitted[i].c_str ());
+        }
+    }
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+///////////////////////////////////////
+////////////// Binary /////////////////
+///////////////////////////////////////
+
+BinaryPlaybackFileReader::BinaryPlaybackFileReader ()
+{
+    samples = NULL;
+    num_samples = 0;
+    pos = 0;
+    num_rows = 0;
+    is_float32 = false;
+}
+
+bool BinaryPlaybackFileReader::is_binary_file (const std::string &file)
+{
+    FILE *fp = fopen (file.c_str (), "rb");
+    if (fp == NULL)
+    {
+        return false;
+    }
+    uint64_t magic = 0;
+    bool res = (fread (&magic, sizeof (magic), 1, fp) == 1) && (magic == BRAINFLOW_BIN_FILE_MAGIC);
+    fclose (fp);
+    return res;
+}
+
+int BinaryPlaybackFileReader::open (const std::string &file, int num_rows)
+{
+    this->num_rows = num_rows;
+    if (!mapped_file.open (file.c_str ()))
+    {
+        Board::board_logger->error ("failed to open file: {}", file.c_str ());
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    BinaryFileHeader header;
+    if (mapped_file.get_size () < sizeof (header))
+    {
+        Board::board_logger->error ("file {} is too short for binary file header", file.c_str ());
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    memcpy (&header, mapped_file.get_data (), sizeof (header));
+    if ((header.magic != BRAINFLOW_BIN_FILE_MAGIC) ||
+        (header.version != BRAINFLOW_BIN_FILE_VERSION) || (header.header_size < sizeof (header)) ||
+        (header.header_size > mapped_file.get_size ()) ||
+        ((header.data_type != (uint32_t)BinaryFileDataTypes::FLOAT64) &&
+            (header.data_type != (uint32_t)BinaryFileDataTypes::FLOAT32)))
+    {
+        Board::board_logger->error ("invalid binary file header in {}", file.c_str ());
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    if (header.num_rows != (uint32_t)num_rows)
+    {
+        Board::board_logger->error (
+            "file {} has {} rows, expected size {}, check provided board id", file.c_str (),
+            header.num_rows, num_rows);
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    is_float32 = (header.data_type == (uint32_t)BinaryFileDataTypes::FLOAT32);
+    size_t sample_size = (size_t)num_rows * (is_float32 ? sizeof (float) : sizeof (double));
+    samples = mapped_file.get_data () + header.header_size;
+    // last sample can be incomplete if streamer is still running
+    num_samples = (mapped_file.get_size () - header.header_size) / sample_size;
+    if (num_samples == 0)
+    {
+        Board::board_logger->error ("empty file: {}", file.c_str ());
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    pos = 0;
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+size_t BinaryPlaybackFileReader::get_num_samples ()
+{
+    return num_samples;
+}
+
+void BinaryPlaybackFileReader::seek (size_t sample)
+{
+    pos = std::min (sample, num_samples);
+}
+
+int BinaryPlaybackFileReader::read_sample (double *package)
+{
+    if (pos >= num_samples)
+    {
+        return (int)BrainFlowExitCodes::EMPTY_BUFFER_ERROR;
+    }
+    for (int i = 0; i < num_rows; i++)
+    {
+        read_value (pos, i, &package[i]);
+    }
+    pos++;
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+bool BinaryPlaybackFileReader::read_value (size_t sample, int row, double *value)
+{
+    if (sample >= num_samples)
+    {
+        return false;
+    }
+    size_t index = sample * num_rows + row;
+    if (is_float32)
+    {
+        float tmp;
+        memcpy (&tmp, samples + index * sizeof (float), sizeof (float));
+        *value = (double)tmp;
+    }
+    else
+    {
+        memcpy (value, samples + index * sizeof (double), sizeof (double));
+    }
+    return true;
+}
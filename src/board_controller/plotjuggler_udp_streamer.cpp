@@ -78,6 +78,11 @@ void PlotJugglerUDPStreamer::stream_data (double *data)
     db->add_data (data);
 }
 
+uint64_t PlotJugglerUDPStreamer::get_num_dropped ()
+{
+    return (db == NULL) ? 0 : db->get_num_overwritten ();
+}
+
 void PlotJugglerUDPStreamer::thread_worker ()
 {
     double *transaction = new double[len];
@@ -0,0 +1,196 @@
+#include <new>
+#include <string.h>
+
+#ifndef _WIN32
+#include <errno.h>
+#include <fcntl.h>
+#include <signal.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+#include "board.h"
+#include "brainflow_constants.h"
+#include "shared_memory_streamer.h"
+
+
+SharedMemoryStreamer::SharedMemoryStreamer (const char *name, int capacity, int data_len)
+    : Streamer (data_len, "shm", name, std::to_string (capacity))
+{
+    this->name = name;
+    this->capacity = (size_t)capacity;
+    region_size = BRAINFLOW_SHM_HEADER_SIZE + this->capacity * data_len * sizeof (double);
+    header = NULL;
+    samples = NULL;
+#ifdef _WIN32
+    map_handle = NULL;
+#else
+    fd = -1;
+#endif
+}
+
+SharedMemoryStreamer::~SharedMemoryStreamer ()
+{
+    free_region ();
+}
+
+int SharedMemoryStreamer::init_streamer ()
+{
+    if (header != NULL)
+    {
+        Board::board_logger->error ("shared memory streamer is running");
+        return (int)BrainFlowExitCodes::GENERAL_ERROR;
+    }
+    if ((name.empty ()) || (name.find ('/') != std::string::npos) || (capacity == 0))
+    {
+        Board::board_logger->error (
+            "invalid shared memory name or size, format is shm://name:size");
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+
+    void *region = NULL;
+#if defined(_WIN32)
+    map_handle = CreateFileMappingA (INVALID_HANDLE_VALUE, NULL, PAGE_READWRITE,
+        (DWORD)((uint64_t)region_size >> 32), (DWORD)(region_size & 0xFFFFFFFF), name.c_str ());
+    if (map_handle == NULL)
+    {
+        Board::board_logger->error ("failed to create file mapping {}", name.c_str ());
+        return (int)BrainFlowExitCodes::GENERAL_ERROR;
+    }
+    // mapping is removed with its last handle, so existing one always belongs to live process
+    if (GetLastError () == ERROR_ALREADY_EXISTS)
+    {
+        Board::board_logger->error (
+            "shared memory {} is used by another process, choose another name", name.c_str ());
+        CloseHandle (map_handle);
+        map_handle = NULL;
+        return (int)BrainFlowExitCodes::GENERAL_ERROR;
+    }
+    region = MapViewOfFile (map_handle, FILE_MAP_ALL_ACCESS, 0, 0, region_size);
+#elif defined(__ANDROID__)
+    Board::board_logger->error ("shared memory streamer is not supported on Android");
+    return (int)BrainFlowExitCodes::UNSUPPORTED_BOARD_ERROR;
+#else
+    std::string shm_name = "/" + name;
+    // never attach to existing region: its writer would corrupt our samples and vice versa
+    fd = shm_open (shm_name.c_str (), O_CREAT | O_EXCL | O_RDWR, 0600);
+    if ((fd < 0) && (errno == EEXIST) && (is_stale_region ()))
+    {
+        Board::board_logger->warn (
+            "removing shared memory {} left by finished process", shm_name.c_str ());
+        shm_unlink (shm_name.c_str ());
+        fd = shm_open (shm_name.c_str (), O_CREAT | O_EXCL | O_RDWR, 0600);
+    }
+    if (fd < 0)
+    {
+        if (errno == EEXIST)
+        {
+            Board::board_logger->error (
+                "shared memory {} is used by another process, choose another name",
+                shm_name.c_str ());
+        }
+        else
+        {
+            Board::board_logger->error ("failed to open shared memory {}", shm_name.c_str ());
+        }
+        return (int)BrainFlowExitCodes::GENERAL_ERROR;
+    }
+    if (ftruncate (fd, (off_t)region_size) != 0)
+    {
+        Board::board_logger->error ("failed to resize shared memory to {} bytes", region_size);
+        free_region ();
+        return (int)BrainFlowExitCodes::GENERAL_ERROR;
+    }
+    region = mmap (NULL, region_size, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    if (region == MAP_FAILED)
+    {
+        region = NULL;
+    }
+#endif
+    if (region == NULL)
+    {
+        Board::board_logger->error ("failed to map shared memory");
+        free_region ();
+        return (int)BrainFlowExitCodes::GENERAL_ERROR;
+    }
+
+    // readers check magic last, so they never see half initialized header
+    header = new (region) SharedMemoryHeader;
+    header->magic = 0;
+    header->num_rows = (uint64_t)len;
+    header->capacity = (uint64_t)capacity;
+    header->write_seq.store (0, std::memory_order_relaxed);
+#ifdef _WIN32
+    header->writer_pid = (uint64_t)GetCurrentProcessId ();
+#else
+    header->writer_pid = (uint64_t)getpid ();
+#endif
+    samples = (double *)((char *)region + BRAINFLOW_SHM_HEADER_SIZE);
+    std::atomic_thread_fence (std::memory_order_release);
+    header->magic = BRAINFLOW_SHM_MAGIC;
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+void SharedMemoryStreamer::stream_data (double *data)
+{
+    uint64_t seq = header->write_seq.load (std::memory_order_relaxed);
+    memcpy (samples + (size_t)(seq % capacity) * len, data, sizeof (double) * len);
+    header->write_seq.store (seq + 1, std::memory_order_release);
+}
+
+#if !defined(_WIN32) && !defined(__ANDROID__)
+bool SharedMemoryStreamer::is_stale_region ()
+{
+    int old_fd = shm_open (("/" + name).c_str (), O_RDONLY, 0);
+    if (old_fd < 0)
+    {
+        return false;
+    }
+    bool is_stale = false;
+    struct stat st;
+    if ((fstat (old_fd, &st) == 0) && (st.st_size >= BRAINFLOW_SHM_HEADER_SIZE))
+    {
+        void *region = mmap (NULL, BRAINFLOW_SHM_HEADER_SIZE, PROT_READ, MAP_SHARED, old_fd, 0);
+        if (region != MAP_FAILED)
+        {
+            SharedMemoryHeader *old_header = (SharedMemoryHeader *)region;
+            // region without magic may be initialized right now, keep it
+            is_stale = (old_header->magic == BRAINFLOW_SHM_MAGIC) && (old_header->writer_pid > 0) &&
+                (kill ((pid_t)old_header->writer_pid, 0) != 0) && (errno == ESRCH);
+            munmap (region, BRAINFLOW_SHM_HEADER_SIZE);
+        }
+    }
+    close (old_fd);
+    return is_stale;
+}
+#endif
+
+void SharedMemoryStreamer::free_region ()
+{
+#ifdef _WIN32
+    if (header != NULL)
+    {
+        UnmapViewOfFile (header);
+    }
+    if (map_handle != NULL)
+    {
+        CloseHandle (map_handle);
+        map_handle = NULL;
+    }
+#elif !defined(__ANDROID__)
+    if (header != NULL)
+    {
+        munmap (header, region_size);
+    }
+    if (fd >= 0)
+    {
+        close (fd);
+        fd = -1;
+        // readers which already mapped the region keep it until they unmap it
+        shm_unlink (("/" + name).c_str ());
+    }
+#endif
+    header = NULL;
+    samples = NULL;
+}
@@ -28,6 +28,7 @@ endif (CMAKE_SIZEOF_VOID_P EQUAL 8)
 
 SET (DATA_HANDLER_SRC
     ${CMAKE_CURRENT_SOURCE_DIR}/src/data_handler/data_handler.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/data_handler/delimited_file_reader.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/data_handler/fastica.cpp
 )
 
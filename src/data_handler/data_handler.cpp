@@ -1,7 +1,6 @@
 #include <algorithm>
 #include <math.h>
 #include <mutex>
-#include <sstream>
 #include <stdexcept>
 #include <stdint.h>
 #include <stdio.h>
@@ -14,6 +13,7 @@
 #include "brainflow_version.h"
 #include "common_data_handler_helpers.h"
 #include "data_handler.h"
+#include "delimited_file_reader.h"
 #include "downsample_operators.h"
 #include "rolling_filter.h"
 #include "wavelet_helpers.h"
@@ -1015,84 +1015,18 @@ int read_file (double *data, int *num_rows, int *num_cols, const char *file_name
         data_logger->error ("Nummber or elements must be greater than 0.");
         return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
     }
-    FILE *fp;
-    fp = fopen (file_name, "r");
-    if (fp == NULL)
-    {
-        data_logger->error ("Couldn't read file {}", file_name);
-        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
-    }
-
-    char buf[4096];
     // rows and cols in tsv file, in data array its transposed!
     int total_rows = 0;
     int total_cols = 0;
-
-    // count rows
-    char c;
-    for (c = getc (fp); !feof (fp); c = getc (fp))
-    {
-        if (c == '\n')
-        {
-            total_rows++;
-        }
-    }
-
-    fseek (fp, 0, SEEK_SET);
-    int current_row = 0;
-    int cur_pos = 0;
-    while (fgets (buf, sizeof (buf), fp) != NULL)
+    DelimitedFileReader reader;
+    int res = reader.read (file_name, data, (size_t)num_elements, &total_rows, &total_cols);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
     {
-        std::string tsv_string (buf);
-        std::stringstream ss (tsv_string);
-        std::vector<std::string> splitted;
-        std::string tmp;
-        char sep = '\t';
-        if (tsv_string.find ('\t') == std::string::npos)
-        {
-            sep = ',';
-        }
-        while (std::getline (ss, tmp, sep))
-        {
-            if (tmp != "\n")
-            {
-                splitted.push_back (tmp);
-            }
-        }
-        if ((total_cols != 0) && (total_cols != (int)splitted.size ()))
-        {
-            data_logger->error ("some rows have more cols than others, invalid input file");
-            fclose (fp);
-            return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
-        }
-        total_cols = (int)splitted.size ();
-        for (int i = 0; i < total_cols; i++)
-        {
-            try
-            {
-                data[i * total_rows + current_row] = std::stod (splitted[i]);
-            }
-            catch (const std::invalid_argument &)
-            {
-                fclose (fp);
-                data_logger->error ("found not a number in data file");
-                return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
-            }
-            if (cur_pos == (num_elements - 1))
-            {
-                *num_cols = current_row + 1;
-                *num_rows = total_cols;
-                fclose (fp);
-                return (int)BrainFlowExitCodes::STATUS_OK;
-            }
-            cur_pos++;
-        }
-        current_row++;
+        data_logger->error ("Couldn't read file {}: {}", file_name, reader.get_error ());
+        return res;
     }
-    // more likely code below is unreachable
     *num_cols = total_rows;
     *num_rows = total_cols;
-    fclose (fp);
     return (int)BrainFlowExitCodes::STATUS_OK;
 }
 
@@ -1120,61 +1054,55 @@ int calc_stddev (double *data, int start_pos, int end_pos, double *output)
 
 int get_num_elements_in_file (const char *file_name, int *num_elements)
 {
-    FILE *fp;
-    fp = fopen (file_name, "r");
-    if (fp == NULL)
+    int total_rows = 0;
+    int total_cols = 0;
+    DelimitedFileReader reader;
+    int res = reader.get_shape (file_name, &total_rows, &total_cols);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
     {
-        data_logger->error ("Couldn't read file {}", file_name);
-        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+        *num_elements = 0;
+        data_logger->error ("Couldn't read file {}: {}", file_name, reader.get_error ());
+        return res;
     }
+    *num_elements = total_rows * total_cols;
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
 
-    char buf[4096];
-    int total_rows = 0;
-
-    // count rows
-    char c;
-    for (c = getc (fp); !feof (fp); c = getc (fp))
+int get_num_rows_in_file (const char *file_name, int *num_rows)
+{
+    DelimitedFileReader reader;
+    int res = reader.get_num_values (file_name, num_rows);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
     {
-        if (c == '\n')
-        {
-            total_rows++;
-        }
+        data_logger->error ("Couldn't read file {}: {}", file_name, reader.get_error ());
     }
-    if (total_rows == 0)
+    return res;
+}
+
+int read_file_chunk (double *data, int *num_rows, int *num_cols, const char *file_name,
+    int num_elements, long long offset, long long *next_offset)
+{
+    if ((data == NULL) || (num_rows == NULL) || (num_cols == NULL) || (next_offset == NULL) ||
+        (num_elements <= 0) || (offset < 0))
     {
-        *num_elements = 0;
-        fclose (fp);
-        data_logger->error ("Empty file {}", file_name);
-        return (int)BrainFlowExitCodes::EMPTY_BUFFER_ERROR;
+        data_logger->error ("Invalid arguments for read_file_chunk.");
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
     }
-
-    fseek (fp, 0, SEEK_SET);
-    while (fgets (buf, sizeof (buf), fp) != NULL)
+    // rows and cols in tsv file, in data array its transposed!
+    int total_rows = 0;
+    int total_cols = 0;
+    DelimitedFileReader reader;
+    int res = reader.read_chunk (
+        file_name, offset, data, (size_t)num_elements, &total_rows, &total_cols, next_offset);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
     {
-        std::string tsv_string (buf);
-        std::stringstream ss (tsv_string);
-        std::vector<std::string> splitted;
-        std::string tmp;
-        char sep = '\t';
-        if (tsv_string.find ('\t') == std::string::npos)
-        {
-            sep = ',';
-        }
-        while (std::getline (ss, tmp, sep))
-        {
-            if (tmp != "\n")
-            {
-                splitted.push_back (tmp);
-            }
-        }
-        *num_elements = (int)splitted.size () * total_rows;
-        fclose (fp);
-        return (int)BrainFlowExitCodes::STATUS_OK;
+        data_logger->error (
+            "Couldn't read file {} at offset {}: {}", file_name, offset, reader.get_error ());
+        return res;
     }
-    *num_elements = 0;
-    fclose (fp);
-    data_logger->error ("File contents", file_name);
-    return (int)BrainFlowExitCodes::EMPTY_BUFFER_ERROR;
+    *num_cols = total_rows;
+    *num_rows = total_cols;
+    return (int)BrainFlowExitCodes::STATUS_OK;
 }
 
 int detrend (double *data, int data_len, int detrend_operation)
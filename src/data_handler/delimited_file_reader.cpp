@@ -0,0 +1,571 @@
+#include <algorithm>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <thread>
+#include <vector>
+
+#include "brainflow_constants.h"
+#include "delimited_file_reader.h"
+#include "mapped_file.h"
+
+// smaller files are not worth starting threads
+#define DELIMITED_FILE_READER_MIN_CHUNK_SIZE (1 << 20)
+#define DELIMITED_FILE_READER_MAX_THREADS 16
+#define DELIMITED_FILE_READER_BLOCK_SIZE 65536
+
+
+namespace
+{
+    struct FileLayout
+    {
+        // lines in [0, body_size) end with '\n', last line without new line is copied to tail
+        // because number parser reads digits until it finds a terminator
+        size_t body_size;
+        std::string tail;
+        bool has_tail_line;
+        char sep;
+        int num_values;
+        std::vector<size_t> chunk_bounds;
+        std::vector<size_t> chunk_lines;
+        size_t total_lines;
+    };
+
+    // reads lines from file starting at offset, only current block and incomplete line after it are
+    // kept in memory
+    class LineStream
+    {
+    public:
+        LineStream (FILE *fp, long long offset)
+        {
+            this->fp = fp;
+            buffer_offset = offset;
+            pos = 0;
+            eof = false;
+            buffer.push_back ('\0');
+        }
+
+        // returns false at the end of file, line is followed by '\n' or '\0' so strtod stops there
+        bool next_line (const char **begin, const char **end)
+        {
+            while (true)
+            {
+                size_t len = buffer.size () - 1;
+                const char *line_end = (const char *)memchr (&buffer[pos], '\n', len - pos);
+                if ((line_end == NULL) && (eof))
+                {
+                    if (pos == len)
+                    {
+                        return false;
+                    }
+                    line_end = &buffer[len];
+                }
+                if (line_end != NULL)
+                {
+                    *begin = &buffer[pos];
+                    *end = line_end;
+                    pos = std::min ((size_t)(line_end - &buffer[0]) + 1, len);
+                    return true;
+                }
+                // drop processed lines and read next block
+                buffer.erase (buffer.begin (), buffer.begin () + pos);
+                buffer_offset += pos;
+                pos = 0;
+                len = buffer.size () - 1;
+                buffer.resize (len + DELIMITED_FILE_READER_BLOCK_SIZE + 1);
+                size_t num_read = fread (&buffer[len], 1, DELIMITED_FILE_READER_BLOCK_SIZE, fp);
+                eof = (num_read < DELIMITED_FILE_READER_BLOCK_SIZE);
+                buffer.resize (len + num_read + 1);
+                buffer[len + num_read] = '\0';
+            }
+        }
+
+        // offset of the first byte after returned lines
+        long long get_offset () const
+        {
+            return buffer_offset + (long long)pos;
+        }
+
+    private:
+        FILE *fp;
+        std::vector<char> buffer;
+        long long buffer_offset;
+        size_t pos;
+        bool eof;
+    };
+}
+
+static FILE *open_at (const char *file_name, long long offset)
+{
+    FILE *fp = fopen (file_name, "rb");
+    if (fp == NULL)
+    {
+        return NULL;
+    }
+#ifdef _WIN32
+    int res = _fseeki64 (fp, offset, SEEK_SET);
+#else
+    int res = fseeko (fp, (off_t)offset, SEEK_SET);
+#endif
+    if (res != 0)
+    {
+        fclose (fp);
+        return NULL;
+    }
+    return fp;
+}
+
+static inline bool is_space (char c)
+{
+    return (c == ' ') || (c == '\t') || (c == '\r') || (c == '\n') || (c == '\v') || (c == '\f');
+}
+
+static bool is_blank (const char *begin, const char *end)
+{
+    for (const char *p = begin; p < end; p++)
+    {
+        if (!is_space (*p))
+        {
+            return false;
+        }
+    }
+    return true;
+}
+
+static inline const char *find_line_end (const char *begin, const char *end)
+{
+    const char *line_end = (const char *)memchr (begin, '\n', end - begin);
+    return (line_end == NULL) ? end : line_end;
+}
+
+static size_t count_lines (const char *begin, const char *end)
+{
+    size_t num_lines = 0;
+    for (const char *p = begin; p < end;)
+    {
+        const char *line_end = find_line_end (p, end);
+        if (!is_blank (p, line_end))
+        {
+            num_lines++;
+        }
+        p = line_end + 1;
+    }
+    return num_lines;
+}
+
+// separator after the last value is allowed
+static int count_values (const char *begin, const char *end, char sep)
+{
+    int num_values = 1;
+    const char *last_sep = NULL;
+    for (const char *p = begin; p < end; p++)
+    {
+        if (*p == sep)
+        {
+            num_values++;
+            last_sep = p;
+        }
+    }
+    if ((last_sep != NULL) && (is_blank (last_sep + 1, end)))
+    {
+        num_values--;
+    }
+    return num_values;
+}
+
+// plain decimals like written by write_file are parsed without strtod: if mantissa has at most 15
+// digits and there are at most 22 fractional digits both mantissa and power of ten are exact
+// doubles, so single division is correctly rounded and result is the same as from strtod.
+// Everything else (exponent, nan, inf, long numbers, leading whitespace) goes to strtod, it gets
+// a terminated copy of [p, end) because it skips whitespace and new lines without any bound
+static const char *parse_value (const char *p, const char *end, double *value)
+{
+    static const double powers_of_ten[] = {1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10,
+        1e11, 1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22};
+    const char *start = p;
+    bool negative = false;
+    if ((*p == '-') || (*p == '+'))
+    {
+        negative = (*p == '-');
+        p++;
+    }
+    uint64_t mantissa = 0;
+    int num_digits = 0; // leading zeros are not counted
+    int num_int_digits = 0;
+    int num_frac_digits = 0;
+    while ((*p >= '0') && (*p <= '9'))
+    {
+        mantissa = mantissa * 10 + (uint64_t)(*p - '0');
+        num_digits += (mantissa != 0) ? 1 : 0;
+        num_int_digits++;
+        p++;
+    }
+    if (*p == '.')
+    {
+        p++;
+        while ((*p >= '0') && (*p <= '9'))
+        {
+            mantissa = mantissa * 10 + (uint64_t)(*p - '0');
+            num_digits += (mantissa != 0) ? 1 : 0;
+            num_frac_digits++;
+            p++;
+        }
+    }
+    if ((num_int_digits + num_frac_digits == 0) || (num_digits > 15) || (num_frac_digits > 22) ||
+        (*p == 'e') || (*p == 'E') || (*p == 'x') || (*p == 'X'))
+    {
+        size_t len = (size_t)(end - start);
+        char buf[64];
+        std::string long_token;
+        const char *token = buf;
+        if (len < sizeof (buf))
+        {
+            memcpy (buf, start, len);
+            buf[len] = '\0';
+        }
+        else
+        {
+            long_token.assign (start, len);
+            token = long_token.c_str ();
+        }
+        char *value_end = NULL;
+        *value = strtod (token, &value_end);
+        return start + (value_end - token);
+    }
+    double res = (double)mantissa / powers_of_ten[num_frac_digits];
+    *value = negative ? -res : res;
+    return p;
+}
+
+// like std::stod, text after a number and before separator is ignored
+static int parse_line (const char *p, const char *end, char sep, int num_values, double *output,
+    size_t stride, std::string &error)
+{
+    for (int i = 0; i < num_values; i++)
+    {
+        // strtod skips leading whitespace including new lines, empty value must be checked here
+        if ((p >= end) || (*p == sep) || (*p == '\n') || (*p == '\r'))
+        {
+            error = "some rows have less cols than others, invalid input file";
+            return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+        }
+        const char *next = (const char *)memchr (p, sep, end - p);
+        double value = 0.0;
+        const char *value_end = parse_value (p, (next != NULL) ? next : end, &value);
+        if (value_end == p)
+        {
+            error = "found not a number in data file";
+            return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+        }
+        output[i * stride] = value;
+        if (i < num_values - 1)
+        {
+            if (next == NULL)
+            {
+                error = "some rows have less cols than others, invalid input file";
+                return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+            }
+            p = next + 1;
+        }
+        else if ((next != NULL) && (!is_blank (next + 1, end)))
+        {
+            error = "some rows have more cols than others, invalid input file";
+            return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+        }
+    }
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+// parses lines of a chunk while line index is less than num_lines
+static int parse_lines (const char *begin, const char *end, char sep, int num_values,
+    double *output, size_t first_line, size_t num_lines, std::string &error)
+{
+    size_t line = first_line;
+    for (const char *p = begin; (p < end) && (line < num_lines);)
+    {
+        const char *line_end = find_line_end (p, end);
+        if (!is_blank (p, line_end))
+        {
+            int res = parse_line (p, line_end, sep, num_values, output + line, num_lines, error);
+            if (res != (int)BrainFlowExitCodes::STATUS_OK)
+            {
+                return res;
+            }
+            line++;
+        }
+        p = line_end + 1;
+    }
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+// calls task (i) for each i in [0, num_tasks), task 0 runs in calling thread
+template <typename Task>
+static void run_parallel (size_t num_tasks, Task task)
+{
+    std::vector<std::thread> threads;
+    for (size_t i = 1; i < num_tasks; i++)
+    {
+        threads.push_back (std::thread (task, i));
+    }
+    task (0);
+    for (size_t i = 0; i < threads.size (); i++)
+    {
+        threads[i].join ();
+    }
+}
+
+static int prepare_layout (
+    const MappedFile &file, int max_threads, FileLayout &layout, std::string &error)
+{
+    const char *data = file.get_data ();
+    size_t size = file.get_size ();
+
+    layout.body_size = size;
+    while ((layout.body_size > 0) && (data[layout.body_size - 1] != '\n'))
+    {
+        layout.body_size--;
+    }
+    layout.tail.assign (data + layout.body_size, size - layout.body_size);
+    layout.has_tail_line =
+        !is_blank (layout.tail.data (), layout.tail.data () + layout.tail.size ());
+
+    // first non blank line defines separator and number of cols
+    const char *first_line = NULL;
+    const char *first_line_end = NULL;
+    for (const char *p = data; p < data + size;)
+    {
+        const char *line_end = find_line_end (p, data + size);
+        if (!is_blank (p, line_end))
+        {
+            first_line = p;
+            first_line_end = line_end;
+            break;
+        }
+        p = line_end + 1;
+    }
+    if (first_line == NULL)
+    {
+        error = "empty file";
+        return (int)BrainFlowExitCodes::EMPTY_BUFFER_ERROR;
+    }
+    layout.sep = (memchr (first_line, '\t', first_line_end - first_line) != NULL) ? '\t' : ',';
+    layout.num_values = count_values (first_line, first_line_end, layout.sep);
+
+    size_t num_chunks = layout.body_size / DELIMITED_FILE_READER_MIN_CHUNK_SIZE + 1;
+    num_chunks = std::min (num_chunks, (size_t)max_threads);
+    layout.chunk_bounds.clear ();
+    layout.chunk_bounds.push_back (0);
+    for (size_t i = 1; i < num_chunks; i++)
+    {
+        size_t pos = layout.body_size * i / num_chunks;
+        if (pos <= layout.chunk_bounds.back ())
+        {
+            continue;
+        }
+        // body ends with new line so it is always found
+        const char *line_end = find_line_end (data + pos, data + layout.body_size);
+        size_t bound = line_end - data + 1;
+        if (bound < layout.body_size)
+        {
+            layout.chunk_bounds.push_back (bound);
+        }
+    }
+    layout.chunk_bounds.push_back (layout.body_size);
+
+    num_chunks = layout.chunk_bounds.size () - 1;
+    layout.chunk_lines.assign (num_chunks, 0);
+    run_parallel (num_chunks,
+        [&] (size_t i)
+        {
+            layout.chunk_lines[i] =
+                count_lines (data + layout.chunk_bounds[i], data + layout.chunk_bounds[i + 1]);
+        });
+    layout.total_lines = layout.has_tail_line ? 1 : 0;
+    for (size_t i = 0; i < num_chunks; i++)
+    {
+        layout.total_lines += layout.chunk_lines[i];
+    }
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+
+DelimitedFileReader::DelimitedFileReader (int max_threads)
+{
+    if (max_threads <= 0)
+    {
+        max_threads = (int)std::thread::hardware_concurrency ();
+    }
+    this->max_threads = std::max (1, std::min (max_threads, DELIMITED_FILE_READER_MAX_THREADS));
+}
+
+int DelimitedFileReader::get_shape (const char *file_name, int *num_lines, int *num_values)
+{
+    error.clear ();
+    MappedFile file;
+    if (!file.open (file_name))
+    {
+        error = "couldn't read file";
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    FileLayout layout;
+    int res = prepare_layout (file, max_threads, layout, error);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return res;
+    }
+    *num_lines = (int)layout.total_lines;
+    *num_values = layout.num_values;
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+int DelimitedFileReader::read (
+    const char *file_name, double *data, size_t max_values, int *num_lines, int *num_values)
+{
+    error.clear ();
+    MappedFile file;
+    if (!file.open (file_name))
+    {
+        error = "couldn't read file";
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    FileLayout layout;
+    int res = prepare_layout (file, max_threads, layout, error);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return res;
+    }
+    size_t output_lines = std::min (layout.total_lines, max_values / layout.num_values);
+    if (output_lines == 0)
+    {
+        error = "output buffer is too small";
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+
+    size_t num_chunks = layout.chunk_lines.size ();
+    std::vector<size_t> first_lines (num_chunks, 0);
+    for (size_t i = 1; i < num_chunks; i++)
+    {
+        first_lines[i] = first_lines[i - 1] + layout.chunk_lines[i - 1];
+    }
+    std::vector<int> results (num_chunks, (int)BrainFlowExitCodes::STATUS_OK);
+    std::vector<std::string> errors (num_chunks);
+    const char *file_data = file.get_data ();
+    run_parallel (num_chunks,
+        [&] (size_t i)
+        {
+            results[i] = parse_lines (file_data + layout.chunk_bounds[i],
+                file_data + layout.chunk_bounds[i + 1], layout.sep, layout.num_values, data,
+                first_lines[i], output_lines, errors[i]);
+        });
+    for (size_t i = 0; i < num_chunks; i++)
+    {
+        if (results[i] != (int)BrainFlowExitCodes::STATUS_OK)
+        {
+            error = errors[i];
+            return results[i];
+        }
+    }
+    if ((layout.has_tail_line) && (layout.total_lines <= output_lines))
+    {
+        const char *tail = layout.tail.c_str ();
+        res = parse_lines (tail, tail + layout.tail.size (), layout.sep, layout.num_values, data,
+            layout.total_lines - 1, output_lines, error);
+        if (res != (int)BrainFlowExitCodes::STATUS_OK)
+        {
+            return res;
+        }
+    }
+
+    *num_lines = (int)output_lines;
+    *num_values = layout.num_values;
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
+
+int DelimitedFileReader::get_num_values (const char *file_name, int *num_values)
+{
+    error.clear ();
+    FILE *fp = open_at (file_name, 0);
+    if (fp == NULL)
+    {
+        error = "couldn't read file";
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    LineStream stream (fp, 0);
+    const char *begin = NULL;
+    const char *end = NULL;
+    int res = (int)BrainFlowExitCodes::STATUS_OK;
+    bool found = false;
+    while ((!found) && (stream.next_line (&begin, &end)))
+    {
+        found = !is_blank (begin, end);
+    }
+    if (found)
+    {
+        char sep = (memchr (begin, '\t', end - begin) != NULL) ? '\t' : ',';
+        *num_values = count_values (begin, end, sep);
+    }
+    else
+    {
+        error = "empty file";
+        res = (int)BrainFlowExitCodes::EMPTY_BUFFER_ERROR;
+    }
+    fclose (fp);
+    return res;
+}
+
+int DelimitedFileReader::read_chunk (const char *file_name, long long offset, double *data,
+    size_t max_values, int *num_lines, int *num_values, long long *next_offset)
+{
+    error.clear ();
+    FILE *fp = open_at (file_name, offset);
+    if (fp == NULL)
+    {
+        error = "couldn't read file";
+        return (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+    }
+    LineStream stream (fp, offset);
+    const char *begin = NULL;
+    const char *end = NULL;
+    char sep = '\t';
+    int line_values = 0;
+    size_t max_lines = 0;
+    size_t line = 0;
+    int res = (int)BrainFlowExitCodes::STATUS_OK;
+    while ((res == (int)BrainFlowExitCodes::STATUS_OK) &&
+        ((line < max_lines) || (max_lines == 0)) && (stream.next_line (&begin, &end)))
+    {
+        if (is_blank (begin, end))
+        {
+            continue;
+        }
+        if (max_lines == 0)
+        {
+            sep = (memchr (begin, '\t', end - begin) != NULL) ? '\t' : ',';
+            line_values = count_values (begin, end, sep);
+            max_lines = max_values / line_values;
+            if (max_lines == 0)
+            {
+                error = "output buffer is too small";
+                res = (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR;
+                break;
+            }
+        }
+        res = parse_line (begin, end, sep, line_values, data + line, max_lines, error);
+        line++;
+    }
+    *next_offset = stream.get_offset ();
+    fclose (fp);
+    if (res != (int)BrainFlowExitCodes::STATUS_OK)
+    {
+        return res;
+    }
+    // values were stored with stride max_lines, make output dense if chunk is not full
+    for (int i = 1; (line < max_lines) && (i < line_values); i++)
+    {
+        memmove (data + i * line, data + i * max_lines, line * sizeof (double));
+    }
+    *num_lines = (int)line;
+    *num_values = line_values;
+    return (int)BrainFlowExitCodes::STATUS_OK;
+}
@@ -83,6 +83,12 @@ extern "C"
     SHARED_EXPORT int CALLING_CONVENTION get_num_elements_in_file (
         const char *file_name, int *num_elements); // its an internal method for bindings its not
                                                    // available via high level api
+    // chunked reading with bounded memory, returns num_cols == 0 at the end of file
+    SHARED_EXPORT int CALLING_CONVENTION read_file_chunk (double *data, int *num_rows,
+        int *num_cols, const char *file_name, int num_elements, long long offset,
+        long long *next_offset);
+    SHARED_EXPORT int CALLING_CONVENTION get_num_rows_in_file (const char *file_name,
+        int *num_rows); // its an internal method for bindings its not available via high level api
 
     // platform types and methods
     SHARED_EXPORT int CALLING_CONVENTION get_version_data_handler (
@@ -0,0 +1,40 @@
+#pragma once
+
+#include <stddef.h>
+#include <string>
+
+
+// Reader for tsv/csv files created by write_file and file streamer. File is memory mapped, split
+// into chunks at line boundaries and chunks are processed by several threads: first lines are
+// counted with memchr to get offset of each chunk in output, after that each thread parses its
+// chunk with strtod directly to the output array. Blank lines are skipped, separator is tab or
+// comma if first line has no tabs.
+class DelimitedFileReader
+{
+public:
+    DelimitedFileReader (int max_threads = 0);
+
+    // number of non blank lines and number of values in the first line
+    int get_shape (const char *file_name, int *num_lines, int *num_values);
+    // parses first max_values / num_values lines, value j from line i goes to
+    // data[j * num_lines + i], data must have space for max_values elements
+    int read (
+        const char *file_name, double *data, size_t max_values, int *num_lines, int *num_values);
+    // number of values in the first non blank line, file is not mapped and only its beginning is
+    // read
+    int get_num_values (const char *file_name, int *num_values);
+    // streaming version of read for files which dont fit in memory, parses lines starting at byte
+    // offset with the same layout as read, next_offset points to the first unparsed line.
+    // Reaching the end of file is not an error, in this case num_lines is 0
+    int read_chunk (const char *file_name, long long offset, double *data, size_t max_values,
+        int *num_lines, int *num_values, long long *next_offset);
+
+    const std::string &get_error () const
+    {
+        return error;
+    }
+
+private:
+    int max_threads;
+    std::string error;
+};
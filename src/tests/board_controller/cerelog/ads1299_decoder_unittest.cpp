@@ -0,0 +1,74 @@
+#include <gmock/gmock.h>
+
+#include "ads1299_decoder.h"
+
+using namespace testing;
+
+
+namespace
+{
+    void put_sample (unsigned char *frame, int channel, int32_t value)
+    {
+        unsigned char *raw = frame + ADS1299_STATUS_BYTES + channel * ADS1299_BYTES_PER_CHANNEL;
+        raw[0] = (unsigned char)((value >> 16) & 0xFF);
+        raw[1] = (unsigned char)((value >> 8) & 0xFF);
+        raw[2] = (unsigned char)(value & 0xFF);
+    }
+}
+
+TEST (ADS1299DecoderTest, Decode_PositiveAndNegativeFullScale_SignExtendAndScale)
+{
+    unsigned char frame[27] = {0};
+    put_sample (frame, 0, 0x7FFFFF);
+    put_sample (frame, 1, -0x800000);
+    put_sample (frame, 2, -1);
+    put_sample (frame, 3, 1);
+    const unsigned char *frames[1] = {frame};
+    double package[8];
+
+    ADS1299Decoder decoder;
+    decoder.decode (frames, 1, package);
+
+    double scale = ADS1299Decoder::get_scale (4.5, 24);
+    EXPECT_DOUBLE_EQ (package[0], 0x7FFFFF * scale);
+    EXPECT_DOUBLE_EQ (package[1], -0x800000 * scale);
+    EXPECT_DOUBLE_EQ (package[2], -scale);
+    EXPECT_DOUBLE_EQ (package[3], scale);
+    EXPECT_DOUBLE_EQ (package[4], 0.0);
+}
+
+TEST (ADS1299DecoderTest, Decode_MultipleFramesWithLayout_WriteOnlyEegRows)
+{
+    unsigned char first[27] = {0};
+    unsigned char second[27] = {0};
+    for (int ch = 0; ch < ADS1299_NUM_CHANNELS; ch++)
+    {
+        put_sample (first, ch, ch + 1);
+        put_sample (second, ch, -(ch + 1));
+    }
+    const unsigned char *frames[2] = {first, second};
+    int rows[ADS1299_NUM_CHANNELS] = {1, 2, 3, 4, 5, 6, 7, 8};
+    double packages[20];
+    for (int i = 0; i < 20; i++)
+    {
+        packages[i] = -100.0;
+    }
+
+    ADS1299Decoder decoder;
+    decoder.set_layout (rows, 10);
+    decoder.set_scale (7, 1.0);
+    decoder.decode (frames, 2, packages);
+
+    double scale = decoder.get_scale (0);
+    for (int i = 0; i < 2; i++)
+    {
+        double sign = (i == 0) ? 1.0 : -1.0;
+        EXPECT_EQ (packages[i * 10], -100.0);
+        EXPECT_EQ (packages[i * 10 + 9], -100.0);
+        for (int ch = 0; ch < 7; ch++)
+        {
+            EXPECT_DOUBLE_EQ (packages[i * 10 + rows[ch]], sign * (ch + 1) * scale);
+        }
+        EXPECT_DOUBLE_EQ (packages[i * 10 + 8], sign * 8.0);
+    }
+}
@@ -0,0 +1,125 @@
+#include <gmock/gmock.h>
+#include <random>
+#include <vector>
+
+#include "cerelog_clock_sync.h"
+
+using namespace testing;
+
+
+namespace
+{
+    const double SYNC_TEST_RATE = 500.0;
+    const uint32_t SYNC_TEST_START_SECONDS = 1700000000;
+    const double SYNC_TEST_START_TIME = 1700000000.25;
+
+    // feeds frames sample_from..sample_to (excluding) in reads of frames_per_read, board clock is
+    // in phase with host clock, read latency is uniform in [0, max_latency]
+    void run_sync (CerelogClockSync &sync, int sample_from, int sample_to, int frames_per_read,
+        double max_latency, std::vector<double> &sample_nums, std::vector<double> &timestamps)
+    {
+        std::mt19937 gen (42);
+        std::uniform_real_distribution<double> latency (0.0, max_latency);
+        std::vector<uint32_t> seconds (frames_per_read);
+        for (int first = sample_from; first < sample_to; first += frames_per_read)
+        {
+            int num_frames = std::min (frames_per_read, sample_to - first);
+            for (int i = 0; i < num_frames; i++)
+            {
+                seconds[i] =
+                    SYNC_TEST_START_SECONDS + (uint32_t)((first + i) / (int)SYNC_TEST_RATE);
+            }
+            double arrival =
+                SYNC_TEST_START_TIME + (first + num_frames - 1) / SYNC_TEST_RATE + latency (gen);
+            size_t offset = sample_nums.size ();
+            sample_nums.resize (offset + num_frames);
+            timestamps.resize (offset + num_frames);
+            sync.process (arrival, seconds.data (), num_frames, sample_nums.data () + offset,
+                timestamps.data () + offset);
+        }
+    }
+}
+
+TEST (CerelogClockSyncTest, Process_JitteryReads_SmoothMonotonicTimestamps)
+{
+    CerelogClockSync sync (SYNC_TEST_RATE);
+    std::vector<double> sample_nums;
+    std::vector<double> timestamps;
+
+    run_sync (sync, 0, 30000, 5, 0.004, sample_nums, timestamps);
+
+    EXPECT_EQ (sync.get_num_dropped (), 0);
+    for (size_t i = 1; i < timestamps.size (); i++)
+    {
+        ASSERT_GT (timestamps[i], timestamps[i - 1]);
+        EXPECT_EQ (sample_nums[i], sample_nums[i - 1] + 1);
+    }
+    // after warm up line is parallel to true sample times shifted by mean latency
+    for (size_t i = 10000; i < timestamps.size (); i++)
+    {
+        double expected = SYNC_TEST_START_TIME + i / SYNC_TEST_RATE;
+        ASSERT_NEAR (timestamps[i], expected, 0.001);
+        ASSERT_NEAR (timestamps[i] - timestamps[i - 1], 1.0 / SYNC_TEST_RATE, 5e-5);
+    }
+}
+
+TEST (CerelogClockSyncTest, Process_FramesLost_CountDroppedAndSkipSampleNums)
+{
+    CerelogClockSync sync (SYNC_TEST_RATE);
+    std::vector<double> sample_nums;
+    std::vector<double> timestamps;
+
+    run_sync (sync, 0, 2100, 10, 0.001, sample_nums, timestamps);
+    run_sync (sync, 2150, 4000, 10, 0.001, sample_nums, timestamps);
+
+    EXPECT_EQ (sync.get_num_dropped (), 50);
+    // loss is found at the next board second, frames from there on get right sample numbers
+    EXPECT_EQ (sample_nums.back (), 3999);
+    EXPECT_NEAR (timestamps.back (), SYNC_TEST_START_TIME + 3999 / SYNC_TEST_RATE, 0.002);
+}
+
+TEST (CerelogClockSyncTest, Process_BoardClockReset_DontReportDrops)
+{
+    CerelogClockSync sync (SYNC_TEST_RATE);
+    std::vector<double> sample_nums (10);
+    std::vector<double> timestamps (10);
+    std::vector<uint32_t> seconds (10, SYNC_TEST_START_SECONDS);
+
+    for (int i = 0; i < 200; i++)
+    {
+        seconds.assign (10, SYNC_TEST_START_SECONDS + i / 50);
+        sync.process (SYNC_TEST_START_TIME + i * 0.02, seconds.data (), 10, sample_nums.data (),
+            timestamps.data ());
+    }
+    seconds.assign (10, SYNC_TEST_START_SECONDS + 3600);
+    sync.process (
+        SYNC_TEST_START_TIME + 4.0, seconds.data (), 10, sample_nums.data (), timestamps.data ());
+    seconds.assign (10, SYNC_TEST_START_SECONDS + 3601);
+    sync.process (
+        SYNC_TEST_START_TIME + 4.02, seconds.data (), 10, sample_nums.data (), timestamps.data ());
+
+    EXPECT_EQ (sync.get_num_dropped (), 0);
+    EXPECT_EQ (sample_nums[9], 2019);
+}
+
+TEST (CerelogClockSyncTest, Process_BoardCounterStalls_PendingPointsBounded)
+{
+    CerelogClockSync sync (SYNC_TEST_RATE);
+    std::vector<double> sample_nums (1);
+    std::vector<double> timestamps (1);
+    std::vector<double> last_timestamps;
+
+    // two normal seconds to align, then counter stops for a minute of single frame reads
+    for (int i = 0; i < 31000; i++)
+    {
+        uint32_t seconds = SYNC_TEST_START_SECONDS + std::min (i, 1000) / (int)SYNC_TEST_RATE;
+        sync.process (SYNC_TEST_START_TIME + i / SYNC_TEST_RATE, &seconds, 1, sample_nums.data (),
+            timestamps.data ());
+        last_timestamps.push_back (timestamps[0]);
+    }
+
+    EXPECT_LE (sync.get_num_pending (), (size_t)4096);
+    EXPECT_EQ (sync.get_num_dropped (), 0);
+    EXPECT_NEAR (
+        last_timestamps.back () - last_timestamps[last_timestamps.size () - 501], 1.0, 0.002);
+}
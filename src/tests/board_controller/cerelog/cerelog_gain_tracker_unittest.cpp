@@ -0,0 +1,123 @@
+#include <gmock/gmock.h>
+#include <vector>
+
+#include "cerelog_gain_tracker.h"
+
+using namespace testing;
+
+
+TEST (CerelogGainTrackerTest, ApplyConfig_SingleChannel_ChangeOnlyThisChannel)
+{
+    CerelogGainTracker tracker;
+
+    EXPECT_EQ (tracker.apply_config ("gain3=6"), (int)CerelogCommandTypes::VALID_COMMAND);
+    EXPECT_EQ (tracker.get_gain_for_channel (2), 6);
+    EXPECT_EQ (tracker.get_gain_code_for_channel (2), 3);
+    EXPECT_TRUE (tracker.is_changed (2));
+    EXPECT_EQ (tracker.get_gain_for_channel (0), 24);
+    EXPECT_FALSE (tracker.is_changed (0));
+}
+
+TEST (CerelogGainTrackerTest, ApplyConfig_AllChannelsThenRevert_RestorePreviousGains)
+{
+    CerelogGainTracker tracker;
+    tracker.apply_config ("gain1=2");
+
+    EXPECT_EQ (tracker.apply_config ("gain=12"), (int)CerelogCommandTypes::VALID_COMMAND);
+    for (int ch = 0; ch < ADS1299_NUM_CHANNELS; ch++)
+    {
+        EXPECT_EQ (tracker.get_gain_for_channel (ch), 12);
+    }
+    tracker.revert_config ();
+    EXPECT_EQ (tracker.get_gain_for_channel (0), 2);
+    EXPECT_EQ (tracker.get_gain_for_channel (7), 24);
+}
+
+TEST (CerelogGainTrackerTest, ApplyConfig_BadCommands_KeepGains)
+{
+    CerelogGainTracker tracker;
+
+    EXPECT_EQ (
+        tracker.apply_config ("sampling_rate=1000"), (int)CerelogCommandTypes::NOT_GAIN_COMMAND);
+    EXPECT_EQ (tracker.apply_config ("gain=3"), (int)CerelogCommandTypes::INVALID_COMMAND);
+    EXPECT_EQ (tracker.apply_config ("gain9=4"), (int)CerelogCommandTypes::INVALID_COMMAND);
+    EXPECT_EQ (tracker.apply_config ("gain1=x"), (int)CerelogCommandTypes::INVALID_COMMAND);
+    EXPECT_EQ (tracker.apply_config ("gain"), (int)CerelogCommandTypes::INVALID_COMMAND);
+    for (int ch = 0; ch < ADS1299_NUM_CHANNELS; ch++)
+    {
+        EXPECT_EQ (tracker.get_gain_for_channel (ch), 24);
+    }
+}
+
+TEST (CerelogGainTrackerTest, WriteChangedGains_WriteFailsMidLoop_RestoreWrittenChannels)
+{
+    CerelogGainTracker tracker;
+    std::vector<int> chip_codes (ADS1299_NUM_CHANNELS, tracker.get_gain_code (24));
+    tracker.apply_config ("gain=4");
+
+    // serial fails on channel 3, channels 0-2 are already written to the chip
+    int res = tracker.write_changed_gains (
+        [&chip_codes] (int ch, int code)
+        {
+            if (ch == 3)
+            {
+                return (int)BrainFlowExitCodes::BOARD_WRITE_ERROR;
+            }
+            chip_codes[ch] = code;
+            return (int)BrainFlowExitCodes::STATUS_OK;
+        });
+
+    EXPECT_EQ (res, (int)BrainFlowExitCodes::BOARD_WRITE_ERROR);
+    for (int ch = 0; ch < ADS1299_NUM_CHANNELS; ch++)
+    {
+        EXPECT_EQ (tracker.get_gain_for_channel (ch), 24);
+        EXPECT_EQ (chip_codes[ch], tracker.get_gain_code_for_channel (ch));
+    }
+}
+
+TEST (CerelogGainTrackerTest, WriteChangedGains_RollbackFails_KeepNewGainForThisChannel)
+{
+    CerelogGainTracker tracker;
+    std::vector<int> chip_codes (ADS1299_NUM_CHANNELS, tracker.get_gain_code (24));
+    tracker.apply_config ("gain=4");
+
+    // port breaks after two successful writes, rollback writes fail too
+    int num_writes = 0;
+    int res = tracker.write_changed_gains (
+        [&chip_codes, &num_writes] (int ch, int code)
+        {
+            if (++num_writes > 2)
+            {
+                return (int)BrainFlowExitCodes::BOARD_WRITE_ERROR;
+            }
+            chip_codes[ch] = code;
+            return (int)BrainFlowExitCodes::STATUS_OK;
+        });
+
+    EXPECT_EQ (res, (int)BrainFlowExitCodes::BOARD_WRITE_ERROR);
+    EXPECT_EQ (tracker.get_gain_for_channel (0), 4);
+    EXPECT_EQ (tracker.get_gain_for_channel (1), 4);
+    EXPECT_EQ (tracker.get_gain_for_channel (2), 24);
+    for (int ch = 0; ch < ADS1299_NUM_CHANNELS; ch++)
+    {
+        EXPECT_EQ (chip_codes[ch], tracker.get_gain_code_for_channel (ch));
+    }
+}
+
+TEST (CerelogGainTrackerTest, WriteChangedGains_AllWritesSucceed_WriteOnlyChangedChannels)
+{
+    CerelogGainTracker tracker;
+    tracker.apply_config ("gain5=8");
+
+    std::vector<int> written;
+    int res = tracker.write_changed_gains (
+        [&written] (int ch, int code)
+        {
+            written.push_back (ch);
+            return (int)BrainFlowExitCodes::STATUS_OK;
+        });
+
+    EXPECT_EQ (res, (int)BrainFlowExitCodes::STATUS_OK);
+    EXPECT_THAT (written, ElementsAre (4));
+    EXPECT_EQ (tracker.get_gain_for_channel (4), 8);
+}
@@ -0,0 +1,184 @@
+#include <algorithm>
+#include <chrono>
+#include <ctime>
+#include <gmock/gmock.h>
+#include <iostream>
+#include <random>
+#include <vector>
+
+#include "ads1299_decoder.h"
+#include "cerelog_parser.h"
+#include "cerelog_test_frames.h"
+#include "data_buffer.h"
+
+using namespace testing;
+
+// Drives the same parse, decode and buffer path as Cerelog_X8::read_thread from memory. Read size
+// stands in for the sampling rate: at 500 Hz a wakeup sees about one frame, when the board or a
+// replay runs fast every read returns a full buffer. Latency is measured from the moment bytes are
+// handed to the parser until the frame is in the ring buffer.
+
+namespace
+{
+    const int BENCHMARK_NUM_FRAMES = 200000;
+    const int BENCHMARK_NUM_ROWS = 11;
+    const int BENCHMARK_EEG_ROWS[8] = {1, 2, 3, 4, 5, 6, 7, 8};
+
+    struct IngestResult
+    {
+        int num_frames;
+        double wall_ns;
+        double cpu_ns;
+        std::vector<double> latencies;
+    };
+
+    IngestResult ingest (
+        const std::vector<unsigned char> &stream, int read_size, CerelogStats &stats)
+    {
+        stats.reset ();
+        CerelogParser parser (&stats);
+        ADS1299Decoder decoder;
+        decoder.set_layout (BENCHMARK_EEG_ROWS, BENCHMARK_NUM_ROWS);
+        DataBuffer db (BENCHMARK_NUM_ROWS, 45000);
+        std::vector<const unsigned char *> frames (parser.get_max_frames ());
+        std::vector<double> packages (frames.size () * BENCHMARK_NUM_ROWS, 0.0);
+        std::vector<double> drain (45000 * BENCHMARK_NUM_ROWS);
+
+        IngestResult result;
+        result.num_frames = 0;
+        result.latencies.reserve (BENCHMARK_NUM_FRAMES);
+        std::clock_t cpu_start = std::clock ();
+        auto wall_start = std::chrono::high_resolution_clock::now ();
+        size_t offset = 0;
+        while (offset < stream.size ())
+        {
+            int free_space = 0;
+            unsigned char *dst = parser.get_free_space (&free_space);
+            int size = std::min (std::min (read_size, free_space), (int)(stream.size () - offset));
+            auto arrival = std::chrono::high_resolution_clock::now ();
+            memcpy (dst, stream.data () + offset, size);
+            parser.commit (size);
+            offset += size;
+            int num_frames = parser.parse (frames.data (), (int)frames.size ());
+            if (num_frames == 0)
+            {
+                continue;
+            }
+            for (int i = 0; i < num_frames; i++)
+            {
+                packages[i * BENCHMARK_NUM_ROWS] = (double)frames[i][CERELOG_PACKET_IDX_TIMESTAMP];
+                frames[i] += CERELOG_PACKET_IDX_ADS1299_DATA;
+            }
+            decoder.decode (frames.data (), num_frames, packages.data ());
+            db.add_data (packages.data (), (size_t)num_frames);
+            auto pushed = std::chrono::high_resolution_clock::now ();
+            double latency =
+                (double)std::chrono::duration_cast<std::chrono::nanoseconds> (pushed - arrival)
+                    .count ();
+            result.latencies.insert (result.latencies.end (), num_frames, latency);
+            result.num_frames += num_frames;
+            if (db.get_data_count () > 40000)
+            {
+                db.get_data (40000, drain.data ());
+            }
+        }
+        auto wall_stop = std::chrono::high_resolution_clock::now ();
+        result.cpu_ns = (double)(std::clock () - cpu_start) * 1e9 / CLOCKS_PER_SEC;
+        result.wall_ns =
+            (double)std::chrono::duration_cast<std::chrono::nanoseconds> (wall_stop - wall_start)
+                .count ();
+        std::sort (result.latencies.begin (), result.latencies.end ());
+        return result;
+    }
+
+    std::vector<unsigned char> make_stream (double corrupted_share, unsigned int seed)
+    {
+        std::mt19937 gen (seed);
+        std::uniform_real_distribution<double> share (0.0, 1.0);
+        std::uniform_int_distribution<int> byte (0, 255);
+        std::vector<unsigned char> stream;
+        stream.reserve ((size_t)BENCHMARK_NUM_FRAMES * (CERELOG_PACKET_TOTAL_SIZE + 8));
+        for (int i = 0; i < BENCHMARK_NUM_FRAMES; i++)
+        {
+            if (share (gen) < corrupted_share)
+            {
+                // half of corruptions are line noise, another half are frames with bad checksum
+                if (share (gen) < 0.5)
+                {
+                    for (int j = 0; j < 16; j++)
+                    {
+                        stream.push_back ((unsigned char)byte (gen));
+                    }
+                }
+                else
+                {
+                    append_cerelog_frame (stream, 1700000000, i);
+                    stream[stream.size () - 3] ^= 0xFF;
+                }
+            }
+            append_cerelog_frame (stream, 1700000000 + i / 500, i % 0x7FFFFF);
+        }
+        return stream;
+    }
+
+    void report (const char *name, const IngestResult &result)
+    {
+        std::cout << "[ BENCHMARK ] " << name
+                  << ": packets/s=" << result.num_frames * 1e9 / result.wall_ns
+                  << " cpu ns/packet=" << result.cpu_ns / result.num_frames
+                  << " latency ns p50=" << result.latencies[result.latencies.size () / 2]
+                  << " p99=" << result.latencies[result.latencies.size () * 99 / 100] << std::endl;
+    }
+}
+
+TEST (CerelogParserBenchmark, Ingest_CleanStreamAtIncreasingReadSizes_ReportThroughputAndLatency)
+{
+    std::vector<unsigned char> stream = make_stream (0.0, 42);
+    const int frames_per_read[4] = {1, 8, 64, 1024};
+    for (int i = 0; i < 4; i++)
+    {
+        CerelogStats stats;
+        IngestResult result =
+            ingest (stream, frames_per_read[i] * CERELOG_PACKET_TOTAL_SIZE, stats);
+        std::string name = std::to_string (frames_per_read[i]) + " frames per read";
+        report (name.c_str (), result);
+
+        EXPECT_EQ (result.num_frames, BENCHMARK_NUM_FRAMES);
+        EXPECT_EQ (stats.bytes_skipped, 0);
+    }
+}
+
+TEST (CerelogParserBenchmark, Ingest_CorruptedStream_ReportResyncCost)
+{
+    CerelogStats stats;
+    IngestResult corrupted = ingest (make_stream (0.05, 42), 16384, stats);
+    report ("5% corrupted stream", corrupted);
+    // every valid frame survives, noise may only occasionally look like a start marker
+    EXPECT_EQ (corrupted.num_frames, BENCHMARK_NUM_FRAMES);
+    EXPECT_GT (stats.bytes_skipped, 0);
+
+    // resync cost is measured on streams without valid frames, so it is not hidden by parsing
+    std::mt19937 gen (42);
+    std::uniform_int_distribution<int> byte (0, 255);
+    std::vector<unsigned char> noise ((size_t)BENCHMARK_NUM_FRAMES * CERELOG_PACKET_TOTAL_SIZE);
+    for (size_t i = 0; i < noise.size (); i++)
+    {
+        noise[i] = (unsigned char)byte (gen);
+    }
+    IngestResult noise_result = ingest (noise, 16384, stats);
+    std::cout << "[ BENCHMARK ] line noise: ns per skipped byte="
+              << noise_result.wall_ns / (double)stats.bytes_skipped << std::endl;
+
+    std::vector<unsigned char> bad_frames;
+    for (int i = 0; i < BENCHMARK_NUM_FRAMES; i++)
+    {
+        append_cerelog_frame (bad_frames, 1700000000, i);
+        bad_frames[bad_frames.size () - 3] ^= 0xFF;
+    }
+    IngestResult bad_result = ingest (bad_frames, 16384, stats);
+    std::cout << "[ BENCHMARK ] bad checksums: ns per rejected frame="
+              << bad_result.wall_ns / (double)stats.checksum_errors << std::endl;
+
+    EXPECT_EQ (noise_result.num_frames + bad_result.num_frames, 0);
+    EXPECT_GE (stats.checksum_errors, BENCHMARK_NUM_FRAMES);
+}
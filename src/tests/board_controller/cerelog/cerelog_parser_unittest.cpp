@@ -0,0 +1,221 @@
+#include <algorithm>
+#include <gmock/gmock.h>
+#include <random>
+#include <string.h>
+#include <vector>
+
+#include "cerelog_parser.h"
+#include "cerelog_test_frames.h"
+
+using namespace testing;
+
+namespace
+{
+    // feeds whole stream in chunks of read_size bytes, returns total number of frames
+    int parse_cerelog_stream (
+        CerelogParser &parser, const std::vector<unsigned char> &stream, int read_size)
+    {
+        std::vector<const unsigned char *> frames (parser.get_max_frames ());
+        int total = 0;
+        size_t offset = 0;
+        while (offset < stream.size ())
+        {
+            int free_space = 0;
+            unsigned char *dst = parser.get_free_space (&free_space);
+            int size = std::min (std::min (read_size, free_space), (int)(stream.size () - offset));
+            memcpy (dst, stream.data () + offset, size);
+            parser.commit (size);
+            offset += size;
+            total += parser.parse (frames.data (), (int)frames.size ());
+        }
+        return total;
+    }
+}
+
+TEST (CerelogParserTest, Parse_FrameSplitBetweenReads_ReturnFrameAfterLastByte)
+{
+    CerelogStats stats;
+    stats.reset ();
+    CerelogParser parser (&stats);
+    std::vector<unsigned char> stream;
+    append_cerelog_frame (stream, 1700000000, 1);
+    const unsigned char *frames[4];
+
+    EXPECT_EQ (feed_cerelog_parser (parser, stream.data (), 20, frames, 4), 0);
+    EXPECT_EQ (feed_cerelog_parser (parser, stream.data () + 20, 17, frames, 4), 1);
+    EXPECT_EQ (frames[0][CERELOG_PACKET_IDX_TIMESTAMP + 3], 1700000000 & 0xFF);
+    EXPECT_EQ (stats.bytes_skipped, 0);
+}
+
+TEST (CerelogParserTest, Parse_GarbageAndBadChecksum_SkipBytesAndKeepValidFrames)
+{
+    CerelogStats stats;
+    stats.reset ();
+    CerelogParser parser (&stats);
+    std::vector<unsigned char> stream = {0x01, 0xAB, 0x02};
+    append_cerelog_frame (stream, 1700000000, 1);
+    std::vector<unsigned char> corrupted;
+    append_cerelog_frame (corrupted, 1700000000, 2);
+    corrupted[CERELOG_PACKET_IDX_CHECKSUM] ^= 0xFF;
+    stream.insert (stream.end (), corrupted.begin (), corrupted.end ());
+    append_cerelog_frame (stream, 1700000000, 3);
+    const unsigned char *frames[4];
+
+    EXPECT_EQ (feed_cerelog_parser (parser, stream.data (), (int)stream.size (), frames, 4), 2);
+    EXPECT_EQ (frames[1][CERELOG_PACKET_IDX_ADS1299_DATA + 5], 3);
+    EXPECT_EQ (stats.checksum_errors, 1);
+    EXPECT_EQ (stats.bytes_skipped, 3 + CERELOG_PACKET_TOTAL_SIZE);
+}
+
+TEST (CerelogParserTest, GetFreeSpace_LittleRoomLeft_MoveLeftoverToStart)
+{
+    CerelogStats stats;
+    stats.reset ();
+    CerelogParser parser (&stats, 256, 64);
+    std::vector<unsigned char> stream;
+    for (int i = 0; i < 10; i++)
+    {
+        append_cerelog_frame (stream, 1700000000, i);
+    }
+    const unsigned char *frames[8];
+    int total = 0;
+    for (size_t offset = 0; offset < stream.size (); offset += 50)
+    {
+        int size = (int)std::min ((size_t)50, stream.size () - offset);
+        total += feed_cerelog_parser (parser, stream.data () + offset, size, frames, 8);
+    }
+
+    EXPECT_EQ (total, 10);
+    EXPECT_EQ (stats.bytes_skipped, 0);
+}
+
+TEST (CerelogParserTest, Parse_NoiseBurstBetweenFrames_CountOneResync)
+{
+    CerelogStats stats;
+    stats.reset ();
+    CerelogParser parser (&stats);
+    std::vector<unsigned char> stream;
+    append_cerelog_frame (stream, 1700000000, 1);
+    // start marker with wrong length byte and start marker split by noise
+    std::vector<unsigned char> noise = {0x00, 0xAB, 0xCD, 0x05, 0x11, 0xAB, 0x12, 0xAB, 0xAB};
+    stream.insert (stream.end (), noise.begin (), noise.end ());
+    append_cerelog_frame (stream, 1700000000, 2);
+    const unsigned char *frames[4];
+
+    EXPECT_EQ (feed_cerelog_parser (parser, stream.data (), (int)stream.size (), frames, 4), 2);
+    EXPECT_EQ (frames[1][CERELOG_PACKET_IDX_ADS1299_DATA + 5], 2);
+    EXPECT_EQ (stats.bytes_skipped, noise.size ());
+    EXPECT_EQ (stats.length_errors, 1);
+    EXPECT_EQ (stats.checksum_errors, 0);
+    EXPECT_EQ (stats.resyncs, 1);
+}
+
+TEST (CerelogParserTest, Parse_CandidateInsideCorruptedFrame_ReuseChecksumWindow)
+{
+    CerelogStats stats;
+    stats.reset ();
+    CerelogParser parser (&stats);
+    // valid frame at offset 10 carries end marker of broken candidate at offset 0 in its data, so
+    // both candidates reach checksum and their windows overlap
+    std::vector<unsigned char> frame;
+    append_cerelog_frame (frame, 1700000000, 2);
+    frame[CERELOG_PACKET_IDX_END_MARKER - 10] = (CERELOG_END_MARKER >> 8) & 0xFF;
+    frame[CERELOG_PACKET_IDX_END_MARKER - 9] = CERELOG_END_MARKER & 0xFF;
+    uint8_t checksum = 0;
+    for (int i = CERELOG_PACKET_IDX_LENGTH; i < CERELOG_PACKET_IDX_CHECKSUM; i++)
+    {
+        checksum += frame[i];
+    }
+    frame[CERELOG_PACKET_IDX_CHECKSUM] = checksum;
+    std::vector<unsigned char> stream (10, 0);
+    stream[0] = (CERELOG_START_MARKER >> 8) & 0xFF;
+    stream[1] = CERELOG_START_MARKER & 0xFF;
+    stream[CERELOG_PACKET_IDX_LENGTH] = CERELOG_PACKET_MSG_LENGTH;
+    stream.insert (stream.end (), frame.begin (), frame.end ());
+    const unsigned char *frames[4];
+
+    EXPECT_EQ (feed_cerelog_parser (parser, stream.data (), (int)stream.size (), frames, 4), 1);
+    EXPECT_EQ (frames[0][CERELOG_PACKET_IDX_ADS1299_DATA + 5], 2);
+    EXPECT_EQ (stats.checksum_errors, 1);
+    EXPECT_EQ (stats.bytes_skipped, 10);
+}
+
+TEST (CerelogParserTest, Parse_CleanStreamAtDifferentReadSizes_ReturnAllFrames)
+{
+    std::vector<unsigned char> stream;
+    for (int i = 0; i < 2000; i++)
+    {
+        append_cerelog_frame (stream, 1700000000 + i / 500, i);
+    }
+    const int frames_per_read[4] = {1, 8, 64, 1024};
+    for (int i = 0; i < 4; i++)
+    {
+        CerelogStats stats;
+        stats.reset ();
+        CerelogParser parser (&stats);
+
+        EXPECT_EQ (
+            parse_cerelog_stream (parser, stream, frames_per_read[i] * CERELOG_PACKET_TOTAL_SIZE),
+            2000);
+        EXPECT_EQ (stats.bytes_skipped, 0);
+    }
+}
+
+TEST (CerelogParserTest, Parse_RandomlyCorruptedStream_KeepEveryValidFrame)
+{
+    std::mt19937 gen (42);
+    std::uniform_real_distribution<double> share (0.0, 1.0);
+    std::uniform_int_distribution<int> byte (0, 255);
+    std::vector<unsigned char> stream;
+    for (int i = 0; i < 2000; i++)
+    {
+        if (share (gen) < 0.05)
+        {
+            // half of corruptions are line noise, another half are frames with bad checksum
+            if (share (gen) < 0.5)
+            {
+                for (int j = 0; j < 16; j++)
+                {
+                    stream.push_back ((unsigned char)byte (gen));
+                }
+            }
+            else
+            {
+                append_cerelog_frame (stream, 1700000000, i);
+                stream[stream.size () - 3] ^= 0xFF;
+            }
+        }
+        append_cerelog_frame (stream, 1700000000 + i / 500, i);
+    }
+    CerelogStats stats;
+    stats.reset ();
+    CerelogParser parser (&stats);
+
+    EXPECT_EQ (parse_cerelog_stream (parser, stream, 16384), 2000);
+    EXPECT_GT (stats.bytes_skipped, 0);
+}
+
+TEST (CerelogParserTest, Parse_NoiseOrBadChecksumsOnly_ReturnNoFrames)
+{
+    std::mt19937 gen (42);
+    std::uniform_int_distribution<int> byte (0, 255);
+    std::vector<unsigned char> noise ((size_t)2000 * CERELOG_PACKET_TOTAL_SIZE);
+    for (size_t i = 0; i < noise.size (); i++)
+    {
+        noise[i] = (unsigned char)byte (gen);
+    }
+    std::vector<unsigned char> bad_frames;
+    for (int i = 0; i < 2000; i++)
+    {
+        append_cerelog_frame (bad_frames, 1700000000, i);
+        bad_frames[bad_frames.size () - 3] ^= 0xFF;
+    }
+    CerelogStats stats;
+    stats.reset ();
+    CerelogParser noise_parser (&stats);
+    CerelogParser bad_frames_parser (&stats);
+
+    EXPECT_EQ (parse_cerelog_stream (noise_parser, noise, 16384), 0);
+    EXPECT_EQ (parse_cerelog_stream (bad_frames_parser, bad_frames, 16384), 0);
+    EXPECT_GE (stats.checksum_errors, 2000);
+}
@@ -0,0 +1,57 @@
+#pragma once
+
+#include <stdint.h>
+#include <vector>
+
+#include "cerelog_parser.h"
+
+
+// appends valid frame with channel values sample_num * (ch + 1) to stream
+inline void append_cerelog_frame (
+    std::vector<unsigned char> &stream, uint32_t board_timestamp, int32_t sample_num)
+{
+    unsigned char frame[CERELOG_PACKET_TOTAL_SIZE] = {0};
+    frame[0] = (CERELOG_START_MARKER >> 8) & 0xFF;
+    frame[1] = CERELOG_START_MARKER & 0xFF;
+    frame[CERELOG_PACKET_IDX_LENGTH] = CERELOG_PACKET_MSG_LENGTH;
+    for (int i = 0; i < 4; i++)
+    {
+        frame[CERELOG_PACKET_IDX_TIMESTAMP + i] = (board_timestamp >> (24 - 8 * i)) & 0xFF;
+    }
+    frame[CERELOG_PACKET_IDX_ADS1299_DATA] = 0xC0;
+    for (int ch = 0; ch < 8; ch++)
+    {
+        int32_t value = sample_num * (ch + 1);
+        unsigned char *raw = frame + CERELOG_PACKET_IDX_ADS1299_DATA + 3 + ch * 3;
+        raw[0] = (value >> 16) & 0xFF;
+        raw[1] = (value >> 8) & 0xFF;
+        raw[2] = value & 0xFF;
+    }
+    uint8_t checksum = 0;
+    for (int i = CERELOG_PACKET_IDX_LENGTH; i < CERELOG_PACKET_IDX_CHECKSUM; i++)
+    {
+        checksum += frame[i];
+    }
+    frame[CERELOG_PACKET_IDX_CHECKSUM] = checksum;
+    frame[CERELOG_PACKET_IDX_END_MARKER] = (CERELOG_END_MARKER >> 8) & 0xFF;
+    frame[CERELOG_PACKET_IDX_END_MARKER + 1] = CERELOG_END_MARKER & 0xFF;
+    stream.insert (stream.end (), frame, frame + CERELOG_PACKET_TOTAL_SIZE);
+}
+
+// copies bytes to parser the same way read thread does, returns number of frames
+inline int feed_cerelog_parser (CerelogParser &parser, const unsigned char *data, int size,
+    const unsigned char **frames, int max_frames)
+{
+    int free_space = 0;
+    unsigned char *dst = parser.get_free_space (&free_space);
+    if (size > free_space)
+    {
+        size = free_space;
+    }
+    for (int i = 0; i < size; i++)
+    {
+        dst[i] = data[i];
+    }
+    parser.commit (size);
+    return parser.parse (frames, max_frames);
+}
@@ -30,9 +30,18 @@ enable_testing()
 SET (TESTS_SRC
     ${CMAKE_CURRENT_SOURCE_DIR}/src/utils/bluetooth/bluetooth_functions.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/utils/data_buffer.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/data_handler/delimited_file_reader.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/cerelog/ads1299_decoder.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/cerelog/cerelog_parser.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/cerelog/cerelog_clock_sync.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/utils/bluetooth/socket_bluetooth_test.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/utils/bluetooth/bluetooth_functions_unittest.cpp
     ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/utils/data_buffer_unittest.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/data_handler/delimited_file_reader_unittest.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/board_controller/cerelog/ads1299_decoder_unittest.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/board_controller/cerelog/cerelog_parser_unittest.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/board_controller/cerelog/cerelog_clock_sync_unittest.cpp
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/board_controller/cerelog/cerelog_gain_tracker_unittest.cpp
 )
 
 add_executable(
@@ -44,6 +53,9 @@ target_include_directories (
     ${TESTS_EXE_NAME} PRIVATE
     ${CMAKE_CURRENT_SOURCE_DIR}/src/utils/inc
     ${CMAKE_CURRENT_SOURCE_DIR}/src/utils/bluetooth/inc
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/data_handler/inc
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/cerelog/inc
+    ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/board_controller/cerelog/inc
     ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/utils/bluetooth/inc
     ${CMAKE_CURRENT_SOURCE_DIR}/src/utils/bluetooth/macos_third_party
 )
@@ -61,4 +73,42 @@ set_target_properties (${TESTS_EXE_NAME}
 )
 
 include(GoogleTest)
-gtest_discover_tests(${TESTS_EXE_NAME})
\ No newline at end of file
+gtest_discover_tests(${TESTS_EXE_NAME})
+
+# Benchmarks print timings and run for seconds, so they are built separately (together with
+# BUILD_TESTS) and are not registered in ctest
+if (BUILD_BENCHMARKS)
+    SET (BENCHMARKS_EXE_NAME "brainflow_benchmarks")
+
+    SET (BENCHMARKS_SRC
+        ${CMAKE_CURRENT_SOURCE_DIR}/src/utils/data_buffer.cpp
+        ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/cerelog/ads1299_decoder.cpp
+        ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/cerelog/cerelog_parser.cpp
+        ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/utils/data_buffer_benchmark.cpp
+        ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/board_controller/cerelog/cerelog_parser_benchmark.cpp
+    )
+
+    add_executable(
+        ${BENCHMARKS_EXE_NAME}
+        ${BENCHMARKS_SRC}
+    )
+
+    target_include_directories (
+        ${BENCHMARKS_EXE_NAME} PRIVATE
+        ${CMAKE_CURRENT_SOURCE_DIR}/src/utils/inc
+        ${CMAKE_CURRENT_SOURCE_DIR}/src/board_controller/cerelog/inc
+        ${CMAKE_CURRENT_SOURCE_DIR}/src/tests/board_controller/cerelog/inc
+    )
+
+    target_link_libraries(
+        ${BENCHMARKS_EXE_NAME} PRIVATE
+        gmock_main
+    )
+
+    set_target_properties (${BENCHMARKS_EXE_NAME}
+        PROPERTIES
+        ARCHIVE_OUTPUT_DIRECTORY ${CMAKE_CURRENT_SOURCE_DIR}/build/tests
+        LIBRARY_OUTPUT_DIRECTORY ${CMAKE_CURRENT_SOURCE_DIR}/build/tests
+        RUNTIME_OUTPUT_DIRECTORY ${CMAKE_CURRENT_SOURCE_DIR}/build/tests
+    )
+endif (BUILD_BENCHMARKS)
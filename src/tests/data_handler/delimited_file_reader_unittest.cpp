@@ -0,0 +1,204 @@
+#include <gmock/gmock.h>
+
+#include <stdio.h>
+#include <string>
+#include <vector>
+
+#include "brainflow_constants.h"
+#include "delimited_file_reader.h"
+
+using namespace testing;
+
+namespace
+{
+    std::string write_temp_file (const std::string &name, const std::string &content)
+    {
+        std::string path = TempDir () + name;
+        FILE *fp = fopen (path.c_str (), "wb");
+        fwrite (content.data (), 1, content.size (), fp);
+        fclose (fp);
+        return path;
+    }
+}
+
+
+TEST (DelimitedFileReaderTest, Read_TsvFile_TransposeValues)
+{
+    std::string path = write_temp_file ("reader_tsv.csv", "1.5\t-2\t3e2\n4\t5.25\t-0.000001\n");
+    DelimitedFileReader reader;
+    std::vector<double> data (6);
+    int num_lines = 0;
+    int num_values = 0;
+
+    ASSERT_EQ (reader.read (path.c_str (), data.data (), data.size (), &num_lines, &num_values),
+        (int)BrainFlowExitCodes::STATUS_OK);
+    EXPECT_EQ (num_lines, 2);
+    EXPECT_EQ (num_values, 3);
+    EXPECT_THAT (data, ElementsAre (1.5, 4.0, -2.0, 5.25, 300.0, -0.000001));
+}
+
+TEST (DelimitedFileReaderTest, Read_BlankLinesAndNoFinalNewLine_ReadAllLines)
+{
+    std::string path = write_temp_file ("reader_csv.csv", "1,2\r\n\r\n3,4,\n\n5,6");
+    DelimitedFileReader reader;
+    int num_lines = 0;
+    int num_values = 0;
+
+    ASSERT_EQ (reader.get_shape (path.c_str (), &num_lines, &num_values),
+        (int)BrainFlowExitCodes::STATUS_OK);
+    EXPECT_EQ (num_lines, 3);
+    EXPECT_EQ (num_values, 2);
+    std::vector<double> data (6);
+    ASSERT_EQ (reader.read (path.c_str (), data.data (), data.size (), &num_lines, &num_values),
+        (int)BrainFlowExitCodes::STATUS_OK);
+    EXPECT_THAT (data, ElementsAre (1.0, 3.0, 5.0, 2.0, 4.0, 6.0));
+}
+
+TEST (DelimitedFileReaderTest, Read_SmallBuffer_ReadFirstLines)
+{
+    std::string path = write_temp_file ("reader_small.csv", "1\t2\n3\t4\n5\t6\n");
+    DelimitedFileReader reader;
+    std::vector<double> data (5);
+    int num_lines = 0;
+    int num_values = 0;
+
+    ASSERT_EQ (reader.read (path.c_str (), data.data (), data.size (), &num_lines, &num_values),
+        (int)BrainFlowExitCodes::STATUS_OK);
+    EXPECT_EQ (num_lines, 2);
+    EXPECT_THAT (std::vector<double> (data.begin (), data.begin () + 4), ElementsAre (1, 3, 2, 4));
+}
+
+TEST (DelimitedFileReaderTest, Read_InvalidFiles_ReturnError)
+{
+    DelimitedFileReader reader;
+    std::vector<double> data (16);
+    int num_lines = 0;
+    int num_values = 0;
+    const char *contents[] = {"1\t2\n3\tabc\n", "1\t2\n3\t4\t5\n", "1\t2\n3\n", "1\t\t2\n"};
+
+    for (size_t i = 0; i < sizeof (contents) / sizeof (contents[0]); i++)
+    {
+        std::string path = write_temp_file ("reader_invalid.csv", contents[i]);
+        EXPECT_EQ (reader.read (path.c_str (), data.data (), data.size (), &num_lines, &num_values),
+            (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR)
+            << contents[i];
+    }
+    std::string path = write_temp_file ("reader_empty.csv", "\n\n");
+    EXPECT_EQ (reader.get_shape (path.c_str (), &num_lines, &num_values),
+        (int)BrainFlowExitCodes::EMPTY_BUFFER_ERROR);
+    EXPECT_EQ (
+        reader.get_shape ((TempDir () + "reader_missing.csv").c_str (), &num_lines, &num_values),
+        (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR);
+}
+
+TEST (DelimitedFileReaderTest, Read_LargeFileInChunks_SameAsSingleThread)
+{
+    std::string content;
+    char line[128];
+    for (int i = 0; i < 100000; i++)
+    {
+        snprintf (line, sizeof (line), "%d\t%lf\t%.17g\n", i, i * 0.001, i / 7.0);
+        content += line;
+        if (i % 1000 == 0)
+        {
+            content += "\n";
+        }
+    }
+    std::string path = write_temp_file ("reader_large.csv", content);
+    std::vector<double> single (300000);
+    std::vector<double> chunked (300000);
+    int num_lines = 0;
+    int num_values = 0;
+
+    DelimitedFileReader single_reader (1);
+    ASSERT_EQ (
+        single_reader.read (path.c_str (), single.data (), single.size (), &num_lines, &num_values),
+        (int)BrainFlowExitCodes::STATUS_OK);
+    DelimitedFileReader chunked_reader (4);
+    ASSERT_EQ (chunked_reader.read (
+                   path.c_str (), chunked.data (), chunked.size (), &num_lines, &num_values),
+        (int)BrainFlowExitCodes::STATUS_OK);
+    EXPECT_EQ (num_lines, 100000);
+    EXPECT_EQ (single, chunked);
+    for (int i = 0; i < num_lines; i += 997)
+    {
+        EXPECT_EQ (chunked[i], (double)i);
+        EXPECT_EQ (chunked[2 * num_lines + i], i / 7.0);
+    }
+}
+
+TEST (DelimitedFileReaderTest, ReadChunk_WholeFile_SameAsRead)
+{
+    std::string content;
+    char line[128];
+    for (int i = 0; i < 50000; i++)
+    {
+        snprintf (line, sizeof (line), "%d,%lf\n%s", i, i * 0.5, (i % 100 == 0) ? "\n" : "");
+        content += line;
+    }
+    content += "50000,25000.0";
+    std::string path = write_temp_file ("reader_chunks.csv", content);
+    DelimitedFileReader reader;
+    std::vector<double> expected (100002);
+    int num_lines = 0;
+    int num_values = 0;
+    ASSERT_EQ (
+        reader.read (path.c_str (), expected.data (), expected.size (), &num_lines, &num_values),
+        (int)BrainFlowExitCodes::STATUS_OK);
+    ASSERT_EQ (
+        reader.get_num_values (path.c_str (), &num_values), (int)BrainFlowExitCodes::STATUS_OK);
+    EXPECT_EQ (num_values, 2);
+
+    const int chunk_lines = 777;
+    std::vector<double> chunk (chunk_lines * 2);
+    long long offset = 0;
+    int total_lines = 0;
+    while (true)
+    {
+        int chunk_num_lines = 0;
+        long long next_offset = 0;
+        ASSERT_EQ (reader.read_chunk (path.c_str (), offset, chunk.data (), chunk.size (),
+                       &chunk_num_lines, &num_values, &next_offset),
+            (int)BrainFlowExitCodes::STATUS_OK);
+        if (chunk_num_lines == 0)
+        {
+            EXPECT_EQ (next_offset, (long long)content.size ());
+            break;
+        }
+        EXPECT_TRUE ((chunk_num_lines == chunk_lines) || (total_lines + chunk_num_lines == 50001));
+        for (int i = 0; i < chunk_num_lines; i++)
+        {
+            ASSERT_EQ (chunk[i], expected[total_lines + i]);
+            ASSERT_EQ (chunk[chunk_num_lines + i], expected[num_lines + total_lines + i]);
+        }
+        total_lines += chunk_num_lines;
+        offset = next_offset;
+    }
+    EXPECT_EQ (total_lines, 50001);
+}
+
+TEST (DelimitedFileReaderTest, Read_ValuesGoingToStrtod_ParseOnlyOwnToken)
+{
+    DelimitedFileReader reader;
+    std::vector<double> data (4);
+    int num_lines = 0;
+    int num_values = 0;
+    std::string long_number = "0." + std::string (80, '0') + "1";
+    std::string path = write_temp_file ("reader_strtod.csv", " 1e1\t" + long_number + "\n3\t 4\n");
+
+    ASSERT_EQ (reader.read (path.c_str (), data.data (), data.size (), &num_lines, &num_values),
+        (int)BrainFlowExitCodes::STATUS_OK);
+    EXPECT_THAT (data, ElementsAre (10.0, 3.0, 1e-81, 4.0));
+
+    // whitespace value followed only by blank lines up to the page sized end of file, strtod must
+    // not skip new lines past the end of mapping
+    std::string content = "1\t2\n3\t ";
+    while (content.size () < 4096)
+    {
+        content += (content.size () % 2 == 0) ? " " : "\n";
+    }
+    content[4095] = '\n';
+    path = write_temp_file ("reader_whitespace.csv", content);
+    EXPECT_EQ (reader.read (path.c_str (), data.data (), data.size (), &num_lines, &num_values),
+        (int)BrainFlowExitCodes::INVALID_ARGUMENTS_ERROR);
+}
@@ -0,0 +1,124 @@
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <gmock/gmock.h>
+#include <iostream>
+#include <thread>
+#include <vector>
+
+#include "data_buffer.h"
+
+using namespace testing;
+
+// Measures latency of add_data while several readers poll the same buffer as hard as they can.
+// Each sample is filled with its sequence number, readers check that they never get mixed rows.
+
+namespace
+{
+    const int BENCHMARK_NUM_ROWS = 32;
+    const size_t BENCHMARK_BUFFER_SIZE = 4096;
+    const int BENCHMARK_NUM_PUSHES = 200000;
+    const int BENCHMARK_NUM_READERS = 3;
+
+    bool is_valid_chunk (const double *chunk, size_t count, double &last_seq)
+    {
+        for (size_t i = 0; i < count; i++)
+        {
+            double seq = chunk[i * BENCHMARK_NUM_ROWS];
+            for (int j = 1; j < BENCHMARK_NUM_ROWS; j++)
+            {
+                if (chunk[i * BENCHMARK_NUM_ROWS + j] != seq)
+                {
+                    return false;
+                }
+            }
+            if (seq <= last_seq)
+            {
+                return false;
+            }
+            last_seq = seq;
+        }
+        return true;
+    }
+
+    void run_push_benchmark (const char *name, int reader_mode)
+    {
+        DataBuffer buffer (BENCHMARK_NUM_ROWS, BENCHMARK_BUFFER_SIZE);
+        std::atomic<bool> keep_alive (true);
+        std::atomic<int> invalid_chunks (0);
+        std::vector<std::thread> readers;
+
+        for (int r = 0; r < BENCHMARK_NUM_READERS; r++)
+        {
+            readers.push_back (std::thread (
+                [&] ()
+                {
+                    std::vector<double> chunk (BENCHMARK_BUFFER_SIZE * BENCHMARK_NUM_ROWS);
+                    while (keep_alive)
+                    {
+                        double last_seq = -1.0;
+                        size_t count = 0;
+                        if (reader_mode == 0)
+                        {
+                            count = buffer.get_data_count ();
+                        }
+                        else if (reader_mode == 1)
+                        {
+                            count = buffer.get_current_data (256, chunk.data ());
+                        }
+                        else
+                        {
+                            count = buffer.get_data (256, chunk.data ());
+                        }
+                        if ((reader_mode != 0) &&
+                            (!is_valid_chunk (chunk.data (), count, last_seq)))
+                        {
+                            invalid_chunks++;
+                        }
+                    }
+                }));
+        }
+
+        std::vector<double> package (BENCHMARK_NUM_ROWS);
+        std::vector<double> latencies (BENCHMARK_NUM_PUSHES);
+        for (int i = 0; i < BENCHMARK_NUM_PUSHES; i++)
+        {
+            std::fill (package.begin (), package.end (), (double)i);
+            auto start = std::chrono::high_resolution_clock::now ();
+            buffer.add_data (package.data ());
+            auto stop = std::chrono::high_resolution_clock::now ();
+            latencies[i] =
+                (double)std::chrono::duration_cast<std::chrono::nanoseconds> (stop - start)
+                    .count ();
+        }
+        keep_alive = false;
+        for (auto &reader : readers)
+        {
+            reader.join ();
+        }
+
+        std::sort (latencies.begin (), latencies.end ());
+        std::cout << "[ BENCHMARK ] " << name
+                  << ": push latency ns p50=" << latencies[latencies.size () / 2]
+                  << " p99=" << latencies[latencies.size () * 99 / 100]
+                  << " max=" << latencies.back () << std::endl;
+
+        EXPECT_EQ (invalid_chunks, 0);
+        EXPECT_LE (buffer.get_data_count (), BENCHMARK_BUFFER_SIZE);
+    }
+}
+
+TEST (DataBufferBenchmark, AddData_ReadersPollDataCount_ReportPushLatency)
+{
+    run_push_benchmark ("get_data_count polling", 0);
+}
+
+TEST (DataBufferBenchmark, AddData_ReadersPollCurrentData_ReportPushLatency)
+{
+    run_push_benchmark ("get_current_data polling", 1);
+}
+
+TEST (DataBufferBenchmark, AddData_ReadersRemoveData_ReportPushLatency)
+{
+    run_push_benchmark ("get_data polling", 2);
+}
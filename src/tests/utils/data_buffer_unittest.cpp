@@ -1,9 +1,12 @@
+#include <algorithm>
 #include <array>
+#include <atomic>
 #include <future>
 #include <gmock/gmock-matchers.h>
 #include <gmock/gmock.h>
 #include <list>
 #include <thread>
+#include <vector>
 
 #include "data_buffer.h"
 
@@ -408,6 +411,61 @@ TEST (DataBufferTest, GetCurrentData_InvokedInMultipleThreads_DataReturnedWithou
     }
 }
 
+TEST (DataBufferTest, AddData_ReadersRunConcurrently_ReturnWholeRowsInOrder)
+{
+    // each sample is filled with its sequence number, readers must never see mixed rows
+    DataBuffer buffer (8, 256);
+    std::atomic<bool> keep_alive (true);
+    std::atomic<int> invalid_chunks (0);
+    std::vector<std::thread> readers;
+
+    for (int r = 0; r < 2; r++)
+    {
+        readers.push_back (std::thread (
+            [&] (bool remove)
+            {
+                std::vector<double> chunk (64 * 8);
+                while (keep_alive)
+                {
+                    size_t count = remove ? buffer.get_data (64, chunk.data ()) :
+                                            buffer.get_current_data (64, chunk.data ());
+                    double last_seq = -1.0;
+                    for (size_t i = 0; i < count; i++)
+                    {
+                        double seq = chunk[i * 8];
+                        bool is_valid = seq > last_seq;
+                        for (int j = 1; j < 8; j++)
+                        {
+                            is_valid = is_valid && (chunk[i * 8 + j] == seq);
+                        }
+                        if (!is_valid)
+                        {
+                            invalid_chunks++;
+                            break;
+                        }
+                        last_seq = seq;
+                    }
+                }
+            },
+            r == 0));
+    }
+
+    double package[8];
+    for (int i = 0; i < 20000; i++)
+    {
+        std::fill (package, package + 8, (double)i);
+        buffer.add_data (package);
+    }
+    keep_alive = false;
+    for (auto &reader : readers)
+    {
+        reader.join ();
+    }
+
+    EXPECT_EQ (invalid_chunks, 0);
+    EXPECT_LE (buffer.get_data_count (), (size_t)256);
+}
+
 TEST (DataBufferTest, IsReady_BufferCanFitInMemory_ReturnTrue)
 {
     DataBuffer buffer (4, 16);
@@ -424,4 +482,148 @@ TEST (DataBufferTest, IsReady_BufferSizeIsZero_ReturnFalse)
 {
     DataBuffer buffer_zero (4, 0);
     EXPECT_EQ (buffer_zero.is_ready (), false);
-}
\ No newline at end of file
+}
+TEST (DataBufferTest, GetDataTransposed_NoRowStride_ReturnPackedChannelMajorData)
+{
+    DataBuffer buffer (3, 4);
+    double first_values[3] = {1.0, 2.0, 3.0};
+    double second_values[3] = {4.0, 5.0, 6.0};
+
+    buffer.add_data (first_values);
+    buffer.add_data (second_values);
+
+    double retrieved[6];
+    auto result = buffer.get_data_transposed (4, retrieved);
+
+    EXPECT_EQ (result, 2);
+    EXPECT_EQ (buffer.get_data_count (), 0);
+    double expected[6] = {1.0, 4.0, 2.0, 5.0, 3.0, 6.0};
+    for (int i = 0; i < 6; i++)
+    {
+        EXPECT_EQ (retrieved[i], expected[i]);
+    }
+}
+
+TEST (DataBufferTest, GetCurrentDataTransposed_RowStrideAndWrappedBuffer_KeepStrideBetweenChannels)
+{
+    DataBuffer buffer (2, 2);
+    double first_values[2] = {1.0, 2.0};
+    double second_values[2] = {3.0, 4.0};
+    double third_values[2] = {5.0, 6.0};
+
+    buffer.add_data (first_values);
+    buffer.add_data (second_values);
+    buffer.add_data (third_values);
+
+    double retrieved[8] = {0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0};
+    auto result = buffer.get_current_data_transposed (4, retrieved, 4);
+
+    EXPECT_EQ (result, 2);
+    EXPECT_EQ (buffer.get_data_count (), 2);
+    double expected[8] = {3.0, 5.0, 0.0, 0.0, 4.0, 6.0, 0.0, 0.0};
+    for (int i = 0; i < 8; i++)
+    {
+        EXPECT_EQ (retrieved[i], expected[i]);
+    }
+}
+
+TEST (DataBufferTest, GetData_ColumnarBuffer_ReturnRowInterleavedData)
+{
+    DataBuffer buffer (3, 2, true);
+    double first_values[3] = {1.0, 2.0, 3.0};
+    double second_values[3] = {4.0, 5.0, 6.0};
+    double third_values[3] = {7.0, 8.0, 9.0};
+
+    buffer.add_data (first_values);
+    buffer.add_data (second_values);
+    buffer.add_data (third_values);
+
+    double retrieved[6];
+    auto result = buffer.get_data (2, retrieved);
+
+    EXPECT_EQ (result, 2);
+    for (int i = 0; i < 3; i++)
+    {
+        EXPECT_EQ (retrieved[i], second_values[i]);
+        EXPECT_EQ (retrieved[i + 3], third_values[i]);
+    }
+}
+
+TEST (DataBufferTest, GetDataTransposed_ColumnarBufferAndChannelSubset_ReturnOnlySelectedChannels)
+{
+    DataBuffer buffer (4, 3, true);
+    for (int i = 0; i < 5; i++)
+    {
+        double values[4] = {(double)i, 10.0 + i, 20.0 + i, 30.0 + i};
+        buffer.add_data (values);
+    }
+
+    int channels[2] = {3, 1};
+    double retrieved[6];
+    auto result = buffer.get_data_transposed (3, retrieved, 0, channels, 2);
+
+    EXPECT_EQ (result, 3);
+    EXPECT_EQ (buffer.get_data_count (), 0);
+    double expected[6] = {32.0, 33.0, 34.0, 12.0, 13.0, 14.0};
+    for (int i = 0; i < 6; i++)
+    {
+        EXPECT_EQ (retrieved[i], expected[i]);
+    }
+}
+
+TEST (DataBufferTest, Stats_OverflowAndRead_CountPushedOverwrittenAndPeak)
+{
+    DataBuffer buffer (2, 3);
+    for (int i = 0; i < 5; i++)
+    {
+        double values[2] = {(double)i, (double)i};
+        buffer.add_data (values);
+    }
+    double retrieved[4];
+    buffer.get_data (2, retrieved);
+    double values[2] = {5.0, 5.0};
+    buffer.add_data (values);
+
+    EXPECT_EQ (buffer.get_num_pushed (), 6);
+    EXPECT_EQ (buffer.get_num_overwritten (), 2);
+    EXPECT_EQ (buffer.get_peak_fill (), 3);
+    EXPECT_EQ (buffer.get_data_count (), 2);
+    EXPECT_EQ (buffer.get_buffer_size (), 3);
+}
+
+TEST (DataBufferTest, AddDataBatch_BatchWrapsAroundBuffer_OverwriteOldestAndKeepOrder)
+{
+    DataBuffer buffer (2, 4);
+    double first_values[4] = {1.0, 1.5, 2.0, 2.5};
+    double batch[8] = {3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0, 6.5};
+    double retrieved[8];
+
+    buffer.add_data (first_values, 2);
+    buffer.add_data (batch, 4);
+
+    EXPECT_EQ (buffer.get_data_count (), 4);
+    EXPECT_EQ (buffer.get_num_overwritten (), 2);
+    EXPECT_EQ (buffer.get_data (4, retrieved), 4);
+    for (int i = 0; i < 8; i++)
+    {
+        EXPECT_EQ (retrieved[i], batch[i]);
+    }
+}
+
+TEST (DataBufferTest, AddDataBatch_ColumnarBatchBiggerThanBuffer_KeepOnlyLastSamples)
+{
+    DataBuffer buffer (2, 3, true);
+    double batch[10] = {1.0, 10.0, 2.0, 20.0, 3.0, 30.0, 4.0, 40.0, 5.0, 50.0};
+    double retrieved[6];
+
+    buffer.add_data (batch, 5);
+
+    EXPECT_EQ (buffer.get_num_pushed (), 5);
+    EXPECT_EQ (buffer.get_num_overwritten (), 2);
+    EXPECT_EQ (buffer.get_current_data_transposed (3, retrieved), 3);
+    double expected[6] = {3.0, 4.0, 5.0, 30.0, 40.0, 50.0};
+    for (int i = 0; i < 6; i++)
+    {
+        EXPECT_EQ (retrieved[i], expected[i]);
+    }
+}
@@ -2,11 +2,15 @@
 
 #include <new>
 
-DataBuffer::DataBuffer (int num_samples, size_t buffer_size)
+DataBuffer::DataBuffer (int num_samples, size_t buffer_size, bool columnar)
 {
     this->buffer_size = buffer_size;
     this->num_samples = num_samples;
-    first_free = first_used = count = 0;
+    this->columnar = columnar;
+    head = 0;
+    tail = 0;
+    num_overwritten = 0;
+    peak_fill = 0;
 
     if (buffer_size == 0)
     {
@@ -37,33 +41,94 @@ bool DataBuffer::is_ready ()
 
 void DataBuffer::add_data (double *value)
 {
-    if (!is_ready ())
+    add_data (value, 1);
+}
+
+void DataBuffer::add_data (double *values, size_t count)
+{
+    if ((!is_ready ()) || (count == 0))
     {
         return;
     }
 
-    lock.lock ();
+    write_lock.lock ();
+
+    uint64_t cur_head = head.load (std::memory_order_relaxed);
+    uint64_t new_head = cur_head + count;
+    // if batch is bigger than buffer only its last buffer_size samples can survive
+    uint64_t first_written = (count > buffer_size) ? new_head - buffer_size : cur_head;
+    values += (size_t)(first_written - cur_head) * num_samples;
+    uint64_t min_tail = (new_head > buffer_size) ? new_head - buffer_size : 0;
+    uint64_t cur_tail = tail.load (std::memory_order_acquire);
+    // drop the oldest samples to make room for the whole batch, readers may move tail concurrently
+    while (cur_tail < min_tail)
+    {
+        if (tail.compare_exchange_weak (
+                cur_tail, min_tail, std::memory_order_acq_rel, std::memory_order_acquire))
+        {
+            num_overwritten.store (
+                num_overwritten.load (std::memory_order_relaxed) + (min_tail - cur_tail),
+                std::memory_order_relaxed);
+            cur_tail = min_tail;
+            break;
+        }
+    }
+    // readers which see new values in the slots must also see moved tail
+    std::atomic_thread_fence (std::memory_order_release);
 
-    if (count == 0)
+    size_t to_write = (size_t)(new_head - first_written);
+    size_t slot = (size_t)(first_written % buffer_size);
+    size_t first_half = buffer_size - slot;
+    if (first_half > to_write)
     {
-        first_used = first_free = 0;
+        first_half = to_write;
     }
-    else if (first_free == first_used)
+    if (columnar)
     {
-        first_used = next (first_used);
-        count--;
+        for (size_t j = 0; j < num_samples; j++)
+        {
+            double *channel_ring = data + j * buffer_size;
+            for (size_t i = 0; i < first_half; i++)
+            {
+                channel_ring[slot + i] = values[i * num_samples + j];
+            }
+            for (size_t i = first_half; i < to_write; i++)
+            {
+                channel_ring[i - first_half] = values[i * num_samples + j];
+            }
+        }
+    }
+    else
+    {
+        memcpy (data + slot * num_samples, values, sizeof (double) * num_samples * first_half);
+        memcpy (data, values + first_half * num_samples,
+            sizeof (double) * num_samples * (to_write - first_half));
+    }
+    head.store (new_head, std::memory_order_release);
+    // tail may be a bit stale here, it only makes peak value conservative
+    size_t fill = (size_t)(new_head - cur_tail);
+    if (fill > peak_fill.load (std::memory_order_relaxed))
+    {
+        peak_fill.store (fill, std::memory_order_relaxed);
     }
 
-    memcpy (this->data + first_free * num_samples, value, sizeof (double) * num_samples);
-    first_free = next (first_free);
-    count++;
-
-    lock.unlock ();
+    write_lock.unlock ();
 }
 
 void DataBuffer::get_chunk (size_t start, size_t size, double *data_buf)
 {
-    if (start + size < buffer_size)
+    if (columnar)
+    {
+        for (size_t i = 0; i < size; i++)
+        {
+            size_t slot = (start + i) % buffer_size;
+            for (size_t j = 0; j < num_samples; j++)
+            {
+                data_buf[i * num_samples + j] = data[j * buffer_size + slot];
+            }
+        }
+    }
+    else if (start + size < buffer_size)
     {
         memcpy (data_buf, data + start * num_samples, size * sizeof (double) * num_samples);
     }
@@ -77,45 +142,220 @@ void DataBuffer::get_chunk (size_t start, size_t size, double *data_buf)
     }
 }
 
-// Removes data from buffer
-size_t DataBuffer::get_data (size_t max_count, double *data_buf)
+void DataBuffer::get_chunk_transposed (
+    size_t start, size_t size, double *data_buf, size_t row_stride, const ReadParams &params)
+{
+    size_t first_half = buffer_size - start;
+    if (first_half > size)
+    {
+        first_half = size;
+    }
+    for (size_t k = 0; k < params.num_channels; k++)
+    {
+        size_t j = (params.channels == NULL) ? k : (size_t)params.channels[k];
+        double *row = data_buf + k * row_stride;
+        if (columnar)
+        {
+            const double *channel_ring = data + j * buffer_size;
+            memcpy (row, channel_ring + start, first_half * sizeof (double));
+            memcpy (row + first_half, channel_ring, (size - first_half) * sizeof (double));
+            continue;
+        }
+        const double *src = data + start * num_samples + j;
+        for (size_t i = 0; i < first_half; i++)
+        {
+            row[i] = src[i * num_samples];
+        }
+        src = data + j;
+        for (size_t i = first_half; i < size; i++)
+        {
+            row[i] = src[(i - first_half) * num_samples];
+        }
+    }
+}
+
+void DataBuffer::copy_samples (
+    uint64_t first, size_t size, double *data_buf, const ReadParams &params)
 {
-    lock.lock ();
-    size_t result_count = max_count;
-    if (result_count > count)
+    size_t start = (size_t)(first % buffer_size);
+    if (params.transpose)
     {
-        result_count = count;
+        get_chunk_transposed (
+            start, size, data_buf, (params.row_stride == 0) ? size : params.row_stride, params);
     }
-    if (result_count)
+    else
     {
-        get_chunk (first_used, result_count, data_buf);
-        first_used = (first_used + result_count) % buffer_size;
-        count -= result_count;
+        get_chunk (start, size, data_buf);
     }
-    lock.unlock ();
-    return result_count;
 }
 
-// Doesn't remove data from buffer
-size_t DataBuffer::get_current_data (size_t max_count, double *data_buf)
+// removes first samples from already copied chunk, used if they were overwritten during copying
+void DataBuffer::drop_first_samples (
+    double *data_buf, size_t size, size_t skipped, const ReadParams &params)
+{
+    size_t new_size = size - skipped;
+    if (!params.transpose)
+    {
+        memmove (
+            data_buf, data_buf + skipped * num_samples, new_size * sizeof (double) * num_samples);
+        return;
+    }
+    size_t old_stride = (params.row_stride == 0) ? size : params.row_stride;
+    size_t new_stride = (params.row_stride == 0) ? new_size : params.row_stride;
+    // rows are moved to the left, so going from the first row never overwrites unprocessed data
+    for (size_t k = 0; k < params.num_channels; k++)
+    {
+        memmove (data_buf + k * new_stride, data_buf + k * old_stride + skipped,
+            new_size * sizeof (double));
+    }
+}
+
+size_t DataBuffer::pop_samples (size_t max_count, double *data_buf, const ReadParams &params)
+{
+    if (!is_ready ())
+    {
+        return 0;
+    }
+
+    uint64_t cur_tail = tail.load (std::memory_order_acquire);
+    while (true)
+    {
+        uint64_t cur_head = head.load (std::memory_order_acquire);
+        if (cur_head - cur_tail > buffer_size)
+        {
+            // tail was moved by writer after we read it
+            cur_tail = tail.load (std::memory_order_acquire);
+            continue;
+        }
+        size_t result_count = (size_t)(cur_head - cur_tail);
+        if (result_count > max_count)
+        {
+            result_count = max_count;
+        }
+        if (result_count == 0)
+        {
+            return 0;
+        }
+        copy_samples (cur_tail, result_count, data_buf, params);
+        std::atomic_thread_fence (std::memory_order_acquire);
+
+        // samples before new_tail were overwritten or removed by another reader, the rest of the
+        // copied chunk is valid if we manage to claim it
+        uint64_t new_tail = tail.load (std::memory_order_relaxed);
+        uint64_t end = cur_tail + result_count;
+        if (new_tail >= end)
+        {
+            cur_tail = new_tail;
+            continue;
+        }
+        if (tail.compare_exchange_strong (
+                new_tail, end, std::memory_order_acq_rel, std::memory_order_acquire))
+        {
+            size_t skipped = (size_t)(new_tail - cur_tail);
+            if (skipped > 0)
+            {
+                drop_first_samples (data_buf, result_count, skipped, params);
+            }
+            return result_count - skipped;
+        }
+        cur_tail = new_tail;
+    }
+}
+
+size_t DataBuffer::peek_samples (size_t max_count, double *data_buf, const ReadParams &params)
 {
-    lock.lock ();
-    size_t result_count = max_count;
-    if (result_count > count)
-        result_count = count;
-    if (result_count)
+    if (!is_ready ())
+    {
+        return 0;
+    }
+
+    uint64_t cur_tail = tail.load (std::memory_order_acquire);
+    uint64_t cur_head = head.load (std::memory_order_acquire);
+    size_t result_count = (size_t)(cur_head - cur_tail);
+    if (result_count > buffer_size)
     {
-        size_t first_return = (first_used + (count - result_count)) % buffer_size;
-        get_chunk (first_return, result_count, data_buf);
+        result_count = buffer_size;
+    }
+    if (result_count > max_count)
+    {
+        result_count = max_count;
+    }
+    if (result_count == 0)
+    {
+        return 0;
+    }
+    uint64_t first_return = cur_head - result_count;
+    copy_samples (first_return, result_count, data_buf, params);
+    std::atomic_thread_fence (std::memory_order_acquire);
+
+    // drop samples which were overwritten while we were copying them
+    uint64_t new_tail = tail.load (std::memory_order_relaxed);
+    if (new_tail > first_return)
+    {
+        size_t skipped = (size_t)(new_tail - first_return);
+        if (skipped >= result_count)
+        {
+            return 0;
+        }
+        drop_first_samples (data_buf, result_count, skipped, params);
+        result_count -= skipped;
     }
-    lock.unlock ();
     return result_count;
 }
 
+// Removes data from buffer
+size_t DataBuffer::get_data (size_t max_count, double *data_buf)
+{
+    ReadParams params = {false, 0, NULL, num_samples};
+    return pop_samples (max_count, data_buf, params);
+}
+
+// Doesn't remove data from buffer
+size_t DataBuffer::get_current_data (size_t max_count, double *data_buf)
+{
+    ReadParams params = {false, 0, NULL, num_samples};
+    return peek_samples (max_count, data_buf, params);
+}
+
+size_t DataBuffer::get_data_transposed (
+    size_t max_count, double *data_buf, size_t row_stride, const int *channels, int num_channels)
+{
+    ReadParams params = {
+        true, row_stride, channels, (channels == NULL) ? num_samples : (size_t)num_channels};
+    return pop_samples (max_count, data_buf, params);
+}
+
+size_t DataBuffer::get_current_data_transposed (
+    size_t max_count, double *data_buf, size_t row_stride, const int *channels, int num_channels)
+{
+    ReadParams params = {
+        true, row_stride, channels, (channels == NULL) ? num_samples : (size_t)num_channels};
+    return peek_samples (max_count, data_buf, params);
+}
+
 size_t DataBuffer::get_data_count ()
 {
-    lock.lock ();
-    size_t result = this->count;
-    lock.unlock ();
+    uint64_t cur_tail = tail.load (std::memory_order_acquire);
+    uint64_t cur_head = head.load (std::memory_order_acquire);
+    size_t result = (size_t)(cur_head - cur_tail);
+    if (result > buffer_size)
+    {
+        result = buffer_size;
+    }
     return result;
 }
+
+uint64_t DataBuffer::get_num_pushed ()
+{
+    return head.load (std::memory_order_acquire);
+}
+
+uint64_t DataBuffer::get_num_overwritten ()
+{
+    return num_overwritten.load (std::memory_order_relaxed);
+}
+
+size_t DataBuffer::get_peak_fill ()
+{
+    return peak_fill.load (std::memory_order_relaxed);
+}
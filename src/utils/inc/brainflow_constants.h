@@ -162,6 +162,18 @@ enum class BrainFlowPresets : int
     ANCILLARY_PRESET = 2
 };
 
+enum class BufferLayouts : int
+{
+    ROW_MAJOR = 0,
+    COLUMNAR = 1
+};
+
+enum class BufferPolicies : int
+{
+    OVERWRITE = 0,
+    BLOCK = 1
+};
+
 enum class LogLevels : int
 {
     LEVEL_TRACE = 0,
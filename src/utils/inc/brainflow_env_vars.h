@@ -25,3 +25,43 @@ inline int get_brainflow_batch_size (int default_size = 3)
     }
     return size;
 }
+
+// value of integer env variable if it is in [min_value, max_value], default_value otherwise
+inline int get_brainflow_env_int (const char *name, int default_value, int min_value, int max_value)
+{
+    int value = default_value;
+    if (const char *env_p = std::getenv (name))
+    {
+        try
+        {
+            int parsed_value = std::stoi (std::string (env_p));
+            if ((parsed_value >= min_value) && (parsed_value <= max_value))
+            {
+                value = parsed_value;
+            }
+        }
+        catch (...)
+        {
+        }
+    }
+    return value;
+}
+
+// file streamers: how often writer thread flushes file, 0 means after each batch
+inline int get_brainflow_file_flush_interval_ms (int default_interval = 1000)
+{
+    return get_brainflow_env_int (
+        "BRAINFLOW_FILE_FLUSH_INTERVAL_MS", default_interval, 0, 3600 * 1000);
+}
+
+// file streamers: 1 to call fdatasync after each flush
+inline bool get_brainflow_file_sync (bool default_sync = false)
+{
+    return get_brainflow_env_int ("BRAINFLOW_FILE_SYNC", default_sync ? 1 : 0, 0, 1) == 1;
+}
+
+// file streamers: max number of samples waiting for writer thread, older samples are dropped
+inline int get_brainflow_file_queue_size (int default_size = 65536)
+{
+    return get_brainflow_env_int ("BRAINFLOW_FILE_QUEUE_SIZE", default_size, 16, 16 * 1024 * 1024);
+}
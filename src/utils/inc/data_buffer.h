@@ -1,34 +1,78 @@
 #pragma once
 
-#include "spinlock.h"
+#include <atomic>
+#include <stdint.h>
 #include <stdlib.h>
 #include <string.h>
 
+#include "spinlock.h"
+
+// Ring buffer with monotonic head and tail counters. Readers never take a lock: they copy samples
+// and claim them with CAS on tail, writer moves tail forward itself if buffer is full. Writers are
+// serialized only with each other (Board::push_package already does it under board lock), so
+// polling from readers never delays acquisition thread.
+// In columnar mode each channel has its own contiguous ring, it makes channel major reads and
+// reads of a few channels cheap, row interleaved reads become a gather.
 class DataBuffer
 {
 
-    SpinLock lock;
+    // describes how to store samples in output buffer
+    struct ReadParams
+    {
+        bool transpose;
+        size_t row_stride;   // 0 means packed rows, used only if transpose is true
+        const int *channels; // NULL means all channels
+        size_t num_channels;
+    };
+
+    SpinLock write_lock;
     double *data;
 
     size_t buffer_size;
-    size_t first_used, first_free;
-    size_t count;
     size_t num_samples;
-
-    size_t next (size_t index)
-    {
-        return (index + 1) % buffer_size;
-    }
+    bool columnar;
+    std::atomic<uint64_t> head; // total number of samples added to the buffer
+    std::atomic<uint64_t> tail; // index of the oldest sample which is still in the buffer
+    // statistics, updated only by writer
+    std::atomic<uint64_t> num_overwritten;
+    std::atomic<size_t> peak_fill;
 
     void get_chunk (size_t start, size_t size, double *data_buf);
+    void get_chunk_transposed (
+        size_t start, size_t size, double *data_buf, size_t row_stride, const ReadParams &params);
+    void copy_samples (uint64_t first, size_t size, double *data_buf, const ReadParams &params);
+    void drop_first_samples (
+        double *data_buf, size_t size, size_t skipped, const ReadParams &params);
+    size_t pop_samples (size_t max_count, double *data_buf, const ReadParams &params);
+    size_t peek_samples (size_t max_count, double *data_buf, const ReadParams &params);
 
 public:
-    DataBuffer (int num_samples, size_t buffer_size);
+    DataBuffer (int num_samples, size_t buffer_size, bool columnar = false);
     ~DataBuffer ();
 
     void add_data (double *value);
+    // adds count samples stored one after another, takes write lock and publishes head only once
+    void add_data (double *values, size_t count);
     size_t get_data (size_t max_count, double *data_buf);
     size_t get_current_data (size_t max_count, double *data_buf);
+    // same as methods above but store data channel by channel: value of channel j for sample i goes
+    // to data_buf[j * row_stride + i], row_stride 0 means that rows are packed one after another,
+    // if channels are provided only these channels are copied in provided order
+    size_t get_data_transposed (size_t max_count, double *data_buf, size_t row_stride = 0,
+        const int *channels = NULL, int num_channels = 0);
+    size_t get_current_data_transposed (size_t max_count, double *data_buf, size_t row_stride = 0,
+        const int *channels = NULL, int num_channels = 0);
     size_t get_data_count ();
+    uint64_t get_num_pushed ();
+    uint64_t get_num_overwritten ();
+    size_t get_peak_fill ();
+    size_t get_buffer_size ()
+    {
+        return buffer_size;
+    }
     bool is_ready ();
+    bool is_columnar ()
+    {
+        return columnar;
+    }
 };
@@ -0,0 +1,153 @@
+#pragma once
+
+#include <stddef.h>
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+
+// read only memory mapping of the whole file, pages are loaded by OS on access so nothing is
+// copied to user space buffers, empty file is opened successfully with NULL data
+class MappedFile
+{
+public:
+    MappedFile ()
+    {
+        data = NULL;
+        size = 0;
+#ifdef _WIN32
+        file = INVALID_HANDLE_VALUE;
+        mapping = NULL;
+#else
+        fd = -1;
+#endif
+    }
+
+    ~MappedFile ()
+    {
+        close ();
+    }
+
+    // returns false if file can not be opened or mapped
+    bool open (const char *file_name)
+    {
+        close ();
+#ifdef _WIN32
+        file = CreateFileA (file_name, GENERIC_READ, FILE_SHARE_READ | FILE_SHARE_WRITE, NULL,
+            OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, NULL);
+        if (file == INVALID_HANDLE_VALUE)
+        {
+            return false;
+        }
+        LARGE_INTEGER file_size;
+        if (!GetFileSizeEx (file, &file_size))
+        {
+            close ();
+            return false;
+        }
+        size = (size_t)file_size.QuadPart;
+        if (size == 0)
+        {
+            return true;
+        }
+        mapping = CreateFileMappingA (file, NULL, PAGE_READONLY, 0, 0, NULL);
+        if (mapping == NULL)
+        {
+            close ();
+            return false;
+        }
+        data = (const char *)MapViewOfFile (mapping, FILE_MAP_READ, 0, 0, 0);
+#else
+        fd = ::open (file_name, O_RDONLY);
+        if (fd < 0)
+        {
+            return false;
+        }
+        struct stat st;
+        if ((fstat (fd, &st) != 0) || (!S_ISREG (st.st_mode)))
+        {
+            close ();
+            return false;
+        }
+        size = (size_t)st.st_size;
+        if (size == 0)
+        {
+            return true;
+        }
+        void *region = mmap (NULL, size, PROT_READ, MAP_SHARED, fd, 0);
+        if (region != MAP_FAILED)
+        {
+            data = (const char *)region;
+            // most readers scan file from start to end
+            madvise (region, size, MADV_SEQUENTIAL);
+        }
+#endif
+        if (data == NULL)
+        {
+            close ();
+            return false;
+        }
+        return true;
+    }
+
+    void close ()
+    {
+#ifdef _WIN32
+        if (data != NULL)
+        {
+            UnmapViewOfFile (data);
+        }
+        if (mapping != NULL)
+        {
+            CloseHandle (mapping);
+            mapping = NULL;
+        }
+        if (file != INVALID_HANDLE_VALUE)
+        {
+            CloseHandle (file);
+            file = INVALID_HANDLE_VALUE;
+        }
+#else
+        if (data != NULL)
+        {
+            munmap ((void *)data, size);
+        }
+        if (fd >= 0)
+        {
+            ::close (fd);
+            fd = -1;
+        }
+#endif
+        data = NULL;
+        size = 0;
+    }
+
+    const char *get_data () const
+    {
+        return data;
+    }
+
+    size_t get_size () const
+    {
+        return size;
+    }
+
+private:
+    const char *data;
+    size_t size;
+#ifdef _WIN32
+    HANDLE file;
+    HANDLE mapping;
+#else
+    int fd;
+#endif
+
+    MappedFile (const MappedFile &) = delete;
+    MappedFile &operator= (const MappedFile &) = delete;
+};
@@ -24,6 +24,7 @@ public:
     int set_custom_latency (int latency = 1);
     int flush_buffer ();
     int read_from_serial_port (void *bytes_to_read, int size);
+    int read_available (void *bytes_to_read, int size, int ms_timeout);
     int send_to_serial_port (const void *message, int length);
     int close_serial_port ();
     const char *get_port_name ()
@@ -35,6 +36,7 @@ private:
     char port_name[1024];
 #ifdef _WIN32
     HANDLE port_descriptor;
+    int read_available_timeout; // timeouts which are set in port now, -1 if they are not set
 #else
     int port_descriptor;
 #endif
@@ -32,6 +32,12 @@ public:
     virtual int set_custom_latency (int latency = 1) = 0;
     virtual int flush_buffer () = 0;
     virtual int read_from_serial_port (void *bytes_to_read, int size) = 0;
+    // waits up to ms_timeout for incoming data and returns all bytes which are already received (up
+    // to size) in one call, default implementation relies on port timeouts
+    virtual int read_available (void *bytes_to_read, int size, int ms_timeout)
+    {
+        return read_from_serial_port (bytes_to_read, size);
+    }
     virtual int send_to_serial_port (const void *message, int length) = 0;
     virtual int close_serial_port () = 0;
     virtual const char *get_port_name () = 0;
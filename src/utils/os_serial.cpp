@@ -18,6 +18,7 @@ OSSerial::OSSerial (const char *port_name)
     }
     strcpy (this->port_name, port_name_string.c_str ());
     port_descriptor = NULL;
+    read_available_timeout = -1;
 }
 
 bool OSSerial::is_port_open ()
@@ -59,6 +60,7 @@ int OSSerial::set_serial_port_settings (int ms_timeout, bool timeout_only)
         }
     }
 
+    read_available_timeout = -1;
     COMMTIMEOUTS timeouts = {0};
     timeouts.ReadIntervalTimeout = ms_timeout;
     timeouts.ReadTotalTimeoutConstant = ms_timeout;
@@ -89,6 +91,27 @@ int OSSerial::read_from_serial_port (void *bytes_to_read, int size)
     return (int)readed;
 }
 
+int OSSerial::read_available (void *bytes_to_read, int size, int ms_timeout)
+{
+    // with these values ReadFile returns immediately if there are bytes in input buffer, otherwise
+    // it returns as soon as the first byte arrives or after ms_timeout
+    if (read_available_timeout != ms_timeout)
+    {
+        COMMTIMEOUTS timeouts = {0};
+        timeouts.ReadIntervalTimeout = MAXDWORD;
+        timeouts.ReadTotalTimeoutMultiplier = MAXDWORD;
+        timeouts.ReadTotalTimeoutConstant = ms_timeout;
+        timeouts.WriteTotalTimeoutConstant = 50;
+        timeouts.WriteTotalTimeoutMultiplier = 10;
+        if (SetCommTimeouts (this->port_descriptor, &timeouts) == 0)
+        {
+            return 0;
+        }
+        read_available_timeout = ms_timeout;
+    }
+    return read_from_serial_port (bytes_to_read, size);
+}
+
 int OSSerial::send_to_serial_port (const void *message, int length)
 {
     DWORD bytes_written;
@@ -116,6 +139,7 @@ int OSSerial::close_serial_port ()
 #else
 
 #include <fcntl.h>
+#include <poll.h>
 #include <termios.h>
 #include <unistd.h>
 
@@ -182,6 +206,21 @@ int OSSerial::read_from_serial_port (void *bytes_to_read, int size)
     return res;
 }
 
+int OSSerial::read_available (void *bytes_to_read, int size, int ms_timeout)
+{
+    struct pollfd pfd;
+    pfd.fd = this->port_descriptor;
+    pfd.events = POLLIN;
+    pfd.revents = 0;
+    int res = poll (&pfd, 1, ms_timeout);
+    if ((res <= 0) || ((pfd.revents & POLLIN) == 0))
+    {
+        return 0;
+    }
+    // data is ready, with VMIN = 0 read returns everything received so far without waiting
+    return read_from_serial_port (bytes_to_read, size);
+}
+
 int OSSerial::flush_buffer ()
 {
     tcflush (this->port_descriptor, TCIOFLUSH);